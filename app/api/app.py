@@ -1,12 +1,21 @@
 from __future__ import annotations
 
 import json
+import logging
+import os
 from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.responses import RedirectResponse
 
+from app.api.deps import get_content_repo, get_db, start_content_watcher
 from app.api.routers import journal, players, sessions, world
+from app.domain.scene_cache import SceneCache, set_scene_cache
+from app.domain.scene_pool import ScenePools, set_scene_pools
+from app.persistence.scene_store import MongoSceneStore
+
+
+logger = logging.getLogger(__name__)
 
 
 def create_app() -> FastAPI:
@@ -16,6 +25,35 @@ def create_app() -> FastAPI:
     app.include_router(sessions.router)
     app.include_router(journal.router)
 
+    @app.on_event("startup")
+    def load_content():
+        # Fail at boot, not on the first request, if the content does not load.
+        get_content_repo()
+        if os.getenv("CONTENT_HOT_RELOAD", "").lower() in {"1", "true", "yes"}:
+            start_content_watcher(float(os.getenv("CONTENT_RELOAD_INTERVAL", "1.0")))
+
+    @app.on_event("startup")
+    def share_scene_cache():
+        # Seeded scenes generated by one worker are reused by the others through Mongo.
+        collection = os.getenv("SCENE_CACHE_COLLECTION")
+        if collection:
+            set_scene_cache(SceneCache(store=MongoSceneStore(get_db()[collection])))
+
+    @app.on_event("startup")
+    def start_scene_pools():
+        pool_size = int(os.getenv("SCENE_POOL_SIZE", "0"))
+        if pool_size > 0:
+            pools = ScenePools(pool_size, int(os.getenv("SCENE_POOL_LOW_WATERMARK", str(pool_size // 2))))
+            try:
+                pools.probe(get_content_repo())
+            except Exception as exc:
+                # Every refill would fail the same way; say so once and serve scenes inline.
+                logger.error("Scene pools not started: generated scenes fail the validation policy (%s)", exc)
+                return
+            set_scene_pools(pools)
+            pools.start()
+            pools.prime(get_content_repo())
+
     @app.on_event("startup")
     def export_openapi():
         spec = app.openapi()
@@ -1,16 +1,52 @@
 from __future__ import annotations
 
+import os
+import threading
+
 from pymongo.database import Database
 
 from app.api.db import get_db as _get_db
+from app.content.reload import ContentWatcher
 from app.content.repo import ContentRepo
 
 
-CONTENT_REPO = ContentRepo()
+_CONTENT_REPO: ContentRepo | None = None
+_CONTENT_LOCK = threading.RLock()
+_CONTENT_WATCHER: ContentWatcher | None = None
+
+
+def _build_content_repo() -> ContentRepo:
+    return ContentRepo(
+        snapshot_path=os.getenv("CONTENT_SNAPSHOT_PATH") or None,
+        loader=os.getenv("CONTENT_LOADER", "serial"),
+        max_workers=int(os.getenv("CONTENT_LOAD_WORKERS", "0")) or None,
+    )
 
 
 def get_content_repo() -> ContentRepo:
-    return CONTENT_REPO
+    # Read the reference once: a concurrent hot-reload swap must not change the
+    # repo a request is already working with.
+    repo = _CONTENT_REPO
+    if repo is not None:
+        return repo
+    with _CONTENT_LOCK:
+        if _CONTENT_REPO is None:
+            set_content_repo(_build_content_repo())
+        return _CONTENT_REPO
+
+
+def set_content_repo(repo: ContentRepo) -> None:
+    global _CONTENT_REPO
+    _CONTENT_REPO = repo
+
+
+def start_content_watcher(interval: float = 1.0) -> ContentWatcher:
+    global _CONTENT_WATCHER
+    with _CONTENT_LOCK:
+        if _CONTENT_WATCHER is None:
+            _CONTENT_WATCHER = ContentWatcher(get_content_repo(), on_swap=set_content_repo, interval=interval)
+            _CONTENT_WATCHER.start()
+        return _CONTENT_WATCHER
 
 
 def get_db() -> Database:
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 
 class ViewAction(BaseModel):
@@ -24,10 +24,29 @@ class SessionCreateRequest(BaseModel):
 
 class IntentRequest(BaseModel):
     input: str
+    # Session version the client last saw; a step against a newer session is a 409.
+    expected_version: int | None = None
 
 
 class ActionRequest(BaseModel):
     action_id: str
+    expected_version: int | None = None
+
+
+class StepInput(BaseModel):
+    action_id: str | None = None
+    input: str | None = None
+
+    @model_validator(mode="after")
+    def _one_of_action_or_input(self) -> StepInput:
+        if (self.action_id is None) == (self.input is None):
+            raise ValueError("Each step needs exactly one of action_id or input")
+        return self
+
+
+class StepsRequest(BaseModel):
+    steps: list[StepInput] = Field(min_length=1, max_length=20)
+    expected_version: int | None = None
 
 
 class SessionResponse(BaseModel):
@@ -35,6 +54,7 @@ class SessionResponse(BaseModel):
     player_id: str
     view: ViewModel
     state_digest: str | None = None
+    version: int | None = None
 
 
 class Address(BaseModel):
@@ -71,3 +91,4 @@ class StepResponse(BaseModel):
     applied_actions: list[str] = Field(default_factory=list)
     state_delta: dict[str, Any] = Field(default_factory=dict)
     journal_entries: list[dict[str, Any]] = Field(default_factory=list)
+    version: int | None = None
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+import gzip
+import json
+import threading
+from typing import Any, Callable
+
+from app.content.records import json_default
+
+
+@dataclass(frozen=True)
+class RenderedPayload:
+    body: bytes
+    gzip_body: bytes
+
+
+def render_json(content: Any) -> bytes:
+    # Same encoding as starlette's JSONResponse, so cached and live bodies match byte for byte.
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+        default=json_default,
+    ).encode("utf-8")
+
+
+def gzip_body(body: bytes, compresslevel: int = 9) -> bytes:
+    return gzip.compress(body, compresslevel=compresslevel, mtime=0)
+
+
+def render_payload(content: Any) -> RenderedPayload:
+    body = render_json(content)
+    return RenderedPayload(body=body, gzip_body=gzip_body(body))
+
+
+class PayloadCache:
+    """Rendered payloads keyed by (name, content hash), with LRU eviction.
+
+    A content hash never maps to different content, so entries never go stale;
+    old versions simply age out after a hot reload.
+    """
+
+    def __init__(self, maxsize: int = 64) -> None:
+        self.maxsize = maxsize
+        self._entries: OrderedDict[tuple[str, str], RenderedPayload] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, name: str, content_hash: str, build: Callable[[], Any]) -> RenderedPayload:
+        key = (name, content_hash)
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+                return payload
+        # Render outside the lock; two racing renders produce identical bytes.
+        payload = render_payload(build())
+        with self._lock:
+            self._entries[key] = payload
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return payload
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def _coding_quality(params: str) -> float:
+    for param in params.split(";"):
+        name, _, value = param.strip().partition("=")
+        if name.strip().lower() == "q":
+            try:
+                return float(value.strip())
+            except ValueError:
+                return 0.0
+    return 1.0
+
+
+def accepts_gzip(accept_encoding: str | None) -> bool:
+    if not accept_encoding:
+        return False
+    # An explicit gzip entry wins over "*", whichever comes first in the header.
+    qualities: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if coding in ("gzip", "*") and coding not in qualities:
+            qualities[coding] = _coding_quality(params)
+    quality = qualities.get("gzip", qualities.get("*", 0.0))
+    return quality > 0
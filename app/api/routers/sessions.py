@@ -2,7 +2,8 @@ from __future__ import annotations
 
 from uuid import uuid4
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from pymongo import ReturnDocument
 from pymongo.database import Database
 
 from app.api.deps import get_content_repo, get_db
@@ -12,54 +13,40 @@ from app.api.models import (
     SessionCreateRequest,
     SessionResponse,
     StepResponse,
-    ViewAction,
-    ViewModel,
+    StepsRequest,
 )
+from app.api.views import NodeView, session_response_body, step_response_body, views_for
+from app.content.intents import intents_for
 from app.content.repo import ContentRepo
+from app.content.scene_graph import SceneGraph
 
 
 router = APIRouter(prefix="/v1/sessions", tags=["sessions"])
 
+SESSION_CONFLICT = "Session was changed by another request"
 
-def _find_scene(repo: ContentRepo, scene_id: str) -> dict:
-    scene = repo.scenes_by_id.get(scene_id)
-    if scene is None:
+
+def _find_graph(repo: ContentRepo, scene_id: str) -> SceneGraph:
+    graph = repo.scene_graphs_by_id.get(scene_id)
+    if graph is None:
         raise HTTPException(status_code=404, detail="Scene not found")
-    return scene
-
-
-def _find_node(scene: dict, node_id: str) -> dict:
-    for node in scene.get("nodes", []):
-        if node.get("node_id") == node_id:
-            return node
-    raise HTTPException(status_code=404, detail="Scene node not found")
-
-
-def _action_for_node(repo: ContentRepo, node: dict) -> dict | None:
-    action_id = node.get("action_ref")
-    if not action_id:
-        return None
-    return repo.actions_by_id.get(str(action_id))
-
-
-def _build_view(repo: ContentRepo, scene: dict, node: dict) -> ViewModel:
-    action = _action_for_node(repo, node) or {}
-    prompt = action.get("result") or action.get("label")
-    choices = node.get("choices", [])
-    eligible_actions = []
-    for choice_id in choices:
-        choice_action = repo.actions_by_id.get(str(choice_id))
-        if choice_action:
-            eligible_actions.append(
-                ViewAction(action_id=choice_action["action_id"], label=choice_action["label"])
-            )
-    return ViewModel(
-        prompt=prompt,
-        scene_id=scene.get("scene_id"),
-        eligible_actions=eligible_actions,
-        visible_items=[],
-        visible_npcs=[],
-    )
+    return graph
+
+
+def _find_node(graph: SceneGraph, node_id: str) -> dict:
+    node = graph.node(node_id)
+    if node is None:
+        raise HTTPException(status_code=404, detail="Scene node not found")
+    return node
+
+
+def _node_view(repo: ContentRepo, graph: SceneGraph, node_id: str) -> NodeView:
+    _find_node(graph, node_id)
+    return views_for(repo).get(graph.scene_id, node_id)
+
+
+def _json_response(body: bytes) -> Response:
+    return Response(content=body, media_type="application/json")
 
 
 def _select_start_scene(repo: ContentRepo, player_state: dict | None) -> dict:
@@ -74,44 +61,90 @@ def _select_start_scene(repo: ContentRepo, player_state: dict | None) -> dict:
     raise HTTPException(status_code=404, detail="No scenes available")
 
 
-def _match_intent_action(input_text: str, node: dict, repo: ContentRepo) -> str | None:
-    text = input_text.lower()
-    for choice_id in node.get("choices", []):
-        action = repo.actions_by_id.get(str(choice_id))
-        if not action:
-            continue
-        label = str(action.get("label", "")).lower()
-        if label and label in text:
-            return action["action_id"]
-        signature = action.get("intent_signature") or {}
-        for phrase in signature.get("phrases", []):
-            if str(phrase).lower() in text:
-                return action["action_id"]
-        for keyword in signature.get("keywords", []):
-            if str(keyword).lower() in text:
-                return action["action_id"]
-    return None
-
-
-def _apply_action(session: dict, action_id: str, repo: ContentRepo, db: Database) -> StepResponse:
-    scene = _find_scene(repo, session["scene_id"])
-    current_node = _find_node(scene, session["node_id"])
-    choices = current_node.get("choices", [])
-    target_node = None
-    for node in scene.get("nodes", []):
-        if node.get("node_id") == action_id or node.get("action_ref") == action_id:
-            target_node = node
-            break
-    if target_node is None or action_id not in choices:
-        raise HTTPException(status_code=400, detail="Action not eligible")
-
-    session["node_id"] = target_node.get("node_id")
-    db["sessions"].update_one(
-        {"_id": session["_id"]},
-        {"$set": {"node_id": session["node_id"]}},
+def _match_intent_action(input_text: str, graph: SceneGraph, node_id: str, repo: ContentRepo) -> str | None:
+    match = intents_for(repo).match(graph.scene_id, node_id, input_text)
+    return match.action_id if match is not None else None
+
+
+def _find_session(db: Database, session_id: str) -> dict:
+    session = db["sessions"].find_one({"_id": session_id})
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return session
+
+
+def _version_query(version: int) -> int | dict:
+    # Sessions created before versioning have no version field; they count as version 0.
+    return {"$in": [None, 0]} if version == 0 else version
+
+
+def _check_version(session: dict, expected_version: int | None) -> None:
+    if expected_version is not None and session.get("version", 0) != expected_version:
+        raise HTTPException(status_code=409, detail=SESSION_CONFLICT)
+
+
+def _advance(db: Database, session: dict, node_id: str, steps: int = 1) -> dict:
+    """Move a session read earlier to ``node_id``, unless another request moved it first."""
+    updated = db["sessions"].find_one_and_update(
+        {
+            "_id": session["_id"],
+            "node_id": session["node_id"],
+            "version": _version_query(session.get("version", 0)),
+        },
+        {"$set": {"node_id": node_id}, "$inc": {"version": steps}},
+        return_document=ReturnDocument.AFTER,
     )
-    view = _build_view(repo, scene, target_node)
-    return StepResponse(view=view, applied_actions=[action_id], state_delta={}, journal_entries=[])
+    if updated is None:
+        raise HTTPException(status_code=409, detail=SESSION_CONFLICT)
+    return updated
+
+
+def _apply_action(
+    session_id: str, action_id: str, repo: ContentRepo, db: Database, expected_version: int | None = None
+) -> dict:
+    """Take ``action_id`` with one conditional write and return the updated session.
+
+    No read is needed: the filter only admits a session sitting on a node that
+    offers the action (and on ``expected_version`` when one is sent). Once the
+    action applies the session sits on its target node, which does not offer
+    it again, so a retried or double-tapped request cannot apply twice. Routes
+    whose target offers the action again (``self_loop``) have no such guard
+    without a version, so there the session is read first and the write is
+    conditioned on the node and version that were read.
+    """
+    routes = repo.scene_routes_by_action.get(action_id, ())
+    if expected_version is None and any(route.self_loop for route in routes):
+        session = _find_session(db, session_id)
+        graph = _find_graph(repo, session["scene_id"])
+        _find_node(graph, session["node_id"])
+        target_node = graph.target(session["node_id"], action_id)
+        if target_node is None:
+            raise HTTPException(status_code=400, detail="Action not eligible")
+        return _advance(db, session, target_node["node_id"])
+
+    sources_by_target: dict[str, list[dict]] = {}
+    for route in routes:
+        sources_by_target.setdefault(route.target_node, []).append(
+            {"scene_id": route.scene_id, "node_id": {"$in": list(route.source_nodes)}}
+        )
+    # One write per distinct target node; an action id only has several when scenes disagree on it.
+    for target_node, sources in sources_by_target.items():
+        query: dict = {"_id": session_id, "$or": sources}
+        if expected_version is not None:
+            query["version"] = _version_query(expected_version)
+        updated = db["sessions"].find_one_and_update(
+            query,
+            {"$set": {"node_id": target_node}, "$inc": {"version": 1}},
+            return_document=ReturnDocument.AFTER,
+        )
+        if updated is not None:
+            return updated
+
+    # Nothing matched; read the session to tell the caller why.
+    session = _find_session(db, session_id)
+    _check_version(session, expected_version)
+    _find_node(_find_graph(repo, session["scene_id"]), session["node_id"])
+    raise HTTPException(status_code=400, detail="Action not eligible")
 
 
 @router.post("", response_model=SessionResponse)
@@ -119,27 +152,26 @@ def create_session(
     request: SessionCreateRequest,
     repo: ContentRepo = Depends(get_content_repo),
     db: Database = Depends(get_db),
-) -> SessionResponse:
+) -> Response:
     player = db["players"].find_one({"_id": request.player_id})
     if player is None:
         raise HTTPException(status_code=404, detail="Player not found")
     scene = _select_start_scene(repo, player.get("state"))
-    node_id = scene.get("entry_node")
-    if node_id is None:
-        raise HTTPException(status_code=500, detail="Scene has no entry node")
+    graph = _find_graph(repo, scene.get("scene_id"))
+    node_id = graph.entry_node
 
     session_id = uuid4().hex
     db["sessions"].insert_one(
         {
             "_id": session_id,
             "player_id": request.player_id,
-            "scene_id": scene.get("scene_id"),
+            "scene_id": graph.scene_id,
             "node_id": node_id,
+            "version": 0,
         }
     )
-    node = _find_node(scene, node_id)
-    view = _build_view(repo, scene, node)
-    return SessionResponse(session_id=session_id, player_id=request.player_id, view=view)
+    view = _node_view(repo, graph, node_id)
+    return _json_response(session_response_body(session_id, request.player_id, view, version=0))
 
 
 @router.get("/{session_id}", response_model=SessionResponse)
@@ -147,19 +179,12 @@ def get_session(
     session_id: str,
     repo: ContentRepo = Depends(get_content_repo),
     db: Database = Depends(get_db),
-) -> SessionResponse:
-    session = db["sessions"].find_one({"_id": session_id})
-    if session is None:
-        raise HTTPException(status_code=404, detail="Session not found")
-    scene = _find_scene(repo, session["scene_id"])
-    node = _find_node(scene, session["node_id"])
-    view = _build_view(repo, scene, node)
-    return SessionResponse(
-        session_id=session_id,
-        player_id=session["player_id"],
-        view=view,
-        state_digest=None,
-    )
+) -> Response:
+    session = _find_session(db, session_id)
+    graph = _find_graph(repo, session["scene_id"])
+    view = _node_view(repo, graph, session["node_id"])
+    body = session_response_body(session_id, session["player_id"], view, version=session.get("version", 0))
+    return _json_response(body)
 
 
 @router.post("/{session_id}/intent", response_model=StepResponse)
@@ -168,16 +193,18 @@ def submit_intent(
     request: IntentRequest,
     repo: ContentRepo = Depends(get_content_repo),
     db: Database = Depends(get_db),
-) -> StepResponse:
-    session = db["sessions"].find_one({"_id": session_id})
-    if session is None:
-        raise HTTPException(status_code=404, detail="Session not found")
-    scene = _find_scene(repo, session["scene_id"])
-    node = _find_node(scene, session["node_id"])
-    action_id = _match_intent_action(request.input, node, repo)
+) -> Response:
+    session = _find_session(db, session_id)
+    _check_version(session, request.expected_version)
+    graph = _find_graph(repo, session["scene_id"])
+    _find_node(graph, session["node_id"])
+    action_id = _match_intent_action(request.input, graph, session["node_id"], repo)
     if action_id is None:
         raise HTTPException(status_code=400, detail="No eligible action matched")
-    return _apply_action(session, action_id, repo, db)
+    target_node = graph.target(session["node_id"], action_id)
+    updated = _advance(db, session, target_node["node_id"])
+    view = _node_view(repo, graph, updated["node_id"])
+    return _json_response(step_response_body(view, [action_id], version=updated["version"]))
 
 
 @router.post("/{session_id}/action", response_model=StepResponse)
@@ -186,11 +213,50 @@ def submit_action(
     request: ActionRequest,
     repo: ContentRepo = Depends(get_content_repo),
     db: Database = Depends(get_db),
-) -> StepResponse:
-    session = db["sessions"].find_one({"_id": session_id})
-    if session is None:
-        raise HTTPException(status_code=404, detail="Session not found")
-    return _apply_action(session, request.action_id, repo, db)
+) -> Response:
+    updated = _apply_action(session_id, request.action_id, repo, db, request.expected_version)
+    view = _node_view(repo, _find_graph(repo, updated["scene_id"]), updated["node_id"])
+    return _json_response(step_response_body(view, [request.action_id], version=updated["version"]))
+
+
+@router.post("/{session_id}/steps", response_model=list[StepResponse])
+def submit_steps(
+    session_id: str,
+    request: StepsRequest,
+    repo: ContentRepo = Depends(get_content_repo),
+    db: Database = Depends(get_db),
+) -> Response:
+    session = _find_session(db, session_id)
+    _check_version(session, request.expected_version)
+    graph = _find_graph(repo, session["scene_id"])
+    node_id = session["node_id"]
+    _find_node(graph, node_id)
+
+    # Steps are resolved against the in-memory node and written once at the end,
+    # so a step that fails leaves the session untouched.
+    applied: list[tuple[str, str]] = []
+    for number, step in enumerate(request.steps, 1):
+        if node_id in graph.terminal_nodes:
+            raise HTTPException(status_code=400, detail=f"Step {number}: Scene already ended")
+        action_id = step.action_id
+        if action_id is None:
+            action_id = _match_intent_action(step.input, graph, node_id, repo)
+            if action_id is None:
+                raise HTTPException(status_code=400, detail=f"Step {number}: No eligible action matched")
+        target_node = graph.target(node_id, action_id)
+        if target_node is None:
+            raise HTTPException(status_code=400, detail=f"Step {number}: Action not eligible")
+        node_id = target_node["node_id"]
+        applied.append((action_id, node_id))
+
+    updated = _advance(db, session, node_id, steps=len(applied))
+    views = views_for(repo)
+    first_version = updated["version"] - len(applied) + 1
+    bodies = [
+        step_response_body(views.get(graph.scene_id, step_node_id), [action_id], version=first_version + position)
+        for position, (action_id, step_node_id) in enumerate(applied)
+    ]
+    return _json_response(b"[" + b",".join(bodies) + b"]")
 
 
 @router.post("/{session_id}/peek", response_model=StepResponse)
@@ -198,11 +264,8 @@ def peek_session(
     session_id: str,
     repo: ContentRepo = Depends(get_content_repo),
     db: Database = Depends(get_db),
-) -> StepResponse:
-    session = db["sessions"].find_one({"_id": session_id})
-    if session is None:
-        raise HTTPException(status_code=404, detail="Session not found")
-    scene = _find_scene(repo, session["scene_id"])
-    node = _find_node(scene, session["node_id"])
-    view = _build_view(repo, scene, node)
-    return StepResponse(view=view, applied_actions=[], state_delta={}, journal_entries=[])
+) -> Response:
+    session = _find_session(db, session_id)
+    graph = _find_graph(repo, session["scene_id"])
+    view = _node_view(repo, graph, session["node_id"])
+    return _json_response(step_response_body(view, version=session.get("version", 0)))
@@ -1,44 +1,251 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+import base64
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 
 from app.api.deps import get_content_repo
-from app.content.repo import ContentRepo
+from app.api.payloads import PayloadCache, accepts_gzip, gzip_body, render_json
+from app.content.repo import ContentRepo, content_digest
 
 
 router = APIRouter(prefix="/v1/world", tags=["world"])
 
-
-@router.get("/manifest")
-def get_manifest(repo: ContentRepo = Depends(get_content_repo)) -> dict[str, object]:
+WORLD_PAYLOADS = PayloadCache()
+
+MAX_PAGE_SIZE = 500
+
+# Filtered and paged results are rendered per request, so they get a cheap gzip level.
+QUERY_GZIP_LEVEL = 1
+
+
+@dataclass(frozen=True)
+class CollectionQuery:
+    fields: list[str] | None
+    limit: int | None
+    cursor: str | None
+
+
+def _collection_query(
+    fields: str | None = Query(None, description="Comma-separated fields to return for each record."),
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; omit for all results."),
+    cursor: str | None = Query(None, description="X-Next-Cursor value from the previous page."),
+) -> CollectionQuery:
+    projection = [field.strip() for field in fields.split(",") if field.strip()] if fields else None
+    return CollectionQuery(fields=projection, limit=limit, cursor=cursor)
+
+
+def _etag_matches(if_none_match: str | None, etags: tuple[str, ...]) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == "*" or candidate in etags:
+            return True
+    return False
+
+
+def _conditional_response(
+    request: Request,
+    content_hash: str,
+    render: Callable[[bool], bytes],
+    extra_headers: dict[str, str] | None = None,
+) -> Response:
+    # World content only changes with the content version, so clients can poll
+    # with If-None-Match and get an empty 304 until it does.
+    identity_etag = f'"{content_hash}"'
+    gzip_etag = f'"{content_hash}-gzip"'
+    use_gzip = accepts_gzip(request.headers.get("accept-encoding"))
+    headers = {
+        "ETag": gzip_etag if use_gzip else identity_etag,
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+        **(extra_headers or {}),
+    }
+    if _etag_matches(request.headers.get("if-none-match"), (identity_etag, gzip_etag)):
+        return Response(status_code=304, headers=headers)
+
+    body = render(use_gzip)
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _cached_response(request: Request, name: str, content_hash: str, build: Callable[[], Any]) -> Response:
+    # Full collections are rendered once per content hash, already JSON-encoded and gzipped.
+    def render(use_gzip: bool) -> bytes:
+        payload = WORLD_PAYLOADS.get(name, content_hash, build)
+        return payload.gzip_body if use_gzip else payload.body
+
+    return _conditional_response(request, content_hash, render)
+
+
+def _encode_cursor(content_hash: str, position: int) -> str:
+    return base64.urlsafe_b64encode(f"{content_hash[:16]}:{position}".encode("ascii")).decode("ascii")
+
+
+def _decode_cursor(cursor: str, content_hash: str) -> int:
+    try:
+        version, _, position = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("ascii").partition(":")
+        parsed = int(position)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+    if version != content_hash[:16]:
+        raise HTTPException(status_code=400, detail="Cursor is stale; content has changed")
+    return parsed
+
+
+def _collection_response(
+    request: Request,
+    repo: ContentRepo,
+    name: str,
+    query: CollectionQuery,
+    filters: dict[str, list[str] | None] | None = None,
+) -> Response:
+    records_by_id: dict[str, dict] = getattr(repo, f"{name}_by_id")
+    content_hash = repo.content_hashes[name]
+    active = {field: values for field, values in (filters or {}).items() if values}
+    if not active and query.fields is None and query.limit is None and query.cursor is None:
+        return _cached_response(request, name, content_hash, lambda: list(records_by_id.values()))
+
+    # Secondary indexes answer the filters, so the work tracks the result size.
+    index = getattr(repo, f"{name}_query_index")
+    positions = index.positions(active)
+    start = bisect_right(positions, _decode_cursor(query.cursor, content_hash)) if query.cursor else 0
+    stop = start + query.limit if query.limit else len(positions)
+    page = positions[start:stop]
+    headers = {}
+    if stop < len(positions) and page:
+        headers["X-Next-Cursor"] = _encode_cursor(content_hash, page[-1])
+
+    def build() -> list[dict]:
+        records = [records_by_id[index.ids[position]] for position in page]
+        if query.fields is None:
+            return records
+        return [{field: record[field] for field in query.fields if field in record} for record in records]
+
+    def render(use_gzip: bool) -> bytes:
+        # Only compress when the client takes gzip; the body is not cached.
+        body = render_json(build())
+        return gzip_body(body, QUERY_GZIP_LEVEL) if use_gzip else body
+
+    query_hash = content_digest([content_hash, sorted(active.items()), query.fields, query.limit, query.cursor])
+    return _conditional_response(request, query_hash, render, headers)
+
+
+@router.get("/manifest", response_model=dict[str, object])
+def get_manifest(request: Request, repo: ContentRepo = Depends(get_content_repo)) -> Response:
     manifest = repo.manifest
-    return {
-        "schemas": dict(manifest.schemas),
-        "assets": dict(manifest.assets),
-        "lexicons": dict(manifest.lexicons),
+    return _cached_response(
+        request,
+        "manifest",
+        repo.content_version,
+        lambda: {
+            "schemas": dict(manifest.schemas),
+            "assets": dict(manifest.assets),
+            "lexicons": dict(manifest.lexicons),
+        },
+    )
+
+
+@router.get("/places", response_model=list[dict])
+def get_places(
+    request: Request,
+    zone_id: list[str] | None = Query(None),
+    parent_place_id: list[str] | None = Query(None),
+    is_threshold: list[str] | None = Query(None),
+    mood: list[str] | None = Query(None),
+    query: CollectionQuery = Depends(_collection_query),
+    repo: ContentRepo = Depends(get_content_repo),
+) -> Response:
+    filters = {
+        "zone_id": zone_id,
+        "parent_place_id": parent_place_id,
+        "is_threshold": is_threshold,
+        "mood": mood,
     }
-
-
-@router.get("/places")
-def get_places(repo: ContentRepo = Depends(get_content_repo)) -> list[dict]:
-    return list(repo.places_by_id.values())
-
-
-@router.get("/scenes")
-def get_scenes(repo: ContentRepo = Depends(get_content_repo)) -> list[dict]:
-    return list(repo.scenes_by_id.values())
-
-
-@router.get("/actions")
-def get_actions(repo: ContentRepo = Depends(get_content_repo)) -> list[dict]:
-    return list(repo.actions_by_id.values())
-
-
-@router.get("/collectibles")
-def get_collectibles(repo: ContentRepo = Depends(get_content_repo)) -> list[dict]:
-    return list(repo.collectibles_by_id.values())
-
-
-@router.get("/npcs")
-def get_npcs(repo: ContentRepo = Depends(get_content_repo)) -> list[dict]:
-    return list(repo.npcs_by_id.values())
+    return _collection_response(request, repo, "places", query, filters)
+
+
+@router.get("/scenes", response_model=list[dict])
+def get_scenes(
+    request: Request,
+    place_id: list[str] | None = Query(None),
+    query: CollectionQuery = Depends(_collection_query),
+    repo: ContentRepo = Depends(get_content_repo),
+) -> Response:
+    return _collection_response(request, repo, "scenes", query, {"place_id": place_id})
+
+
+@router.get("/actions", response_model=list[dict])
+def get_actions(
+    request: Request,
+    query: CollectionQuery = Depends(_collection_query),
+    repo: ContentRepo = Depends(get_content_repo),
+) -> Response:
+    return _collection_response(request, repo, "actions", query)
+
+
+@router.get("/collectibles", response_model=list[dict])
+def get_collectibles(
+    request: Request,
+    item_type: list[str] | None = Query(None),
+    tag: list[str] | None = Query(None),
+    usable_in: list[str] | None = Query(None),
+    safety_category: list[str] | None = Query(None),
+    origin_scope: list[str] | None = Query(None),
+    origin_ref: list[str] | None = Query(None),
+    stock_behavior: list[str] | None = Query(None),
+    query: CollectionQuery = Depends(_collection_query),
+    repo: ContentRepo = Depends(get_content_repo),
+) -> Response:
+    filters = {
+        "item_type": item_type,
+        "tag": tag,
+        "usable_in": usable_in,
+        "safety_category": safety_category,
+        "origin_scope": origin_scope,
+        "origin_ref": origin_ref,
+        "stock_behavior": stock_behavior,
+    }
+    return _collection_response(request, repo, "collectibles", query, filters)
+
+
+@router.get("/npcs", response_model=list[dict])
+def get_npcs(
+    request: Request,
+    npc_kind: list[str] | None = Query(None),
+    home_location_id: list[str] | None = Query(None),
+    query: CollectionQuery = Depends(_collection_query),
+    repo: ContentRepo = Depends(get_content_repo),
+) -> Response:
+    filters = {"npc_kind": npc_kind, "home_location_id": home_location_id}
+    return _collection_response(request, repo, "npcs", query, filters)
+
+
+@router.get("/interactions", response_model=list[dict])
+def get_interactions(
+    request: Request,
+    npc_kind: list[str] | None = Query(None),
+    npc_id: list[str] | None = Query(None),
+    place_id: list[str] | None = Query(None),
+    interaction_type: list[str] | None = Query(None),
+    capability: list[str] | None = Query(None),
+    tag: list[str] | None = Query(None),
+    query: CollectionQuery = Depends(_collection_query),
+    repo: ContentRepo = Depends(get_content_repo),
+) -> Response:
+    filters = {
+        "npc_kind": npc_kind,
+        "npc_id": npc_id,
+        "place_id": place_id,
+        "interaction_type": interaction_type,
+        "capability": capability,
+        "tag": tag,
+    }
+    return _collection_response(request, repo, "interactions", query, filters)
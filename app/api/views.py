@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+import threading
+from typing import Any, Iterable, Mapping
+
+from app.api.models import ViewAction, ViewModel
+from app.api.payloads import render_json
+from app.content.scene_graph import SceneGraph
+
+
+@dataclass(frozen=True)
+class NodeView:
+    """A scene node's ViewModel and its JSON encoding, shared by every session on that node."""
+
+    model: ViewModel
+    body: bytes
+
+
+def build_view(repo, graph: SceneGraph, node: Mapping[str, Any]) -> ViewModel:
+    action_ref = node.get("action_ref")
+    action = (repo.actions_by_id.get(str(action_ref)) if action_ref else None) or {}
+    prompt = action.get("result") or action.get("label")
+    eligible_actions = []
+    for choice_id in node.get("choices", []):
+        choice_action = repo.actions_by_id.get(str(choice_id))
+        if choice_action:
+            eligible_actions.append(ViewAction(action_id=choice_action["action_id"], label=choice_action["label"]))
+    return ViewModel(
+        prompt=prompt,
+        scene_id=graph.scene_id,
+        eligible_actions=eligible_actions,
+        visible_items=[],
+        visible_npcs=[],
+    )
+
+
+class SceneViews:
+    """Every scene node's NodeView for one content version, built up front.
+
+    Views only depend on the scene, the node and the content, so session
+    handlers look them up and wrap the pre-encoded body with their own fields.
+    """
+
+    def __init__(self, repo) -> None:
+        self.content_version: str = repo.content_version
+        self._views: dict[tuple[str, str], NodeView] = {}
+        for scene_id, graph in repo.scene_graphs_by_id.items():
+            for node_id, node in graph.nodes_by_id.items():
+                model = build_view(repo, graph, node)
+                body = render_json(model.model_dump(mode="json"))
+                self._views[(scene_id, node_id)] = NodeView(model=model, body=body)
+
+    def get(self, scene_id: str, node_id: str) -> NodeView | None:
+        return self._views.get((scene_id, node_id))
+
+
+def session_response_body(
+    session_id: str,
+    player_id: str,
+    view: NodeView,
+    state_digest: str | None = None,
+    version: int | None = None,
+) -> bytes:
+    """SessionResponse JSON, byte for byte what the model would render."""
+    return b"".join(
+        (
+            b'{"session_id":',
+            render_json(session_id),
+            b',"player_id":',
+            render_json(player_id),
+            b',"view":',
+            view.body,
+            b',"state_digest":',
+            render_json(state_digest),
+            b',"version":',
+            render_json(version),
+            b"}",
+        )
+    )
+
+
+def step_response_body(
+    view: NodeView,
+    applied_actions: Iterable[str] = (),
+    state_delta: dict[str, Any] | None = None,
+    journal_entries: list[dict[str, Any]] | None = None,
+    version: int | None = None,
+) -> bytes:
+    """StepResponse JSON, byte for byte what the model would render."""
+    return b"".join(
+        (
+            b'{"view":',
+            view.body,
+            b',"applied_actions":',
+            render_json(list(applied_actions)),
+            b',"state_delta":',
+            render_json(state_delta or {}),
+            b',"journal_entries":',
+            render_json(journal_entries or []),
+            b',"version":',
+            render_json(version),
+            b"}",
+        )
+    )
+
+
+_VIEWS: OrderedDict[str, SceneViews] = OrderedDict()
+_VIEWS_LOCK = threading.Lock()
+_VIEWS_MAXSIZE = 4
+
+
+def views_for(repo) -> SceneViews:
+    """The shared node views for the repo's content version, built on first use."""
+    version = repo.content_version
+    with _VIEWS_LOCK:
+        views = _VIEWS.get(version)
+        if views is not None:
+            _VIEWS.move_to_end(version)
+            return views
+    views = SceneViews(repo)
+    with _VIEWS_LOCK:
+        views = _VIEWS.setdefault(version, views)
+        _VIEWS.move_to_end(version)
+        while len(_VIEWS) > _VIEWS_MAXSIZE:
+            _VIEWS.popitem(last=False)
+    return views
@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Iterable, Mapping
+
+
+# Queryable fields per world collection: query name -> dotted path into the record.
+QUERY_FIELDS: dict[str, dict[str, str]] = {
+    "places": {
+        "zone_id": "zone_id",
+        "parent_place_id": "parent_place_id",
+        "is_threshold": "is_threshold",
+        "mood": "mood",
+    },
+    "collectibles": {
+        "item_type": "item_type",
+        "tag": "tags",
+        "usable_in": "usable_in",
+        "safety_category": "safety_category",
+        "origin_scope": "origin_scope",
+        "origin_ref": "origin_ref",
+        "stock_behavior": "stock_behavior",
+    },
+    "npcs": {
+        "npc_kind": "npc_kind",
+        "home_location_id": "home_location_id",
+    },
+    "interactions": {
+        "npc_kind": "npc_kind",
+        "npc_id": "conditions.npc_id",
+        "place_id": "conditions.place_id",
+        "interaction_type": "interaction_type",
+        "capability": "capability",
+        "tag": "tags",
+    },
+    "actions": {},
+    "scenes": {
+        "place_id": "place_id",
+    },
+}
+
+
+def _index_key(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _field_values(record: Mapping[str, Any], path: str) -> list[str]:
+    value: Any = record
+    for part in path.split("."):
+        if not isinstance(value, Mapping):
+            return []
+        value = value.get(part)
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return [_index_key(item) for item in value if item is not None]
+    return [_index_key(value)]
+
+
+@dataclass(frozen=True)
+class QueryIndex:
+    """Posting lists (sorted record positions) per field value for one collection.
+
+    Positions follow the collection's catalog order, so results and cursors are
+    stable for a given content version.
+    """
+
+    ids: tuple[str, ...]
+    postings: dict[str, dict[str, tuple[int, ...]]]
+
+    def positions(self, filters: Mapping[str, Iterable[str]]) -> list[int]:
+        """Positions matching every field in filters (values within a field are OR'd)."""
+        buckets: list[set[int]] = []
+        for field, values in filters.items():
+            if field not in self.postings:
+                raise KeyError(field)
+            field_postings = self.postings[field]
+            matched: set[int] = set()
+            for value in values:
+                matched.update(field_postings.get(value, ()))
+            buckets.append(matched)
+        if not buckets:
+            return list(range(len(self.ids)))
+        buckets.sort(key=len)
+        result = buckets[0]
+        for bucket in buckets[1:]:
+            if not result:
+                break
+            result = result & bucket
+        return sorted(result)
+
+
+def build_query_index(records_by_id: Mapping[str, Mapping[str, Any]], fields: Mapping[str, str]) -> QueryIndex:
+    postings: dict[str, dict[str, list[int]]] = {name: {} for name in fields}
+    for position, record in enumerate(records_by_id.values()):
+        for name, path in fields.items():
+            for value in _field_values(record, path):
+                bucket = postings[name].setdefault(value, [])
+                if not bucket or bucket[-1] != position:
+                    bucket.append(position)
+    return QueryIndex(
+        ids=tuple(records_by_id.keys()),
+        postings={name: {value: tuple(bucket) for value, bucket in values.items()} for name, values in postings.items()},
+    )
+
+
+# Attributes with one bitset per value, per collection: attribute name -> dotted path.
+BITSET_FIELDS: dict[str, dict[str, str]] = {
+    "collectibles": {
+        "tag": "tags",
+        "item_type": "item_type",
+        "usable_in": "usable_in",
+        "safety_category": "safety_category",
+        "origin_scope": "origin_scope",
+        "origin_ref": "origin_ref",
+    },
+}
+
+
+@dataclass(frozen=True)
+class BitsetIndex:
+    """One integer bitset per attribute value; bit ``n`` is the record at catalog position ``n``.
+
+    Multi-attribute filters become a handful of integer AND/OR/ANDNOT operations
+    instead of a scan over every record.
+    """
+
+    ids: tuple[str, ...]
+    bits: dict[str, dict[str, int]]
+
+    @property
+    def all(self) -> int:
+        return (1 << len(self.ids)) - 1
+
+    def any_of(self, field: str, values: Iterable[Any]) -> int:
+        """Records with at least one of ``values`` for ``field``."""
+        field_bits = self.bits[field]
+        mask = 0
+        for value in values:
+            mask |= field_bits.get(_index_key(value), 0)
+        return mask
+
+    def all_of(self, field: str, values: Iterable[Any]) -> int:
+        """Records with every one of ``values`` for ``field``."""
+        field_bits = self.bits[field]
+        mask = self.all
+        for value in values:
+            mask &= field_bits.get(_index_key(value), 0)
+            if not mask:
+                break
+        return mask
+
+    def select(
+        self,
+        all_of: Mapping[str, Iterable[Any]] | None = None,
+        any_of: Mapping[str, Iterable[Any]] | None = None,
+        none_of: Mapping[str, Iterable[Any]] | None = None,
+    ) -> int:
+        """AND of every ``all_of`` field, each ``any_of`` field, and no ``none_of`` value."""
+        mask = self.all
+        for field, values in (all_of or {}).items():
+            mask &= self.all_of(field, values)
+        for field, values in (any_of or {}).items():
+            mask &= self.any_of(field, values)
+        for field, values in (none_of or {}).items():
+            mask &= ~self.any_of(field, values)
+        return mask
+
+    def positions(self, mask: int) -> list[int]:
+        positions = []
+        while mask:
+            low = mask & -mask
+            positions.append(low.bit_length() - 1)
+            mask ^= low
+        return positions
+
+    def ids_for(self, mask: int) -> list[str]:
+        """Record ids for the set bits of ``mask``, in catalog order."""
+        return [self.ids[position] for position in self.positions(mask)]
+
+
+def build_bitset_index(records_by_id: Mapping[str, Mapping[str, Any]], fields: Mapping[str, str]) -> BitsetIndex:
+    bits: dict[str, dict[str, int]] = {name: {} for name in fields}
+    for position, record in enumerate(records_by_id.values()):
+        bit = 1 << position
+        for name, path in fields.items():
+            field_bits = bits[name]
+            for value in _field_values(record, path):
+                field_bits[value] = field_bits.get(value, 0) | bit
+    return BitsetIndex(ids=tuple(records_by_id.keys()), bits=bits)
+
+
+# Selective interaction dimensions: context key -> dotted path into the interaction.
+SELECTION_FIELDS: dict[str, dict[str, str]] = {
+    "interactions": {
+        "npc_kind": "npc_kind",
+        "npc_id": "conditions.npc_id",
+        "place_id": "conditions.place_id",
+        "zone_id": "conditions.zone_id",
+        "time_of_day": "conditions.time_of_day",
+        "weather": "conditions.weather",
+        "season": "conditions.season",
+    },
+}
+
+
+@dataclass(frozen=True)
+class SelectionIndex(BitsetIndex):
+    """Bitsets per condition value plus a wildcard bitset per dimension.
+
+    Records whose condition is null (or an empty list) land in the wildcard
+    bucket and match any context value for that dimension.
+    """
+
+    wildcards: dict[str, int]
+
+    def eligible(self, context: Mapping[str, Any]) -> int:
+        """Records whose every dimension is a wildcard or matches ``context``.
+
+        A dimension missing from ``context`` (or None) only matches wildcards.
+        """
+        mask = self.all
+        for field, field_bits in self.bits.items():
+            allowed = self.wildcards.get(field, 0)
+            value = context.get(field)
+            if value is not None:
+                allowed |= field_bits.get(_index_key(value), 0)
+            mask &= allowed
+            if not mask:
+                break
+        return mask
+
+
+def build_selection_index(records_by_id: Mapping[str, Mapping[str, Any]], fields: Mapping[str, str]) -> SelectionIndex:
+    bitsets = build_bitset_index(records_by_id, fields)
+    wildcards = {name: 0 for name in fields}
+    for position, record in enumerate(records_by_id.values()):
+        for name, path in fields.items():
+            if not _field_values(record, path):
+                wildcards[name] |= 1 << position
+    return SelectionIndex(ids=bitsets.ids, bits=bitsets.bits, wildcards=wildcards)
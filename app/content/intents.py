@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+import os
+import re
+import threading
+from typing import Any, Iterable, Mapping
+
+from app.content.lexicon import PatternMatcher
+
+
+# Pattern kinds, highest precedence first.
+INTENT_KINDS = ("label", "phrase", "keyword")
+
+
+# Typo-tolerant fallback: the lowest confidence (1 - edits / pattern length) it accepts.
+# Values above 1 turn the fallback off.
+FUZZY_THRESHOLD = float(os.getenv("INTENT_FUZZY_THRESHOLD", "0.8"))
+
+# Candidates per lookup that get the edit-distance check, best trigram overlap first.
+FUZZY_SHORTLIST = 8
+
+# Only this many leading words of an input are considered, keeping the worst case bounded.
+FUZZY_MAX_WORDS = 24
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def normalize_intent(text: str) -> str:
+    return text.lower()
+
+
+def _fuzzy_words(text: str) -> tuple[str, ...]:
+    return tuple(_WORD_RE.findall(text.lower()))
+
+
+def _fuzzy_input(text: str) -> tuple[str, ...]:
+    return _fuzzy_words(text)[:FUZZY_MAX_WORDS]
+
+
+def _trigrams(text: str) -> set[str]:
+    padded = f" {text} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def bounded_edit_distance(a: str, b: str, limit: int) -> int | None:
+    """Levenshtein distance between ``a`` and ``b``, or None once it must exceed ``limit``."""
+    if abs(len(a) - len(b)) > limit:
+        return None
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if min(current) > limit:
+            return None
+        previous = current
+    return previous[-1] if previous[-1] <= limit else None
+
+
+def _edit_limit(length: int, threshold: float) -> int:
+    """The most edits a pattern of ``length`` characters may need and still score ``threshold``."""
+    limit = int(length * (1 - threshold))
+    # 1 - 0.8 is 0.19999999999999996, so the truncation can land one short; settle it with the check itself.
+    if 1 - (limit + 1) / length >= threshold:
+        limit += 1
+    return limit
+
+
+@dataclass(frozen=True)
+class IntentMatch:
+    action_id: str
+    kind: str
+    pattern: str
+    # 1.0 for an exact substring match, lower for a typo-tolerant one.
+    confidence: float = 1.0
+
+
+class IntentMatcher:
+    """Every label, phrase and keyword of a node's choices in one PatternMatcher.
+
+    Each pattern is ranked by (kind, choice order), so any label in the input
+    beats any phrase and any phrase beats any keyword; among patterns of one
+    kind the earlier choice wins.
+    """
+
+    def __init__(self, actions: Iterable[Mapping[str, Any]]) -> None:
+        # pattern -> (kind position, choice position, action_id); the best rank wins.
+        self._ranks: dict[str, tuple[int, int, str]] = {}
+        for position, action in enumerate(actions):
+            signature = action.get("intent_signature") or {}
+            label = str(action.get("label", ""))
+            kinds = (
+                [label] if label else [],
+                signature.get("phrases", []),
+                signature.get("keywords", []),
+            )
+            for kind, patterns in enumerate(kinds):
+                for pattern in patterns:
+                    pattern = normalize_intent(str(pattern))
+                    rank = (kind, position, action["action_id"])
+                    if pattern not in self._ranks or rank < self._ranks[pattern]:
+                        self._ranks[pattern] = rank
+        self._matcher = PatternMatcher(self._ranks)
+
+        # Typo-tolerant fallback: each pattern as words, and a trigram -> patterns inverted index.
+        self._fuzzy_patterns: list[tuple[str, tuple[str, ...]]] = []
+        self._trigram_counts: list[int] = []
+        self._by_trigram: dict[str, list[int]] = {}
+        for pattern in sorted(self._ranks, key=self._ranks.__getitem__):
+            words = _fuzzy_words(pattern)
+            if not words:
+                continue
+            position = len(self._fuzzy_patterns)
+            grams = _trigrams(" ".join(words))
+            self._fuzzy_patterns.append((pattern, words))
+            self._trigram_counts.append(len(grams))
+            for gram in grams:
+                self._by_trigram.setdefault(gram, []).append(position)
+
+    @property
+    def vocabulary(self) -> dict[str, tuple[str, str]]:
+        """pattern -> (action_id, kind) for every pattern the matcher knows."""
+        return {pattern: (action_id, INTENT_KINDS[kind]) for pattern, (kind, _, action_id) in self._ranks.items()}
+
+    def match(self, text: str) -> IntentMatch | None:
+        """The best-ranked pattern contained in ``text``, found in one pass."""
+        found = self._matcher.find_all(normalize_intent(text))
+        if not found:
+            return None
+        pattern = min(found, key=self._ranks.__getitem__)
+        kind, _, action_id = self._ranks[pattern]
+        return IntentMatch(action_id=action_id, kind=INTENT_KINDS[kind], pattern=pattern)
+
+    def fuzzy_match(self, text: str, threshold: float = FUZZY_THRESHOLD) -> IntentMatch | None:
+        """The closest pattern to a run of words in ``text`` within the confidence threshold.
+
+        Patterns sharing the most trigrams with the input are shortlisted, then
+        each is compared to the input's runs of up to as many words with an edit
+        distance capped by the threshold. Ties go to the better-ranked pattern.
+        """
+        if threshold > 1:
+            return None
+        words = _fuzzy_input(text)
+        if not words:
+            return None
+        shared: Counter[int] = Counter()
+        for gram in _trigrams(" ".join(words)):
+            shared.update(self._by_trigram.get(gram, ()))
+        # Rank by the share of each pattern's trigrams present; index order breaks ties by rank.
+        counts = self._trigram_counts
+        shortlist = sorted(shared, key=lambda position: (-shared[position] / counts[position], position))
+
+        best: tuple[float, int] | None = None
+        for position in shortlist[:FUZZY_SHORTLIST]:
+            pattern, pattern_words = self._fuzzy_patterns[position]
+            target = " ".join(pattern_words)
+            limit = _edit_limit(len(target), threshold)
+            if limit == 0:
+                continue
+            # Runs of up to one extra word, or fewer words when a typo drops the spaces.
+            for size in range(1, len(pattern_words) + 2):
+                for start in range(len(words) - size + 1):
+                    distance = bounded_edit_distance(" ".join(words[start : start + size]), target, limit)
+                    if distance is None:
+                        continue
+                    confidence = 1 - distance / len(target)
+                    if best is None or (-confidence, position) < (-best[0], best[1]):
+                        best = (confidence, position)
+        if best is None:
+            return None
+        confidence, position = best
+        pattern = self._fuzzy_patterns[position][0]
+        kind, _, action_id = self._ranks[pattern]
+        return IntentMatch(action_id=action_id, kind=INTENT_KINDS[kind], pattern=pattern, confidence=confidence)
+
+
+class SceneIntents:
+    """An IntentMatcher for every scene node of one content version, built up front.
+
+    Fuzzy fallback results are kept in a bounded LRU keyed by node and
+    normalized input, so repeated near-misses skip the edit-distance work.
+    """
+
+    def __init__(self, repo, fuzzy_threshold: float = FUZZY_THRESHOLD, fuzzy_cache_size: int = 4096) -> None:
+        self.content_version: str = repo.content_version
+        self.fuzzy_threshold = fuzzy_threshold
+        self._fuzzy_cache: OrderedDict[tuple[str, str, tuple[str, ...]], IntentMatch | None] = OrderedDict()
+        self._fuzzy_cache_size = fuzzy_cache_size
+        self._lock = threading.Lock()
+        self._matchers: dict[tuple[str, str], IntentMatcher] = {}
+        for scene_id, graph in repo.scene_graphs_by_id.items():
+            for node_id, node in graph.nodes_by_id.items():
+                actions = [repo.actions_by_id.get(str(choice_id)) for choice_id in node.get("choices", [])]
+                self._matchers[(scene_id, node_id)] = IntentMatcher(action for action in actions if action)
+
+    def get(self, scene_id: str, node_id: str) -> IntentMatcher | None:
+        return self._matchers.get((scene_id, node_id))
+
+    def match(self, scene_id: str, node_id: str, text: str) -> IntentMatch | None:
+        """Exact match first, then the typo-tolerant fallback."""
+        matcher = self._matchers.get((scene_id, node_id))
+        if matcher is None:
+            return None
+        match = matcher.match(text)
+        if match is not None:
+            return match
+        key = (scene_id, node_id, _fuzzy_input(text))
+        with self._lock:
+            if key in self._fuzzy_cache:
+                self._fuzzy_cache.move_to_end(key)
+                return self._fuzzy_cache[key]
+        match = matcher.fuzzy_match(text, self.fuzzy_threshold)
+        with self._lock:
+            self._fuzzy_cache[key] = match
+            self._fuzzy_cache.move_to_end(key)
+            while len(self._fuzzy_cache) > self._fuzzy_cache_size:
+                self._fuzzy_cache.popitem(last=False)
+        return match
+
+
+_INTENTS: OrderedDict[str, SceneIntents] = OrderedDict()
+_INTENTS_LOCK = threading.Lock()
+_INTENTS_MAXSIZE = 4
+
+
+def intents_for(repo) -> SceneIntents:
+    """The shared intent matchers for the repo's content version, built on first use."""
+    version = repo.content_version
+    with _INTENTS_LOCK:
+        intents = _INTENTS.get(version)
+        if intents is not None:
+            _INTENTS.move_to_end(version)
+            return intents
+    intents = SceneIntents(repo)
+    with _INTENTS_LOCK:
+        intents = _INTENTS.setdefault(version, intents)
+        _INTENTS.move_to_end(version)
+        while len(_INTENTS) > _INTENTS_MAXSIZE:
+            _INTENTS.popitem(last=False)
+    return intents
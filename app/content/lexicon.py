@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Iterable, Mapping
+
+
+class PatternMatcher:
+    """Aho-Corasick automaton over lower-cased patterns.
+
+    ``search`` answers "does the text contain any pattern as a substring" in one
+    pass over the text, however many patterns there are.
+    """
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        self.patterns = tuple(sorted({pattern.lower() for pattern in patterns}))
+        # An empty pattern is a substring of everything.
+        self._matches_everything = "" in self.patterns
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[tuple[str, ...]] = [()]
+        for pattern in self.patterns:
+            if pattern:
+                self._insert(pattern)
+        self._link()
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PatternMatcher):
+            return NotImplemented
+        return self.patterns == other.patterns
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def _insert(self, pattern: str) -> None:
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            state = next_state
+        self._output[state] = self._output[state] + (pattern,)
+
+    def _link(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def _step(self, state: int, char: str) -> int:
+        goto = self._goto
+        while state and char not in goto[state]:
+            state = self._fail[state]
+        return goto[state].get(char, 0)
+
+    def search(self, text: str) -> bool:
+        """True if ``text`` contains any pattern, case-insensitively."""
+        if self._matches_everything:
+            return True
+        output = self._output
+        state = 0
+        for char in text.lower():
+            state = self._step(state, char)
+            if output[state]:
+                return True
+        return False
+
+    def find_all(self, text: str) -> list[str]:
+        """Every pattern occurrence in ``text`` (lower-cased), in order of where it ends."""
+        found: list[str] = [""] if self._matches_everything else []
+        state = 0
+        for char in text.lower():
+            state = self._step(state, char)
+            found.extend(self._output[state])
+        return found
+
+
+class LexiconTables:
+    """Lexicon lookups precompiled from ``lexicon_by_key``.
+
+    Not_Allowed words form one PatternMatcher. Sensory words are screened
+    against it once, and the word array for each (place, zone) is built on first
+    use and reused for the rest of the content version.
+    """
+
+    def __init__(self, lexicon_by_key: Mapping[str, Mapping[str, Any]]) -> None:
+        banned: list[str] = []
+        for entry in lexicon_by_key.values():
+            if entry.get("lexicon_type") == "Not_Allowed":
+                banned.extend(entry.get("words", []))
+        self.matcher = PatternMatcher(banned)
+        self.not_allowed = frozenset(word.lower() for word in banned)
+
+        # Sensory entries in lexicon order, each with its words already screened.
+        self._sensory: list[tuple[str, ...]] = []
+        self._positions_by_scope: dict[str, list[int]] = {}
+        for entry in lexicon_by_key.values():
+            if entry.get("lexicon_type") != "Sensory":
+                continue
+            position = len(self._sensory)
+            self._sensory.append(tuple(word for word in entry.get("words", []) if not self.matcher.search(word)))
+            self._positions_by_scope.setdefault(entry.get("scope"), []).append(position)
+        self._words_by_place: dict[tuple[str, str | None], tuple[str, ...]] = {}
+
+    def __eq__(self, other: object) -> bool:
+        # The per-place cache is derived, so it does not take part in equality.
+        if not isinstance(other, LexiconTables):
+            return NotImplemented
+        return (self.matcher, self._sensory, self._positions_by_scope) == (
+            other.matcher,
+            other._sensory,
+            other._positions_by_scope,
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def sensory_words(self, place_id: str, zone_id: str | None) -> tuple[str, ...]:
+        """Screened Sensory words scoped Global, to the place or to its zone, in lexicon order."""
+        key = (place_id, zone_id)
+        words = self._words_by_place.get(key)
+        if words is None:
+            positions: set[int] = set()
+            for scope in ("Global", place_id, zone_id):
+                positions.update(self._positions_by_scope.get(scope, ()))
+            words = tuple(word for position in sorted(positions) for word in self._sensory[position])
+            self._words_by_place[key] = words
+        return words
+
+    def is_allowed(self, text: str) -> bool:
+        """True if ``text`` contains no Not_Allowed word."""
+        return not self.matcher.search(text)
+
+
+def lexicon_tables(repo) -> LexiconTables:
+    """The repo's precompiled tables, or fresh ones for repos that do not carry them."""
+    tables = getattr(repo, "lexicon_tables", None)
+    if tables is None:
+        tables = LexiconTables(repo.lexicon_by_key)
+    return tables
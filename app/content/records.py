@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+import sys
+import threading
+from typing import Any, Iterator
+
+# Strings up to this length are treated as enum-like (ids, tags, categories) and
+# interned so every record shares one copy; longer prose is left alone.
+INTERN_MAX_LENGTH = 64
+
+
+class Record(Mapping):
+    """Immutable, dict-compatible record with a shared key layout.
+
+    Records with the same keys (in the same order) share one generated class that
+    holds the key -> position map, so each instance only stores a tuple of values.
+    """
+
+    __slots__ = ("_values",)
+    _keys: tuple[str, ...] = ()
+    _positions: dict[str, int] = {}
+
+    def __init__(self, values: tuple[Any, ...]) -> None:
+        object.__setattr__(self, "_values", values)
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._values[self._positions[key]]
+        except KeyError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        position = self._positions.get(key)
+        return default if position is None else self._values[position]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._positions
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (_rebuild_record, (self._keys, self._values))
+
+    def __repr__(self) -> str:
+        return f"Record({dict(self.items())!r})"
+
+
+_SHAPES: dict[tuple[str, ...], type[Record]] = {}
+_SHAPES_LOCK = threading.Lock()
+
+
+def _shape_class(keys: tuple[str, ...]) -> type[Record]:
+    shape = _SHAPES.get(keys)
+    if shape is None:
+        with _SHAPES_LOCK:
+            shape = _SHAPES.get(keys)
+            if shape is None:
+                namespace = {
+                    "__slots__": (),
+                    "_keys": keys,
+                    "_positions": {key: position for position, key in enumerate(keys)},
+                }
+                shape = type("Record", (Record,), namespace)
+                _SHAPES[keys] = shape
+    return shape
+
+
+def _rebuild_record(keys: tuple[str, ...], values: tuple[Any, ...]) -> Record:
+    return _shape_class(keys)(values)
+
+
+def freeze(value: Any, memo: dict[int, Any] | None = None) -> Any:
+    """Convert parsed JSON into records, tuples and interned strings.
+
+    ``memo`` keeps objects that appear in several indexes shared after conversion.
+    """
+    if memo is None:
+        memo = {}
+    if isinstance(value, str):
+        return sys.intern(value) if len(value) <= INTERN_MAX_LENGTH else value
+    if not isinstance(value, (dict, list, tuple)):
+        return value
+    frozen = memo.get(id(value))
+    if frozen is not None:
+        return frozen
+    if isinstance(value, dict):
+        keys = tuple(sys.intern(str(key)) for key in value)
+        frozen = _shape_class(keys)(tuple(freeze(item, memo) for item in value.values()))
+    else:
+        frozen = tuple(freeze(item, memo) for item in value)
+    memo[id(value)] = frozen
+    return frozen
+
+
+def json_default(value: Any) -> Any:
+    """``default=`` hook so json.dumps accepts records."""
+    if isinstance(value, Mapping):
+        return dict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+import threading
+from typing import Callable
+
+from app.content.repo import ContentRepo
+
+
+logger = logging.getLogger(__name__)
+
+_FileState = tuple[int, int] | None
+
+
+def _file_state(path: Path) -> _FileState:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class ContentWatcher:
+    """Poll the repo's source files and swap in an incrementally reloaded repo.
+
+    Only the load steps whose files changed are re-run. The new repo must pass
+    ``validate_cross_file_integrity`` before it replaces the current one. The
+    swap is a single reference assignment, so a request that already holds a
+    repo keeps a consistent snapshot. Failed reloads are logged and the
+    current repo stays in place until the files change again; the steps that
+    failed stay pending and are re-run along with the next change.
+    """
+
+    def __init__(
+        self,
+        repo: ContentRepo,
+        on_swap: Callable[[ContentRepo], None] | None = None,
+        interval: float = 1.0,
+    ) -> None:
+        self.repo = repo
+        self.on_swap = on_swap
+        self.interval = interval
+        self._states = self._scan(repo)
+        self._pending: set[str] = set()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @staticmethod
+    def _scan(repo: ContentRepo) -> dict[Path, _FileState]:
+        return {path: _file_state(path) for path in repo.source_paths()}
+
+    def poll(self) -> ContentRepo | None:
+        """Check once for changes; return the new repo if one was swapped in."""
+        repo = self.repo
+        sources = repo.source_paths()
+        states = {path: _file_state(path) for path in sources.keys() | self._states.keys()}
+        if states == self._states:
+            return None
+        # Steps whose last reload failed are retried with whatever changed since.
+        changed_steps = set(self._pending)
+        for path, state in states.items():
+            if self._states.get(path) != state:
+                # A scene file that was just added or removed is not in sources yet.
+                changed_steps.update(sources.get(path, ("scenes",)))
+        self._states = states
+
+        try:
+            new_repo = repo.reloaded(changed_steps)
+        except (ValueError, OSError) as exc:
+            self._pending = changed_steps
+            logger.warning("Content reload failed for %s: %s", ", ".join(sorted(changed_steps)), exc)
+            return None
+
+        self._pending = set()
+        self.repo = new_repo
+        logger.info("Content reloaded: %s", ", ".join(sorted(changed_steps)))
+        if self.on_swap is not None:
+            self.on_swap(new_repo)
+        return new_repo
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception:  # keep watching; a bad poll must not kill the thread
+                logger.exception("Content watcher poll failed")
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="content-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
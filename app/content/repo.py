@@ -1,11 +1,43 @@
 from __future__ import annotations
 
 from collections import defaultdict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+import copy
+import hashlib
+import json
+import logging
+import os
 from pathlib import Path
+import threading
 from typing import Any, Iterable
 
+from app.content.indexes import (
+    BITSET_FIELDS,
+    QUERY_FIELDS,
+    SELECTION_FIELDS,
+    BitsetIndex,
+    QueryIndex,
+    SelectionIndex,
+    build_bitset_index,
+    build_query_index,
+    build_selection_index,
+)
 from app.content.loader import load_json
+from app.content.lexicon import LexiconTables
 from app.content.manifest import ContentManifest
+from app.content.records import freeze, json_default
+from app.content.scene_graph import (
+    ActionRoute,
+    SceneGraph,
+    build_action_routes,
+    compile_scene_graph,
+)
+from app.content.schema_utils import SCHEMA_REGISTRY
+from app.content.snapshot import content_fingerprint, read_snapshot, write_snapshot
+from app.content.validators import validate_cross_file_integrity
+
+
+logger = logging.getLogger(__name__)
 
 
 def _index_by_id(items: Iterable[dict[str, Any]], id_key: str, source: str) -> dict[str, dict[str, Any]]:
@@ -20,10 +52,143 @@ def _index_by_id(items: Iterable[dict[str, Any]], id_key: str, source: str) -> d
     return index
 
 
+def _digest_default(value: Any) -> Any:
+    try:
+        return json_default(value)
+    except TypeError:
+        return str(value)
+
+
+def content_digest(value: Any) -> str:
+    """Stable hash of JSON-like content, independent of dict ordering and record types."""
+    encoded = json.dumps(
+        value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=_digest_default
+    )
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+LOADER_MODES = ("serial", "thread", "process")
+
+
+def _scene_graph_indexes(scenes_by_id: dict[str, Any]) -> dict[str, Any]:
+    graphs = {scene_id: compile_scene_graph(scene) for scene_id, scene in scenes_by_id.items()}
+    return {"scene_graphs_by_id": graphs, "scene_routes_by_action": build_action_routes(graphs.values())}
+
+
+def _run_load_step(root: Path, manifest: ContentManifest, step: str) -> dict[str, Any]:
+    """Run one ``_load_<step>`` on a blank repo and return the indexes it built.
+
+    Module-level so it can be shipped to a process pool.
+    """
+    repo = ContentRepo.__new__(ContentRepo)
+    repo.root = root
+    repo.manifest = manifest
+    getattr(repo, f"_load_{step}")()
+    return {name: value for name, value in vars(repo).items() if name not in ContentRepo._CONFIG_ATTRS}
+
+
 class ContentRepo:
-    def __init__(self, root: Path | str | None = None, manifest: ContentManifest | None = None) -> None:
+    # Attributes that configure the repo or track loading rather than hold content.
+    _CONFIG_ATTRS = (
+        "root",
+        "manifest",
+        "snapshot_path",
+        "loader",
+        "max_workers",
+        "lazy",
+        "compact",
+        "_loaded_steps",
+        "_step_locks",
+        "_warm_lock",
+    )
+
+    # Independent load steps, in the order the serial path runs them.
+    _LOAD_STEPS = (
+        "places",
+        "collectibles",
+        "npcs",
+        "interactions",
+        "actions",
+        "scenes",
+        "tea",
+        "spells",
+        "ingredient_substitutions",
+        "journal_templates",
+        "lexicons",
+    )
+
+    # Indexes each load step (re)binds.
+    _STEP_INDEXES: dict[str, tuple[str, ...]] = {
+        "places": ("places_by_id", "zones_by_id"),
+        "collectibles": ("collectibles_by_id",),
+        "npcs": ("npcs_by_id",),
+        "interactions": ("interactions_by_id", "interactions_by_npc_kind", "interactions_by_place_id"),
+        "actions": ("actions_by_id",),
+        "scenes": ("scenes_by_id", "scenes_by_place_id"),
+        "tea": ("tea_by_id",),
+        "spells": ("spells_by_id",),
+        "ingredient_substitutions": ("substitutions_by_token",),
+        "journal_templates": ("journal_templates_by_id", "journal_templates_by_entry_type"),
+        "lexicons": ("lexicon_by_key",),
+    }
+
+    # Lookup structures each load step derives from its indexes; not part of the content hash.
+    _STEP_DERIVED: dict[str, tuple[str, ...]] = {
+        "places": ("places_query_index",),
+        "collectibles": ("collectibles_query_index", "collectibles_bitsets"),
+        "npcs": ("npcs_query_index",),
+        "interactions": ("interactions_query_index", "interactions_selection_index"),
+        "actions": ("actions_query_index",),
+        "scenes": ("scenes_query_index", "scene_graphs_by_id", "scene_routes_by_action"),
+        "lexicons": ("lexicon_tables",),
+    }
+
+    # Manifest entries (assets, schemas) each load step reads.
+    _STEP_SOURCES: dict[str, tuple[tuple[str, ...], tuple[str, ...]]] = {
+        "places": (("places",), ("places",)),
+        "collectibles": (("collectibles",), ("collectibles",)),
+        "npcs": (("npcs",), ("npcs",)),
+        "interactions": (("interactions",), ("interactions",)),
+        "actions": (("actions",), ("actions",)),
+        "scenes": (("scene_manifest",), ("scene_manifest", "scene")),
+        "tea": (("tea",), ("tea",)),
+        "spells": (("spells",), ("spells",)),
+        "ingredient_substitutions": (("ingredient_substitutions",), ("ingredient_substitutions",)),
+        "journal_templates": (("journal_templates",), ("journal_templates",)),
+        "lexicons": ((), ("lexicon",)),
+    }
+
+    def __init__(
+        self,
+        root: Path | str | None = None,
+        manifest: ContentManifest | None = None,
+        snapshot_path: Path | str | None = None,
+        loader: str = "serial",
+        max_workers: int | None = None,
+        lazy: bool = False,
+        compact: bool = False,
+    ) -> None:
+        if loader not in LOADER_MODES:
+            raise ValueError(f"Unknown loader mode: {loader}")
+        if lazy and snapshot_path:
+            raise ValueError("Lazy loading cannot be combined with a snapshot")
         self.root = Path(root) if root else Path(__file__).resolve().parents[2]
         self.manifest = manifest or ContentManifest()
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else None
+        self.loader = loader
+        self.max_workers = max_workers
+        self.lazy = lazy
+        # Store records as frozen, slotted, dict-compatible Records (see app.content.records).
+        self.compact = compact
+        self._loaded_steps: set[str] = set()
+        self._step_locks = {step: threading.Lock() for step in self._LOAD_STEPS}
+        self._warm_lock = threading.Lock()
+
+        if lazy:
+            # Indexes stay unset until first access; see __getattr__. Each step's
+            # hash is recorded as the step loads.
+            self.content_hashes = {}
+            return
 
         self.places_by_id: dict[str, dict[str, Any]] = {}
         self.zones_by_id: dict[str, dict[str, Any]] = {}
@@ -37,23 +202,197 @@ class ContentRepo:
         self.scenes_by_place_id: dict[str, list[dict[str, Any]]] = {}
         self.tea_by_id: dict[str, dict[str, Any]] = {}
         self.spells_by_id: dict[str, dict[str, Any]] = {}
+        self.substitutions_by_token: dict[str, dict[str, Any]] = {}
         self.journal_templates_by_entry_type: dict[str, list[dict[str, Any]]] = {}
         self.journal_templates_by_id: dict[str, dict[str, Any]] = {}
         self.lexicon_by_key: dict[str, dict[str, Any]] = {}
 
+        # Secondary indexes backing filtered world queries, one per collection.
+        self.places_query_index: QueryIndex = build_query_index({}, {})
+        self.collectibles_query_index: QueryIndex = build_query_index({}, {})
+        self.npcs_query_index: QueryIndex = build_query_index({}, {})
+        self.interactions_query_index: QueryIndex = build_query_index({}, {})
+        self.actions_query_index: QueryIndex = build_query_index({}, {})
+        self.scenes_query_index: QueryIndex = build_query_index({}, {})
+        # Compiled node graphs for session stepping.
+        self.scene_graphs_by_id: dict[str, SceneGraph] = {}
+        self.scene_routes_by_action: dict[str, tuple[ActionRoute, ...]] = {}
+        # Attribute bitsets for offer pools and ingredient selectors.
+        self.collectibles_bitsets: BitsetIndex = build_bitset_index({}, {})
+        # Condition buckets (null = wildcard) for NPC encounter selection.
+        self.interactions_selection_index: SelectionIndex = build_selection_index({}, {})
+        # Banned-word matcher and screened sensory words for scene generation.
+        self.lexicon_tables: LexiconTables = LexiconTables({})
+
+        # Per load step content hashes plus one version hash over all of them.
+        self.content_hashes: dict[str, str] = {}
+        self.content_version: str = ""
+
+        if self.snapshot_path is not None:
+            self._load_with_snapshot(self.snapshot_path)
+        else:
+            self._load_all()
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for attributes that are not set yet, i.e. unloaded indexes of a lazy repo.
+        if name.startswith("__") or not self.__dict__.get("lazy"):
+            raise AttributeError(name)
+        step = _ATTR_STEPS.get(name)
+        if step is not None:
+            self._ensure_step(step)
+        elif name == "content_version":
+            # A version covers every asset, so asking for it loads them all.
+            self.warm()
+        else:
+            raise AttributeError(name)
+        return self.__dict__[name]
+
+    def _ensure_step(self, step: str) -> None:
+        if step in self._loaded_steps:
+            return
+        with self._step_locks[step]:
+            if step not in self._loaded_steps:
+                self._apply_step(step, _run_load_step(self.root, self.manifest, step))
+
+    def _apply_step(self, step: str, result: dict[str, Any]) -> None:
+        self.__dict__.update(self._compacted(step, result))
+        self.content_hashes[step] = self._step_hash(step)
+        self._loaded_steps.add(step)
+
+    def _compacted(self, step: str, attrs: dict[str, Any]) -> dict[str, Any]:
+        """The step's indexes from attrs, frozen into records when the repo is compact."""
+        if not self.compact:
+            return attrs
+        frozen = dict(attrs)
+        # One memo per step keeps records shared between that step's indexes.
+        memo: dict[int, Any] = {}
+        for name in self._STEP_INDEXES[step]:
+            frozen[name] = {key: freeze(value, memo) for key, value in attrs[name].items()}
+        if step == "scenes":
+            # Graphs hold node mappings; rebuild them on the frozen scenes so only one copy stays alive.
+            frozen.update(_scene_graph_indexes(frozen["scenes_by_id"]))
+        return frozen
+
+    def warm(self) -> ContentRepo:
+        """Load every step that is not loaded yet. A no-op for eagerly loaded repos."""
+        with self._warm_lock:
+            if "content_version" in self.__dict__:
+                return self
+            missing = [step for step in self._LOAD_STEPS if step not in self._loaded_steps]
+            if self.loader != "serial" and len(missing) > 1:
+                for step, result in zip(missing, self._run_steps_concurrently(missing)):
+                    with self._step_locks[step]:
+                        if step not in self._loaded_steps:
+                            self._apply_step(step, result)
+            else:
+                for step in missing:
+                    self._ensure_step(step)
+            # Every step hashed itself as it loaded; only the version is left.
+            self._refresh_content_hashes(())
+        return self
+
+    def _load_with_snapshot(self, snapshot_path: Path) -> None:
+        fingerprint = content_fingerprint(self.root, self.manifest)
+        if self.compact:
+            fingerprint = f"{fingerprint}:compact"
+        state = read_snapshot(snapshot_path, fingerprint)
+        if state is not None:
+            self.__dict__.update(state)
+            self._loaded_steps.update(self._LOAD_STEPS)
+            return
         self._load_all()
+        state = {name: value for name, value in vars(self).items() if name not in self._CONFIG_ATTRS}
+        write_snapshot(snapshot_path, fingerprint, state)
 
     def _load_all(self) -> None:
-        self._load_places()
-        self._load_collectibles()
-        self._load_npcs()
-        self._load_interactions()
-        self._load_actions()
-        self._load_scenes()
-        self._load_tea()
-        self._load_spells()
-        self._load_journal_templates()
-        self._load_lexicons()
+        if self.loader == "serial":
+            for step in self._LOAD_STEPS:
+                getattr(self, f"_load_{step}")()
+        else:
+            for result in self._run_steps_concurrently(self._LOAD_STEPS):
+                self.__dict__.update(result)
+        for step in self._LOAD_STEPS:
+            self.__dict__.update(self._compacted(step, self.__dict__))
+        self._loaded_steps.update(self._LOAD_STEPS)
+        self._refresh_content_hashes(self._LOAD_STEPS)
+
+    def _refresh_content_hashes(self, steps: Iterable[str]) -> None:
+        hashes = dict(self.__dict__.get("content_hashes", {}))
+        for step in steps:
+            hashes[step] = self._step_hash(step)
+        self.content_hashes = {step: hashes[step] for step in self._LOAD_STEPS if step in hashes}
+        self.content_version = content_digest(self.content_hashes)
+
+    def _step_hash(self, step: str) -> str:
+        return content_digest({name: getattr(self, name) for name in self._STEP_INDEXES[step]})
+
+    def source_paths(self) -> dict[Path, tuple[str, ...]]:
+        """Map every file the repo was loaded from to the load steps that read it.
+
+        Schemas that no step owns directly (``common``, ``conditions``) can be
+        ``$ref``'d from anywhere, so they map to every step.
+        """
+        sources: dict[Path, set[str]] = defaultdict(set)
+        owned_schemas: set[str] = set()
+        for step, (asset_keys, schema_keys) in self._STEP_SOURCES.items():
+            for key in asset_keys:
+                sources[self.root / self.manifest.assets[key]].add(step)
+            for key in schema_keys:
+                sources[self.root / self.manifest.schemas[key]].add(step)
+                owned_schemas.add(key)
+        for rel_path in self.manifest.lexicons.values():
+            sources[self.root / rel_path].add("lexicons")
+        scenes_dir = (self.root / self.manifest.assets["scene_manifest"]).parent
+        for scene_path in scenes_dir.glob("*.json"):
+            sources[scene_path].add("scenes")
+        for key, rel_path in self.manifest.schemas.items():
+            if key not in owned_schemas:
+                sources[self.root / rel_path].update(self._LOAD_STEPS)
+        return {path: tuple(step for step in self._LOAD_STEPS if step in steps) for path, steps in sources.items()}
+
+    def reloaded(self, steps: Iterable[str]) -> ContentRepo:
+        """Return a new repo with only ``steps`` re-loaded; this repo is left untouched.
+
+        Indexes from steps that did not change are shared with this repo, which is
+        safe because load steps always rebind their indexes instead of mutating them.
+        """
+        steps = set(steps)
+        unknown = steps - set(self._LOAD_STEPS)
+        if unknown:
+            raise ValueError(f"Unknown load steps: {', '.join(sorted(unknown))}")
+        # Integrity checks need every index, so a lazy repo is fully loaded first.
+        self.warm()
+        repo = copy.copy(self)
+        repo._loaded_steps = set(self._loaded_steps)
+        repo._step_locks = {step: threading.Lock() for step in self._LOAD_STEPS}
+        repo._warm_lock = threading.Lock()
+        # Schemas may have changed with the assets; don't let a recent check hide that.
+        SCHEMA_REGISTRY.expire()
+        for step in self._LOAD_STEPS:
+            if step in steps:
+                getattr(repo, f"_load_{step}")()
+                repo.__dict__.update(repo._compacted(step, repo.__dict__))
+        repo._refresh_content_hashes(steps)
+        validate_cross_file_integrity(repo)
+        return repo
+
+    def _executor(self) -> Executor:
+        workers = self.max_workers or min(len(self._LOAD_STEPS), os.cpu_count() or 1)
+        if self.loader == "process":
+            return ProcessPoolExecutor(max_workers=workers)
+        return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="content-load")
+
+    def _run_steps_concurrently(self, steps: Iterable[str]) -> list[dict[str, Any]]:
+        # Steps run on blank repos and their results come back in serial order, so
+        # the first failing step (in serial order) is the error that surfaces.
+        with self._executor() as executor:
+            futures = [executor.submit(_run_load_step, self.root, self.manifest, step) for step in steps]
+            try:
+                return [future.result() for future in futures]
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
 
     def _load_places(self) -> None:
         path = self.root / self.manifest.assets["places"]
@@ -63,6 +402,7 @@ class ContentRepo:
         zones = data.get("zones", [])
         self.places_by_id = _index_by_id(places, "place_id", "places")
         self.zones_by_id = _index_by_id(zones, "zone_id", "zones")
+        self.places_query_index = build_query_index(self.places_by_id, QUERY_FIELDS["places"])
 
     def _load_collectibles(self) -> None:
         path = self.root / self.manifest.assets["collectibles"]
@@ -76,12 +416,15 @@ class ContentRepo:
                 item["collectible_id"] = item_id
             collectibles.append(item)
         self.collectibles_by_id = _index_by_id(collectibles, "collectible_id", "collectibles")
+        self.collectibles_query_index = build_query_index(self.collectibles_by_id, QUERY_FIELDS["collectibles"])
+        self.collectibles_bitsets = build_bitset_index(self.collectibles_by_id, BITSET_FIELDS["collectibles"])
 
     def _load_npcs(self) -> None:
         path = self.root / self.manifest.assets["npcs"]
         schema = self.root / self.manifest.schemas["npcs"]
         data = load_json(path, schema_path=schema) or {}
         self.npcs_by_id = _index_by_id(data.get("npcs", []), "npc_id", "npcs")
+        self.npcs_query_index = build_query_index(self.npcs_by_id, QUERY_FIELDS["npcs"])
 
     def _load_interactions(self) -> None:
         path = self.root / self.manifest.assets["interactions"]
@@ -103,6 +446,10 @@ class ContentRepo:
 
         self.interactions_by_npc_kind = dict(by_npc_kind)
         self.interactions_by_place_id = dict(by_place_id)
+        self.interactions_query_index = build_query_index(self.interactions_by_id, QUERY_FIELDS["interactions"])
+        self.interactions_selection_index = build_selection_index(
+            self.interactions_by_id, SELECTION_FIELDS["interactions"]
+        )
 
     def _load_tea(self) -> None:
         path = self.root / self.manifest.assets["tea"]
@@ -134,10 +481,11 @@ class ContentRepo:
         schema = self.root / self.manifest.schemas["actions"]
         if not path.exists():
             self.actions_by_id = {}
-            return
-        data = load_json(path, schema_path=schema) or {}
-        actions = data.get("actions", [])
-        self.actions_by_id = _index_by_id(actions, "action_id", "actions")
+        else:
+            data = load_json(path, schema_path=schema) or {}
+            actions = data.get("actions", [])
+            self.actions_by_id = _index_by_id(actions, "action_id", "actions")
+        self.actions_query_index = build_query_index(self.actions_by_id, QUERY_FIELDS["actions"])
 
     def _load_scenes(self) -> None:
         manifest_path = self.root / self.manifest.assets["scene_manifest"]
@@ -147,6 +495,9 @@ class ContentRepo:
         if not manifest_path.exists():
             self.scenes_by_id = {}
             self.scenes_by_place_id = {}
+            self.scenes_query_index = build_query_index({}, QUERY_FIELDS["scenes"])
+            self.scene_graphs_by_id = {}
+            self.scene_routes_by_action = {}
             return
 
         manifest_data = load_json(manifest_path, schema_path=manifest_schema) or {}
@@ -169,6 +520,27 @@ class ContentRepo:
             if place_id:
                 by_place[str(place_id)].append(scene)
         self.scenes_by_place_id = dict(by_place)
+        self.scenes_query_index = build_query_index(self.scenes_by_id, QUERY_FIELDS["scenes"])
+
+        # Broken graphs fail the load here rather than a session step later.
+        self.__dict__.update(_scene_graph_indexes(self.scenes_by_id))
+        for graph in self.scene_graphs_by_id.values():
+            if graph.unreachable:
+                logger.warning(
+                    "Scene %s has nodes unreachable from %s: %s",
+                    graph.scene_id,
+                    graph.entry_node,
+                    ", ".join(graph.unreachable),
+                )
+
+    def _load_ingredient_substitutions(self) -> None:
+        path = self.root / self.manifest.assets["ingredient_substitutions"]
+        schema = self.root / self.manifest.schemas["ingredient_substitutions"]
+        if not path.exists():
+            self.substitutions_by_token = {}
+            return
+        data = load_json(path, schema_path=schema) or {}
+        self.substitutions_by_token = _index_by_id(data.get("substitutions", []), "token", "ingredient_substitutions")
 
     def _load_journal_templates(self) -> None:
         path = self.root / self.manifest.assets["journal_templates"]
@@ -193,3 +565,12 @@ class ContentRepo:
             lexicon_entries.extend(data.get("lexicon", []))
 
         self.lexicon_by_key = _index_by_id(lexicon_entries, "key", "lexicons")
+        self.lexicon_tables = LexiconTables(self.lexicon_by_key)
+
+
+# Which load step binds each index; lazy repos use this to load on first access.
+_ATTR_STEPS: dict[str, str] = {
+    name: step
+    for step in ContentRepo._LOAD_STEPS
+    for name in ContentRepo._STEP_INDEXES[step] + ContentRepo._STEP_DERIVED.get(step, ())
+}
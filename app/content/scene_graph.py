@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Iterable, Mapping
+
+
+@dataclass(frozen=True)
+class SceneGraph:
+    """A scene's node graph, compiled once per content load.
+
+    ``targets`` maps every id a choice may use (a node_id or an action_ref) to
+    the node it leads to; as in the original node scan, the first node in scene
+    order wins. ``choices`` holds each node's eligible choice ids, ``edges`` the
+    node_ids those choices reach and ``sources`` the reverse: the nodes offering
+    each choice id. ``unreachable`` lists nodes that cannot be reached from
+    ``entry_node``, in scene order.
+    """
+
+    scene_id: str
+    entry_node: str
+    nodes_by_id: dict[str, Mapping[str, Any]]
+    targets: dict[str, str]
+    choices: dict[str, frozenset[str]]
+    edges: dict[str, frozenset[str]]
+    sources: dict[str, frozenset[str]]
+    reachable: frozenset[str]
+    terminal_nodes: frozenset[str]
+    unreachable: tuple[str, ...]
+
+    def node(self, node_id: str) -> Mapping[str, Any] | None:
+        return self.nodes_by_id.get(node_id)
+
+    def target(self, node_id: str, action_id: str) -> Mapping[str, Any] | None:
+        """The node ``action_id`` leads to from ``node_id``, or None if it is not one of its choices."""
+        if action_id not in self.choices.get(node_id, ()):
+            return None
+        return self.nodes_by_id[self.targets[action_id]]
+
+
+def compile_scene_graph(scene: Mapping[str, Any]) -> SceneGraph:
+    """Compile a scene's nodes; raises ValueError for a graph a session could not walk."""
+    scene_id = scene.get("scene_id")
+    nodes_by_id: dict[str, Mapping[str, Any]] = {}
+    targets: dict[str, str] = {}
+    for node in scene.get("nodes", []):
+        node_id = node.get("node_id")
+        if node_id is None:
+            raise ValueError(f"Missing node_id in scene {scene_id}")
+        if node_id in nodes_by_id:
+            raise ValueError(f"Duplicate node_id in scene {scene_id}: {node_id}")
+        nodes_by_id[node_id] = node
+        targets.setdefault(node_id, node_id)
+        action_ref = node.get("action_ref")
+        if action_ref:
+            targets.setdefault(str(action_ref), node_id)
+
+    entry_node = scene.get("entry_node")
+    if entry_node not in nodes_by_id:
+        raise ValueError(f"Scene {scene_id} entry_node does not exist: {entry_node}")
+
+    choices: dict[str, frozenset[str]] = {}
+    edges: dict[str, frozenset[str]] = {}
+    sources: dict[str, set[str]] = {}
+    for node_id, node in nodes_by_id.items():
+        node_choices = [str(choice) for choice in node.get("choices", [])]
+        dangling = [choice for choice in node_choices if choice not in targets]
+        if dangling:
+            raise ValueError(f"Scene {scene_id} node {node_id} has choices leading nowhere: {', '.join(dangling)}")
+        choices[node_id] = frozenset(node_choices)
+        edges[node_id] = frozenset(targets[choice] for choice in node_choices)
+        for choice in node_choices:
+            sources.setdefault(choice, set()).add(node_id)
+
+    reachable = {entry_node}
+    queue = deque([entry_node])
+    while queue:
+        for next_id in edges[queue.popleft()]:
+            if next_id not in reachable:
+                reachable.add(next_id)
+                queue.append(next_id)
+
+    return SceneGraph(
+        scene_id=scene_id,
+        entry_node=entry_node,
+        nodes_by_id=nodes_by_id,
+        targets=targets,
+        choices=choices,
+        edges=edges,
+        sources={choice: frozenset(node_ids) for choice, node_ids in sources.items()},
+        reachable=frozenset(reachable),
+        terminal_nodes=frozenset(node_id for node_id, node_edges in edges.items() if not node_edges),
+        unreachable=tuple(node_id for node_id in nodes_by_id if node_id not in reachable),
+    )
+
+
+@dataclass(frozen=True)
+class ActionRoute:
+    """Taking ``action_id`` in ``scene_id`` from any of ``source_nodes`` leads to ``target_node``.
+
+    ``self_loop`` is set when ``target_node`` offers ``action_id`` again, so a
+    write filtered on the source nodes alone could apply the action twice.
+    """
+
+    scene_id: str
+    action_id: str
+    source_nodes: tuple[str, ...]
+    target_node: str
+    self_loop: bool = False
+
+
+def build_action_routes(graphs: Iterable[SceneGraph]) -> dict[str, tuple[ActionRoute, ...]]:
+    """action_id -> every scene route it can take, so a step can be written without reading the session first."""
+    routes: dict[str, list[ActionRoute]] = {}
+    for graph in graphs:
+        for action_id, node_ids in graph.sources.items():
+            target_node = graph.targets[action_id]
+            route = ActionRoute(
+                scene_id=graph.scene_id,
+                action_id=action_id,
+                source_nodes=tuple(sorted(node_ids)),
+                target_node=target_node,
+                self_loop=target_node in node_ids,
+            )
+            routes.setdefault(action_id, []).append(route)
+    return {action_id: tuple(action_routes) for action_id, action_routes in routes.items()}
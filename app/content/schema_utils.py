@@ -1,26 +1,124 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 import json
 from pathlib import Path
+import threading
+import time
 
 import jsonschema
+from referencing import Registry, Resource
+from referencing.jsonschema import DRAFT202012
 
 
-def load_validator(schema_path: Path) -> jsonschema.Draft202012Validator:
-    schema = json.loads(schema_path.read_text(encoding="utf-8"))
-    store = {}
-    for candidate in schema_path.parent.glob("*.json"):
-        try:
-            candidate_schema = json.loads(candidate.read_text(encoding="utf-8"))
-        except json.JSONDecodeError:
-            continue
-        schema_id = candidate_schema.get("$id")
-        if schema_id:
-            store[schema_id] = candidate_schema
-        store[candidate.resolve().as_uri()] = candidate_schema
-    resolver = jsonschema.RefResolver(
-        base_uri=schema_path.resolve().as_uri(),
-        referrer=schema,
-        store=store,
-    )
-    return jsonschema.Draft202012Validator(schema, resolver=resolver)
+def _stat_key(path: Path) -> tuple[int, int]:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+@dataclass
+class _CachedValidator:
+    key: tuple
+    validator: jsonschema.Draft202012Validator
+    checked_at: float
+
+
+class SchemaRegistry:
+    """Process-wide cache of parsed schema stores and compiled validators.
+
+    Each schema directory is parsed once into an immutable ``referencing``
+    registry shared by every validator, so compiled validators are safe to use
+    from several threads. Validators are compiled once per schema file and are
+    rebuilt only when a file in the directory changes (mtime or size).
+
+    The directory is checked for changes at most once per ``recheck_interval``
+    seconds per schema, and cache hits take no lock; ``expire`` forces the next
+    lookup to check again.
+    """
+
+    def __init__(self, recheck_interval: float = 1.0) -> None:
+        self.recheck_interval = recheck_interval
+        self._lock = threading.RLock()
+        self._stores: dict[Path, tuple[tuple, dict[str, dict], Registry]] = {}
+        self._validators: dict[Path, _CachedValidator] = {}
+        self._resolved: dict[Path, Path] = {}
+
+    def _directory_key(self, directory: Path) -> tuple:
+        return tuple(sorted((path.name, *_stat_key(path)) for path in directory.glob("*.json")))
+
+    def _store_for(self, directory: Path, key: tuple) -> tuple[dict[str, dict], Registry]:
+        cached = self._stores.get(directory)
+        if cached is not None and cached[0] == key:
+            return cached[1], cached[2]
+        store: dict[str, dict] = {}
+        for candidate in directory.glob("*.json"):
+            try:
+                candidate_schema = json.loads(candidate.read_text(encoding="utf-8"))
+            except json.JSONDecodeError:
+                continue
+            schema_id = candidate_schema.get("$id")
+            if schema_id:
+                store[schema_id] = candidate_schema
+            store[candidate.resolve().as_uri()] = candidate_schema
+        registry = Registry().with_resources(
+            (uri, Resource.from_contents(contents, default_specification=DRAFT202012))
+            for uri, contents in store.items()
+        )
+        self._stores[directory] = (key, store, registry)
+        return store, registry
+
+    def _resolve(self, schema_path: Path | str) -> Path:
+        path = Path(schema_path)
+        resolved = self._resolved.get(path)
+        if resolved is None:
+            resolved = path.resolve()
+            # A relative path resolves against the working directory, so only absolute ones are remembered.
+            if path.is_absolute():
+                self._resolved[path] = resolved
+        return resolved
+
+    def validator(self, schema_path: Path | str) -> jsonschema.Draft202012Validator:
+        schema_path = self._resolve(schema_path)
+        now = time.monotonic()
+        cached = self._validators.get(schema_path)
+        if cached is not None and now - cached.checked_at < self.recheck_interval:
+            return cached.validator
+        # Stat outside the lock so concurrent callers do not queue behind each other's syscalls.
+        key = (_stat_key(schema_path), self._directory_key(schema_path.parent))
+        if cached is not None and cached.key == key:
+            cached.checked_at = now
+            return cached.validator
+        with self._lock:
+            cached = self._validators.get(schema_path)
+            if cached is not None and cached.key == key:
+                return cached.validator
+            store, registry = self._store_for(schema_path.parent, key[1])
+            schema = store.get(schema_path.as_uri())
+            if schema is None:
+                # The target itself failed to parse; surface the decode error.
+                schema = json.loads(schema_path.read_text(encoding="utf-8"))
+            if "$id" not in schema:
+                # Relative $refs resolve against the schema's own file location.
+                schema = {**schema, "$id": schema_path.as_uri()}
+            validator = jsonschema.Draft202012Validator(schema, registry=registry)
+            self._validators[schema_path] = _CachedValidator(key, validator, now)
+            return validator
+
+    def expire(self) -> None:
+        """Make the next lookup of every schema check its directory for changes."""
+        with self._lock:
+            for cached in self._validators.values():
+                cached.checked_at = float("-inf")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._stores.clear()
+            self._validators.clear()
+            self._resolved.clear()
+
+
+SCHEMA_REGISTRY = SchemaRegistry()
+
+
+def load_validator(schema_path: Path | str) -> jsonschema.Draft202012Validator:
+    return SCHEMA_REGISTRY.validator(schema_path)
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+import pickle
+import tempfile
+from typing import Any
+
+from app.content.manifest import ContentManifest
+
+
+SNAPSHOT_FORMAT = 1
+
+# Loader code is part of the fingerprint so a snapshot written by an older
+# ContentRepo is never restored into a newer one.
+_LOADER_SOURCES = sorted(Path(__file__).resolve().parent.glob("*.py"))
+
+
+def _hash_file(digest: Any, label: str, path: Path) -> None:
+    digest.update(label.encode("utf-8"))
+    digest.update(b"\0")
+    try:
+        digest.update(path.read_bytes())
+    except FileNotFoundError:
+        digest.update(b"<missing>")
+    digest.update(b"\0")
+
+
+def content_fingerprint(root: Path, manifest: ContentManifest) -> str:
+    digest = hashlib.sha256(f"snapshot:{SNAPSHOT_FORMAT}".encode("utf-8"))
+    for source in _LOADER_SOURCES:
+        _hash_file(digest, f"loader:{source.name}", source)
+    for section in ("schemas", "assets", "lexicons"):
+        for label, rel_path in sorted(getattr(manifest, section).items()):
+            _hash_file(digest, f"{section}:{label}:{rel_path}", root / rel_path)
+
+    scenes_dir = (root / manifest.assets["scene_manifest"]).parent
+    for scene_path in sorted(scenes_dir.glob("*.json")):
+        _hash_file(digest, f"scene:{scene_path.name}", scene_path)
+    return digest.hexdigest()
+
+
+def read_snapshot(path: Path, fingerprint: str) -> dict[str, Any] | None:
+    """Return the stored repo state when the snapshot matches fingerprint, else None.
+
+    Snapshots are local pickle files written by this process family; never point
+    this at a file from an untrusted source.
+    """
+    try:
+        with path.open("rb") as handle:
+            payload = pickle.load(handle)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    if not isinstance(payload, dict):
+        return None
+    if payload.get("format") != SNAPSHOT_FORMAT or payload.get("fingerprint") != fingerprint:
+        return None
+    return payload.get("state")
+
+
+def write_snapshot(path: Path, fingerprint: str, state: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"format": SNAPSHOT_FORMAT, "fingerprint": fingerprint, "state": state}
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            pickle.dump(payload, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
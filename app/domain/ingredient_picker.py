@@ -1,12 +1,292 @@
-# TODO:
+from __future__ import annotations
 
-# ### 3.3 Ingredient picking (locality rules)
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+import random
+import re
+import threading
+from typing import Any, Iterable, Mapping
 
-# File: `app/domain/ingredient_picker.py`
+from app.content.indexes import BitsetIndex
 
-# Implement:
 
-# - place_policy order: same_place (strict) > same_zone > any_place
-# - use places.json zone_id mapping (no heuristics once places are loaded)
-# - ensure picks are compatible with entry_type (tea/spell constraints)
+TOKEN_PREFIX = "any:"
 
+# Locality tiers, narrowest first. A token's place_policy is the widest tier a
+# pick may reach: same_place is strict, any_place may widen all the way.
+PLACE_POLICIES = ("same_place", "same_zone", "any_place")
+
+DEFAULT_MAX_RESULTS = 10
+
+# Selector clause keys (and ad-hoc token keys) -> collectible bitset attribute.
+_CLAUSE_FIELDS = {
+    "tags": "tag",
+    "tag": "tag",
+    "category": "item_type",
+    "item_type": "item_type",
+    "usable_in": "usable_in",
+    "safety_category": "safety_category",
+    "origin_scope": "origin_scope",
+    "place_id": "origin_ref",
+    "place": "origin_ref",
+}
+
+
+@dataclass(frozen=True)
+class Substitution:
+    """An ingredient ref resolved to its candidate collectible ids (catalog order)."""
+
+    token: str
+    candidates: tuple[str, ...]
+    place_policy: str = "any_place"
+    max_results: int = DEFAULT_MAX_RESULTS
+    fallback: str | None = None
+    # The candidates as a bitset over the collectibles index, for ANDing with locality tiers.
+    mask: int = 0
+
+    @property
+    def choices(self) -> tuple[str, ...]:
+        """Candidates, or the fallback alone when nothing matches."""
+        if self.candidates or not self.fallback:
+            return self.candidates
+        return (self.fallback,)
+
+
+def parse_token(token: str) -> dict[str, Any]:
+    """Build a substitution rule for an ad-hoc ``any:key=value&key=value`` token."""
+    if not token.startswith(TOKEN_PREFIX):
+        raise ValueError(f"Not an ingredient token: {token}")
+    clauses: list[dict[str, str]] = []
+    place_policy = "any_place"
+    for part in re.split(r"[&;]", token[len(TOKEN_PREFIX):]):
+        key, sep, value = part.partition("=")
+        if not sep or not key or not value:
+            raise ValueError(f"Malformed ingredient token: {token}")
+        if key == "element":
+            key, value = "tags", f"element_{value}"
+        elif key not in _CLAUSE_FIELDS:
+            raise ValueError(f"Unknown selector key {key!r} in ingredient token: {token}")
+        if _CLAUSE_FIELDS[key] == "origin_ref":
+            place_policy = "same_place"
+        clauses.append({key: value})
+    return {
+        "token": token,
+        "selector": {"match_all": clauses, "match_any": [], "exclude": []},
+        "constraints": {"place_policy": place_policy},
+        "fallback": None,
+    }
+
+
+def _clause_mask(bitsets: BitsetIndex, clause: Mapping[str, Any]) -> int:
+    mask = bitsets.all
+    for key, value in clause.items():
+        field = _CLAUSE_FIELDS.get(key)
+        if field is None:
+            raise ValueError(f"Unknown selector key: {key}")
+        values = value if isinstance(value, (list, tuple)) else [value]
+        mask &= bitsets.any_of(field, values)
+    return mask
+
+
+def _any_clause_mask(bitsets: BitsetIndex, clauses: Iterable[Mapping[str, Any]]) -> int:
+    mask = 0
+    for clause in clauses:
+        mask |= _clause_mask(bitsets, clause)
+    return mask
+
+
+def compile_substitution(bitsets: BitsetIndex, rule: Mapping[str, Any]) -> Substitution:
+    """Evaluate a rule's selector once: every ``match_all`` clause, one ``match_any``
+    clause if any are given, and no ``exclude`` clause."""
+    selector = rule.get("selector") or {}
+    mask = bitsets.all
+    for clause in selector.get("match_all") or []:
+        mask &= _clause_mask(bitsets, clause)
+    match_any = selector.get("match_any") or []
+    if match_any:
+        mask &= _any_clause_mask(bitsets, match_any)
+    mask &= ~_any_clause_mask(bitsets, selector.get("exclude") or [])
+
+    constraints = rule.get("constraints") or {}
+    return Substitution(
+        token=rule["token"],
+        candidates=tuple(bitsets.ids_for(mask)),
+        place_policy=constraints.get("place_policy") or "any_place",
+        max_results=constraints.get("max_results") or DEFAULT_MAX_RESULTS,
+        fallback=rule.get("fallback"),
+        mask=mask,
+    )
+
+
+@dataclass(frozen=True)
+class IngredientPick:
+    """Items picked for one ingredient ref, and the locality tier they came from.
+
+    ``tier`` is one of PLACE_POLICIES, ``"exact"`` for a plain collectible ref,
+    ``"fallback"`` when no tier had enough candidates, or ``"none"``.
+    """
+
+    ingredient_ref: str
+    item_ids: tuple[str, ...]
+    tier: str
+    place_id: str
+    zone_id: str | None
+    place_policy: str
+    tier_candidates: int
+    tiers_tried: tuple[str, ...]
+
+    def explain(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def _locality_masks(repo, bitsets: BitsetIndex) -> dict[str, tuple[str | None, int, int]]:
+    """place_id -> (zone_id, same_place mask, same_zone mask) from collectible origin_ref."""
+    place_ids_by_zone: dict[str, list[str]] = {}
+    for place_id, place in repo.places_by_id.items():
+        zone_id = place.get("zone_id")
+        if zone_id:
+            place_ids_by_zone.setdefault(zone_id, []).append(place_id)
+    zone_masks = {
+        zone_id: bitsets.any_of("origin_ref", [zone_id, *place_ids]) for zone_id, place_ids in place_ids_by_zone.items()
+    }
+    masks = {}
+    for place_id, place in repo.places_by_id.items():
+        zone_id = place.get("zone_id")
+        place_mask = bitsets.any_of("origin_ref", [place_id])
+        masks[place_id] = (zone_id, place_mask, place_mask | zone_masks.get(zone_id, 0))
+    return masks
+
+
+class IngredientResolver:
+    """Ingredient refs -> Substitutions and locality-aware picks for one content version.
+
+    Authored tokens and per-place locality tiers are compiled up front; ad-hoc
+    tokens are compiled on first use and kept in a bounded LRU.
+    """
+
+    def __init__(self, repo, ad_hoc_maxsize: int = 256) -> None:
+        self.content_version: str = repo.content_version
+        self._bitsets: BitsetIndex = repo.collectibles_bitsets
+        self._compiled = {
+            token: compile_substitution(self._bitsets, rule) for token, rule in repo.substitutions_by_token.items()
+        }
+        self._locality = _locality_masks(repo, self._bitsets)
+        self._ad_hoc: OrderedDict[str, Substitution] = OrderedDict()
+        self._ad_hoc_maxsize = ad_hoc_maxsize
+        self._lock = threading.Lock()
+
+    def resolve(self, ingredient_ref: str) -> Substitution:
+        compiled = self._compiled.get(ingredient_ref)
+        if compiled is not None:
+            return compiled
+        if not ingredient_ref.startswith(TOKEN_PREFIX):
+            return Substitution(token=ingredient_ref, candidates=(ingredient_ref,), max_results=1)
+        with self._lock:
+            compiled = self._ad_hoc.get(ingredient_ref)
+            if compiled is not None:
+                self._ad_hoc.move_to_end(ingredient_ref)
+                return compiled
+        compiled = compile_substitution(self._bitsets, parse_token(ingredient_ref))
+        with self._lock:
+            self._ad_hoc[ingredient_ref] = compiled
+            self._ad_hoc.move_to_end(ingredient_ref)
+            while len(self._ad_hoc) > self._ad_hoc_maxsize:
+                self._ad_hoc.popitem(last=False)
+        return compiled
+
+    def recipe_ingredients(self, recipe: Mapping[str, Any]) -> list[tuple[Mapping[str, Any], Substitution]]:
+        """Each of a tea or spell recipe's ingredients with its resolved Substitution."""
+        return [
+            (ingredient, self.resolve(ingredient["ingredient_ref"]))
+            for ingredient in recipe.get("ingredients") or []
+            if ingredient.get("ingredient_ref")
+        ]
+
+    def pick(
+        self,
+        ingredient_ref: str,
+        place_id: str,
+        count: int = 1,
+        entry_type: str | None = None,
+        rng: random.Random | None = None,
+    ) -> IngredientPick:
+        """Pick up to ``count`` items for ``ingredient_ref`` at ``place_id``.
+
+        Tiers are walked narrowest first, up to the token's place_policy, and the
+        first tier with at least ``count`` candidates wins. ``entry_type`` (tea,
+        spell, ...) keeps only items usable in it. The same ``rng`` state always
+        gives the same pick.
+        """
+        if place_id not in self._locality:
+            raise ValueError(f"Unknown place_id: {place_id}")
+        zone_id, place_mask, zone_mask = self._locality[place_id]
+        substitution = self.resolve(ingredient_ref)
+        tried: list[str] = []
+
+        def result(item_ids: tuple[str, ...], tier: str, tier_candidates: int) -> IngredientPick:
+            return IngredientPick(
+                ingredient_ref=ingredient_ref,
+                item_ids=item_ids,
+                tier=tier,
+                place_id=place_id,
+                zone_id=zone_id,
+                place_policy=substitution.place_policy,
+                tier_candidates=tier_candidates,
+                tiers_tried=tuple(tried),
+            )
+
+        if not ingredient_ref.startswith(TOKEN_PREFIX):
+            return result((ingredient_ref,), "exact", 1)
+
+        rng = rng or random.Random()
+        count = max(1, min(count, substitution.max_results))
+        mask = substitution.mask
+        if entry_type is not None:
+            mask &= self._bitsets.any_of("usable_in", [entry_type])
+        widest = PLACE_POLICIES.index(substitution.place_policy)
+        for tier, tier_mask in zip(PLACE_POLICIES[: widest + 1], (mask & place_mask, mask & zone_mask, mask)):
+            tried.append(tier)
+            candidates = self._bitsets.ids_for(tier_mask)
+            if len(candidates) >= count:
+                return result(tuple(rng.sample(candidates, count)), tier, len(candidates))
+        if substitution.fallback:
+            return result((substitution.fallback,), "fallback", 0)
+        return result((), "none", 0)
+
+    def pick_recipe(
+        self,
+        recipe: Mapping[str, Any],
+        place_id: str,
+        entry_type: str | None = None,
+        seed: int | None = None,
+    ) -> list[IngredientPick]:
+        """One pick per recipe ingredient, deterministic for a given seed."""
+        rng = random.Random(seed)
+        return [
+            self.pick(ingredient["ingredient_ref"], place_id, entry_type=entry_type, rng=rng)
+            for ingredient in recipe.get("ingredients") or []
+            if ingredient.get("ingredient_ref")
+        ]
+
+
+_RESOLVERS: OrderedDict[str, IngredientResolver] = OrderedDict()
+_RESOLVERS_LOCK = threading.Lock()
+_RESOLVERS_MAXSIZE = 4
+
+
+def resolver_for(repo) -> IngredientResolver:
+    """The shared resolver for the repo's content version, compiled on first use."""
+    version = repo.content_version
+    with _RESOLVERS_LOCK:
+        resolver = _RESOLVERS.get(version)
+        if resolver is not None:
+            _RESOLVERS.move_to_end(version)
+            return resolver
+    # Compile outside the lock; racing builds for one version are identical.
+    resolver = IngredientResolver(repo)
+    with _RESOLVERS_LOCK:
+        resolver = _RESOLVERS.setdefault(version, resolver)
+        _RESOLVERS.move_to_end(version)
+        while len(_RESOLVERS) > _RESOLVERS_MAXSIZE:
+            _RESOLVERS.popitem(last=False)
+    return resolver
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from fractions import Fraction
+import random
+import threading
+from typing import Any, Generic, Sequence, TypeVar
+
+
+T = TypeVar("T")
+
+
+class AliasTable(Generic[T]):
+    """Walker/Vose alias table over integer weights: O(1) draws, exact probabilities.
+
+    Thresholds are kept as integers over the total weight, so each item is
+    drawn with probability exactly ``weight / total``.
+    """
+
+    __slots__ = ("items", "weights", "total", "_threshold", "_alias")
+
+    def __init__(self, items: Sequence[T], weights: Sequence[int]) -> None:
+        if not items or len(items) != len(weights):
+            raise ValueError("Alias table needs one positive weight per item")
+        if any(weight <= 0 for weight in weights):
+            raise ValueError("Alias table weights must be positive")
+        count = len(items)
+        total = sum(weights)
+        self.items = tuple(items)
+        self.weights = tuple(weights)
+        self.total = total
+
+        # Slot i keeps item i when randrange(total) < threshold[i], else alias[i].
+        scaled = [weight * count for weight in weights]
+        threshold = [total] * count
+        alias = list(range(count))
+        small = [i for i, value in enumerate(scaled) if value < total]
+        large = [i for i, value in enumerate(scaled) if value >= total]
+        while small and large:
+            less = small.pop()
+            more = large[-1]
+            threshold[less] = scaled[less]
+            alias[less] = more
+            scaled[more] -= total - scaled[less]
+            if scaled[more] < total:
+                small.append(large.pop())
+        self._threshold = tuple(threshold)
+        self._alias = tuple(alias)
+
+    def draw(self, rng: random.Random) -> T:
+        slot = rng.randrange(len(self.items))
+        if rng.randrange(self.total) < self._threshold[slot]:
+            return self.items[slot]
+        return self.items[self._alias[slot]]
+
+    def draw_many(self, rng: random.Random, n: int) -> list[T]:
+        items, threshold, alias, total = self.items, self._threshold, self._alias, self.total
+        randrange = rng.randrange
+        count = len(items)
+        draws = []
+        for _ in range(n):
+            slot = randrange(count)
+            draws.append(items[slot] if randrange(total) < threshold[slot] else items[alias[slot]])
+        return draws
+
+    def probabilities(self) -> dict[T, Fraction]:
+        """Exact draw probability per item, derived from the table itself."""
+        count = len(self.items)
+        result: dict[T, Fraction] = {item: Fraction(0) for item in self.items}
+        for slot in range(count):
+            kept = Fraction(self._threshold[slot], self.total * count)
+            result[self.items[slot]] += kept
+            result[self.items[self._alias[slot]]] += Fraction(1, count) - kept
+        return result
+
+
+@dataclass(frozen=True)
+class _Bucket:
+    priority: int
+    groups: AliasTable[Any]
+    members: dict[Any, AliasTable[str]]
+
+
+class InteractionSampler:
+    """Weighted interaction draws for one content version.
+
+    A draw takes the highest ``selection.priority`` among the eligible
+    interactions, picks a variant group by its eligible weight, then a member by
+    ``selection.weight``; overall each interaction in the top tier is drawn with
+    probability ``weight / tier weight``. Alias tables per (priority, variant
+    group) are built up front, and the tables for each eligibility mask (see
+    selector.eligible_interaction_mask) are cached in a bounded LRU.
+    """
+
+    def __init__(self, repo, cache_size: int = 256) -> None:
+        index = repo.interactions_selection_index
+        self.content_version: str = repo.content_version
+        self._index = index
+        self._ids = index.ids
+        self._weights: list[int] = []
+        self._priority_masks: dict[int, int] = {}
+        self._group_masks: dict[tuple[int, Any], int] = {}
+        for position, interaction_id in enumerate(index.ids):
+            selection = repo.interactions_by_id[interaction_id].get("selection") or {}
+            priority = selection.get("priority") or 0
+            # Interactions without a variant group form a group of their own.
+            group = selection.get("variant_group_id") or ("__single__", interaction_id)
+            self._weights.append(selection.get("weight") or 1)
+            self._priority_masks[priority] = self._priority_masks.get(priority, 0) | 1 << position
+            key = (priority, group)
+            self._group_masks[key] = self._group_masks.get(key, 0) | 1 << position
+        self._group_tables = {key: self._table(mask) for key, mask in self._group_masks.items()}
+        self._buckets: OrderedDict[int, _Bucket | None] = OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+
+    def _table(self, mask: int) -> AliasTable[str]:
+        positions = self._index.positions(mask)
+        return AliasTable([self._ids[p] for p in positions], [self._weights[p] for p in positions])
+
+    def _build_bucket(self, mask: int) -> _Bucket | None:
+        eligible = [priority for priority, tier in self._priority_masks.items() if tier & mask]
+        if not eligible:
+            return None
+        priority = max(eligible)
+        tier_mask = mask & self._priority_masks[priority]
+        members: dict[Any, AliasTable[str]] = {}
+        for (group_priority, group), group_mask in self._group_masks.items():
+            if group_priority != priority or not group_mask & tier_mask:
+                continue
+            if group_mask & tier_mask == group_mask:
+                members[group] = self._group_tables[(priority, group)]
+            else:
+                members[group] = self._table(group_mask & tier_mask)
+        groups = AliasTable(list(members), [table.total for table in members.values()])
+        return _Bucket(priority=priority, groups=groups, members=members)
+
+    def _bucket(self, mask: int) -> _Bucket | None:
+        with self._lock:
+            if mask in self._buckets:
+                self._buckets.move_to_end(mask)
+                return self._buckets[mask]
+        bucket = self._build_bucket(mask)
+        with self._lock:
+            self._buckets[mask] = bucket
+            self._buckets.move_to_end(mask)
+            while len(self._buckets) > self._cache_size:
+                self._buckets.popitem(last=False)
+        return bucket
+
+    def draw(self, mask: int, rng: random.Random) -> str | None:
+        """One interaction_id from the eligible ``mask``, or None if nothing is eligible."""
+        bucket = self._bucket(mask)
+        if bucket is None:
+            return None
+        return bucket.members[bucket.groups.draw(rng)].draw(rng)
+
+    def draw_many(self, mask: int, rng: random.Random, n: int) -> list[str]:
+        """``n`` independent draws from one eligibility mask, e.g. to simulate encounters."""
+        bucket = self._bucket(mask)
+        if bucket is None:
+            return []
+        members = bucket.members
+        return [members[group].draw(rng) for group in bucket.groups.draw_many(rng, n)]
+
+    def probabilities(self, mask: int) -> dict[str, Fraction]:
+        """Exact draw probability per eligible interaction_id."""
+        bucket = self._bucket(mask)
+        if bucket is None:
+            return {}
+        result: dict[str, Fraction] = {}
+        for group, group_probability in bucket.groups.probabilities().items():
+            for interaction_id, probability in bucket.members[group].probabilities().items():
+                result[interaction_id] = group_probability * probability
+        return result
+
+
+_SAMPLERS: OrderedDict[str, InteractionSampler] = OrderedDict()
+_SAMPLERS_LOCK = threading.Lock()
+_SAMPLERS_MAXSIZE = 4
+
+
+def sampler_for(repo) -> InteractionSampler:
+    """The shared sampler for the repo's content version, built on first use."""
+    version = repo.content_version
+    with _SAMPLERS_LOCK:
+        sampler = _SAMPLERS.get(version)
+        if sampler is not None:
+            _SAMPLERS.move_to_end(version)
+            return sampler
+    sampler = InteractionSampler(repo)
+    with _SAMPLERS_LOCK:
+        sampler = _SAMPLERS.setdefault(version, sampler)
+        _SAMPLERS.move_to_end(version)
+        while len(_SAMPLERS) > _SAMPLERS_MAXSIZE:
+            _SAMPLERS.popitem(last=False)
+    return sampler
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from typing import Any, Mapping
+
+from app.content.indexes import BitsetIndex
+
+
+def _as_list(value: Any) -> list[Any]:
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return [value]
+
+
+def pool_mask(bitsets: BitsetIndex, filters: Mapping[str, Any] | None) -> int:
+    """Bitset of collectibles matching an NPC offer pool's ``filters``.
+
+    ``item_type`` and each ``require`` entry match any of their values; ``tags_any``
+    needs one listed tag, ``tags_all`` every listed tag, and ``exclude_tags_any``
+    rules out items carrying any listed tag. Missing or null filters match everything.
+    """
+    filters = filters or {}
+    any_of: dict[str, list[Any]] = {}
+    item_types = _as_list(filters.get("item_type"))
+    if item_types:
+        any_of["item_type"] = item_types
+    for field, value in (filters.get("require") or {}).items():
+        values = _as_list(value)
+        if values:
+            any_of[field] = values
+    tags_any = _as_list(filters.get("tags_any"))
+    if tags_any:
+        any_of["tag"] = tags_any
+
+    return bitsets.select(
+        all_of={"tag": _as_list(filters.get("tags_all"))},
+        any_of=any_of,
+        none_of={"tag": _as_list(filters.get("exclude_tags_any"))},
+    )
+
+
+def pool_candidates(repo, filters: Mapping[str, Any] | None) -> list[dict]:
+    """Collectibles matching an offer pool, in catalog order."""
+    bitsets = repo.collectibles_bitsets
+    return [repo.collectibles_by_id[item_id] for item_id in bitsets.ids_for(pool_mask(bitsets, filters))]
+
+
+def offer_pools(repo, npc_id: str) -> dict[str, list[dict]]:
+    """Candidate collectibles for each of an NPC's offer pools, keyed by pool_id."""
+    npc = repo.npcs_by_id.get(npc_id)
+    if npc is None:
+        raise ValueError(f"Unknown npc_id: {npc_id}")
+    offers = npc.get("offers") or {}
+    return {pool["pool_id"]: pool_candidates(repo, pool.get("filters")) for pool in offers.get("pools") or []}
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+import copy
+import logging
+import threading
+from typing import Any, Iterable, Protocol
+
+from app.domain import scene_generator
+from app.domain.scene import Scene
+from app.domain.scene_generator import ValidationPolicy, generate_scenes
+
+
+logger = logging.getLogger(__name__)
+
+
+class SceneStore(Protocol):
+    """Shared backing store for generated scene dicts, e.g. persistence.scene_store.MongoSceneStore."""
+
+    def get(self, key: str) -> dict[str, Any] | None: ...
+
+    def put(self, key: str, record: dict[str, Any]) -> None: ...
+
+
+def scene_cache_key(place_id: str, seed: int, content_version: str, validation: ValidationPolicy) -> str:
+    # The validation mode is part of the key: a scene generated with checks off
+    # must never be served to a caller that asked for them.
+    return f"{content_version}:{place_id}:{seed}:{validation.mode}"
+
+
+class SceneCache:
+    """Memoizes seeded scene generation by (place, seed, content version, validation mode), with LRU eviction.
+
+    Generation is a pure function of place, seed and content, so replays,
+    retries and peeks reuse the first result, which went through the same
+    validation mode the caller asked for. Unseeded requests are never cached.
+    With a ``store``, local misses check it before generating and new results
+    are written back, so several workers share results. Store errors are logged
+    and treated as misses.
+    """
+
+    def __init__(self, maxsize: int = 1024, store: SceneStore | None = None) -> None:
+        self.maxsize = maxsize
+        self.store = store
+        self._entries: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._counts = {"hits": 0, "store_hits": 0, "misses": 0, "evictions": 0}
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counts[name] += 1
+
+    def _remember(self, key: str, record: dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = record
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._counts["evictions"] += 1
+
+    def _from_store(self, key: str) -> dict[str, Any] | None:
+        if self.store is None:
+            return None
+        try:
+            return self.store.get(key)
+        except Exception:  # a shared store outage must not break generation
+            logger.warning("Scene store lookup failed for %s", key, exc_info=True)
+            return None
+
+    def _to_store(self, key: str, record: dict[str, Any]) -> None:
+        if self.store is None:
+            return
+        try:
+            self.store.put(key, record)
+        except Exception:
+            logger.warning("Scene store write failed for %s", key, exc_info=True)
+
+    def _lookup(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            record = self._entries.get(key)
+            if record is not None:
+                self._entries.move_to_end(key)
+                self._counts["hits"] += 1
+                return record
+        record = self._from_store(key)
+        if record is not None:
+            self._count("store_hits")
+            self._remember(key, record)
+        return record
+
+    def generate_records(
+        self,
+        requests: Iterable[tuple[Any, int | None]],
+        repo,
+        validation: ValidationPolicy | None = None,
+    ) -> list[dict[str, Any]]:
+        """Same result as generate_scenes(requests, repo, validation), with seeded requests cached.
+
+        Misses are generated together in one generate_scenes batch.
+        """
+        policy = validation or scene_generator.VALIDATION_POLICY
+        requests = list(requests)
+        records: list[dict[str, Any] | None] = [None] * len(requests)
+        missing: list[int] = []
+        for position, (state, seed) in enumerate(requests):
+            if seed is not None:
+                key = scene_cache_key(state.current_place_id, seed, repo.content_version, policy)
+                records[position] = self._lookup(key)
+            if records[position] is None:
+                missing.append(position)
+
+        generated = []
+        if missing:
+            generated = generate_scenes([requests[position] for position in missing], repo, validation=policy)
+        for position, record in zip(missing, generated):
+            state, seed = requests[position]
+            if seed is not None:
+                self._count("misses")
+                key = scene_cache_key(state.current_place_id, seed, repo.content_version, policy)
+                self._remember(key, record)
+                self._to_store(key, record)
+            records[position] = record
+        # Callers get their own copies; cached records are never handed out.
+        return [copy.deepcopy(record) for record in records]
+
+    def generate(self, state, repo, seed: int | None = None, validation: ValidationPolicy | None = None) -> Scene:
+        """Same result as generate_scene(state, repo, seed, validation), cached when seeded."""
+        [record] = self.generate_records([(state, seed)], repo, validation)
+        return Scene(**record)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {**self._counts, "size": len(self._entries)}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._counts = {name: 0 for name in self._counts}
+
+
+# Seeded candidate generation goes through this cache (see selector.generate_candidates).
+SCENE_CACHE = SceneCache()
+
+
+def set_scene_cache(cache: SceneCache) -> None:
+    global SCENE_CACHE
+    SCENE_CACHE = cache
@@ -1,15 +1,24 @@
 from __future__ import annotations
 
-import json
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+import logging
+import os
 from pathlib import Path
 import random
-from typing import Any
+import threading
+from typing import Any, Iterable
 
-from jsonschema import ValidationError, validate
+from jsonschema.exceptions import best_match
 
+from app.content.lexicon import lexicon_tables
+from app.content.schema_utils import load_validator
 from app.domain.scene import Scene
 
 
+logger = logging.getLogger(__name__)
+
+
 FAMILIES = [
     "arrival",
     "small_find",
@@ -28,38 +37,94 @@ SAFE_CHOICE_LABELS = [
 ]
 
 
-def _load_scene_schema() -> dict[str, Any] | None:
-    """Load scene schema if it exists, otherwise return None."""
-    schema_path = Path(__file__).resolve().parents[2] / "schemas" / "scene.schema.json"
-    if not schema_path.exists():
-        return None
-    return json.loads(schema_path.read_text(encoding="utf-8"))
+SCENE_SCHEMA_PATH = Path(__file__).resolve().parents[2] / "schemas" / "scene.schema.json"
+
+VALIDATION_MODES = ("always", "sampled", "off")
+
+
+@dataclass(frozen=True)
+class ValidationPolicy:
+    """How generated scenes are checked against scene.schema.json.
+
+    ``always`` raises on an invalid scene. ``sampled`` checks a ``rate``
+    fraction of scenes and only counts and logs failures. ``off`` skips the
+    check.
+    """
+
+    mode: str = "always"
+    rate: float = 0.1
+
+    def __post_init__(self) -> None:
+        if self.mode not in VALIDATION_MODES:
+            raise ValueError(f"Unknown scene validation mode: {self.mode}")
+        if not 0.0 <= self.rate <= 1.0:
+            raise ValueError(f"Scene validation rate must be between 0 and 1: {self.rate}")
+
+    @classmethod
+    def from_env(cls) -> ValidationPolicy:
+        return cls(
+            mode=os.getenv("SCENE_VALIDATION", "always").lower(),
+            rate=float(os.getenv("SCENE_VALIDATION_RATE", "0.1")),
+        )
+
+
+class ValidationStats:
+    """Counters for scene validation outcomes; sampled failures land here instead of raising."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts = {"checked": 0, "failed": 0, "skipped": 0}
+
+    def record(self, outcome: str) -> None:
+        with self._lock:
+            self._counts[outcome] += 1
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
 
+    def merge(self, counts: dict[str, int]) -> None:
+        with self._lock:
+            for outcome, count in counts.items():
+                self._counts[outcome] += count
 
-def _not_allowed_words(repo) -> set[str]:
-    words = set()
-    for entry in repo.lexicon_by_key.values():
-        if entry.get("lexicon_type") == "Not_Allowed":
-            words.update(word.lower() for word in entry.get("words", []))
-    return words
+    def reset(self) -> None:
+        with self._lock:
+            self._counts = {key: 0 for key in self._counts}
 
 
-def _descriptive_words(repo, place_id: str, zone_id: str | None) -> list[str]:
-    words: list[str] = []
-    for entry in repo.lexicon_by_key.values():
-        if entry.get("lexicon_type") != "Sensory":
-            continue
-        scope = entry.get("scope")
-        if scope in ("Global", place_id, zone_id):
-            words.extend(entry.get("words", []))
-    return words
+VALIDATION_POLICY = ValidationPolicy.from_env()
+VALIDATION_STATS = ValidationStats()
 
+# Sampling draws from its own RNG so it never shifts the seeded scene output.
+_SAMPLING_RNG = random.Random()
 
-def _safe_prompt(words: list[str], disallowed: set[str], rng: random.Random) -> str:
-    filtered = [word for word in words if all(bad not in word.lower() for bad in disallowed)]
-    if not filtered:
+
+def _validate_scene(
+    record: dict[str, Any], policy: ValidationPolicy, stats: ValidationStats = VALIDATION_STATS
+) -> None:
+    if policy.mode == "off" or (policy.mode == "sampled" and _SAMPLING_RNG.random() >= policy.rate):
+        stats.record("skipped")
+        return
+    if not SCENE_SCHEMA_PATH.exists():
+        stats.record("skipped")
+        return
+    # Compiled once per schema file version by the shared schema registry.
+    error = best_match(load_validator(SCENE_SCHEMA_PATH).iter_errors(record))
+    stats.record("checked")
+    if error is None:
+        return
+    stats.record("failed")
+    if policy.mode == "always":
+        raise ValueError(f"Generated scene failed schema validation: {error.message}")
+    logger.warning("Generated scene %s failed schema validation: %s", record["scene_id"], error.message)
+
+
+def _safe_prompt(words: tuple[str, ...], rng: random.Random) -> str:
+    # words are already screened against the Not_Allowed lexicon.
+    if not words:
         return "A quiet detail catches the eye."
-    chosen = rng.choice(filtered)
+    chosen = rng.choice(words)
     return f"{chosen} lingers nearby."
 
 
@@ -72,49 +137,113 @@ def _choices(rng: random.Random) -> list[dict[str, Any]]:
     ]
 
 
-def generate_scene(state, repo, seed: int | None = None) -> Scene:
-    if state.current_place_id not in repo.places_by_id:
-        raise ValueError(f"Unknown place_id: {state.current_place_id}")
+@dataclass(frozen=True)
+class _PlacePlan:
+    """Everything about a generated scene that depends on the place but not the seed."""
 
-    place = repo.places_by_id[state.current_place_id]
-    zone_id = place.get("zone_id")
-    rng = random.Random(seed)
+    place_id: str
+    entry_type: str
+    words: tuple[str, ...]
+
+
+def scene_entry_type(place: dict[str, Any]) -> str:
+    """Entry type of scenes generated at ``place``: thresholds call for spells, elsewhere tea."""
+    return "spell" if place.get("is_threshold") else "tea"
 
-    entry_type = "spell" if place.get("is_threshold") else "tea"
-    family = rng.choice(FAMILIES)
 
-    disallowed = _not_allowed_words(repo)
-    words = _descriptive_words(repo, state.current_place_id, zone_id)
-    prompt = _safe_prompt(words, disallowed, rng)
+def _place_plan(repo, place_id: str) -> _PlacePlan:
+    if place_id not in repo.places_by_id:
+        raise ValueError(f"Unknown place_id: {place_id}")
+    place = repo.places_by_id[place_id]
+    entry_type = scene_entry_type(place)
+    words = lexicon_tables(repo).sensory_words(place_id, place.get("zone_id"))
+    return _PlacePlan(place_id=place_id, entry_type=entry_type, words=words)
 
-    scene_id = f"{state.current_place_id}_{entry_type}_{family}"
+
+def _scene_record(plan: _PlacePlan, seed: int | None) -> dict[str, Any]:
+    # Draw order (family, prompt word, choice labels) fixes the output for a seed.
+    rng = random.Random(seed)
+    family = rng.choice(FAMILIES)
+    prompt = _safe_prompt(plan.words, rng)
+
+    scene_id = f"{plan.place_id}_{plan.entry_type}_{family}"
     if seed is not None:
         scene_id = f"{scene_id}_{seed}"
 
-    scene = Scene(
-        scene_id=scene_id,
-        place_id=state.current_place_id,
-        entry_type=entry_type,
-        title=None,
-        prompt=prompt,
-        tags=[entry_type],
-        need_hint="Gentle rest" if entry_type == "tea" else "Soft resolve",
-        mood_hint="Calm",
-        conditions={},
-        choices=_choices(rng),
-        debug={
+    return {
+        "scene_id": scene_id,
+        "place_id": plan.place_id,
+        "entry_type": plan.entry_type,
+        "title": None,
+        "prompt": prompt,
+        "tags": [plan.entry_type],
+        "need_hint": "Gentle rest" if plan.entry_type == "tea" else "Soft resolve",
+        "mood_hint": "Calm",
+        "conditions": {},
+        "choices": _choices(rng),
+        "debug": {
             "seed": str(seed) if seed is not None else "none",
             "family_id": family,
             "template_id": "procedural_v1",
             "notes": "generated",
         },
-    )
-
-    schema = _load_scene_schema()
-    if schema is not None:
-        try:
-            validate(instance=scene.to_dict(), schema=schema)
-        except ValidationError as exc:
-            raise ValueError(f"Generated scene failed schema validation: {exc.message}") from exc
-
-    return scene
+    }
+
+
+def generate_scene(state, repo, seed: int | None = None, validation: ValidationPolicy | None = None) -> Scene:
+    record = _scene_record(_place_plan(repo, state.current_place_id), seed)
+    _validate_scene(record, validation or VALIDATION_POLICY)
+    return Scene(**record)
+
+
+def _generate_records(
+    plans: dict[str, _PlacePlan], items: list[tuple[str, int | None]], policy: ValidationPolicy
+) -> tuple[list[dict[str, Any]], dict[str, int]]:
+    """Generate and validate one chunk; module-level so it can run in a process pool."""
+    stats = ValidationStats()
+    records = []
+    for place_id, seed in items:
+        record = _scene_record(plans[place_id], seed)
+        _validate_scene(record, policy, stats)
+        records.append(record)
+    return records, stats.snapshot()
+
+
+def generate_scenes(
+    requests: Iterable[tuple[Any, int | None]],
+    repo,
+    validation: ValidationPolicy | None = None,
+    workers: int | None = None,
+    chunk_size: int = 500,
+) -> list[dict[str, Any]]:
+    """Generate scene dicts for many (state, seed) pairs, in request order.
+
+    Each result equals ``generate_scene(state, repo, seed).to_dict()``. Place
+    lookups and lexicon words are resolved once per place for the whole batch.
+    With ``workers``, chunks of ``chunk_size`` are generated in a process pool,
+    e.g. for nightly pre-generation across every place.
+    """
+    policy = validation or VALIDATION_POLICY
+    items = [(state.current_place_id, seed) for state, seed in requests]
+    plans: dict[str, _PlacePlan] = {}
+    for place_id, _ in items:
+        if place_id not in plans:
+            plans[place_id] = _place_plan(repo, place_id)
+
+    if not workers or len(items) <= chunk_size:
+        records, counts = _generate_records(plans, items, policy)
+        VALIDATION_STATS.merge(counts)
+        return records
+
+    chunks = [items[start : start + chunk_size] for start in range(0, len(items), chunk_size)]
+    records = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_generate_records, {place_id: plans[place_id] for place_id, _ in chunk}, chunk, policy)
+            for chunk in chunks
+        ]
+        for future in futures:
+            chunk_records, counts = future.result()
+            VALIDATION_STATS.merge(counts)
+            records.extend(chunk_records)
+    return records
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+from collections import deque
+import logging
+import threading
+from types import SimpleNamespace
+from typing import Any
+
+from app.domain.scene_generator import ValidationPolicy, generate_scenes, scene_entry_type
+
+
+logger = logging.getLogger(__name__)
+
+PoolKey = tuple[str, str]
+
+
+class ScenePools:
+    """Pools of ready, validated unseeded scene dicts per (place_id, entry_type).
+
+    ``take`` serves from a pool and only generates inline for whatever the pool
+    cannot cover. A pool that drops below ``low_watermark`` is queued for the
+    background refill thread, which tops it back up to ``size`` one scene at a
+    time, pausing ``refill_delay`` seconds between scenes so request threads
+    keep the CPU, and backing off ``failure_backoff`` seconds after a failed
+    refill. All pools are dropped when the content version changes.
+    """
+
+    def __init__(
+        self,
+        size: int = 8,
+        low_watermark: int = 3,
+        validation: ValidationPolicy | None = None,
+        refill_delay: float = 0.005,
+        failure_backoff: float = 5.0,
+    ) -> None:
+        if not 0 <= low_watermark <= size:
+            raise ValueError("low_watermark must be between 0 and size")
+        self.size = size
+        self.low_watermark = low_watermark
+        self.validation = validation
+        self.refill_delay = refill_delay
+        self.failure_backoff = failure_backoff
+        self._pools: dict[PoolKey, deque[dict[str, Any]]] = {}
+        self._repo = None
+        self._version: str | None = None
+        self._wanted: deque[PoolKey] = deque()
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _sync_version(self, repo) -> None:
+        # Called with the condition held.
+        self._repo = repo
+        if repo.content_version != self._version:
+            self._version = repo.content_version
+            self._pools.clear()
+            self._wanted.clear()
+
+    def _key(self, repo, place_id: str) -> PoolKey:
+        place = repo.places_by_id.get(place_id)
+        if place is None:
+            raise ValueError(f"Unknown place_id: {place_id}")
+        return place_id, scene_entry_type(place)
+
+    def _schedule(self, key: PoolKey) -> None:
+        if key not in self._wanted:
+            self._wanted.append(key)
+            self._cond.notify()
+
+    def take(self, state, repo, n: int) -> list[dict[str, Any]]:
+        """``n`` unseeded scenes for the state's place, pooled ones first."""
+        key = self._key(repo, state.current_place_id)
+        with self._cond:
+            self._sync_version(repo)
+            pool = self._pools.setdefault(key, deque())
+            scenes = [pool.popleft() for _ in range(min(n, len(pool)))]
+            if len(pool) < self.low_watermark:
+                self._schedule(key)
+        if len(scenes) < n:
+            scenes += generate_scenes([(state, None)] * (n - len(scenes)), repo, validation=self.validation)
+        return scenes
+
+    def available(self, place_id: str) -> int:
+        with self._cond:
+            return sum(len(pool) for (pool_place_id, _), pool in self._pools.items() if pool_place_id == place_id)
+
+    def _refill_one(self, repo, version: str, key: PoolKey) -> bool:
+        """Add one scene to ``key``'s pool; False once it is full or the content moved on."""
+        with self._cond:
+            pool = self._pools.get(key)
+            if self._version != version or pool is None or len(pool) >= self.size:
+                return False
+        state = SimpleNamespace(current_place_id=key[0])
+        [scene] = generate_scenes([(state, None)], repo, validation=self.validation)
+        with self._cond:
+            pool = self._pools.get(key)
+            if self._version != version or pool is None:
+                return False
+            pool.append(scene)
+            return len(pool) < self.size
+
+    def probe(self, repo) -> None:
+        """Generate one scene under the pools' validation policy; raises if it would not pass.
+
+        Run before ``start`` so a policy no generated scene can satisfy is
+        reported once instead of failing every refill.
+        """
+        place_id = next(iter(repo.places_by_id), None)
+        if place_id is not None:
+            generate_scenes([(SimpleNamespace(current_place_id=place_id), None)], repo, validation=self.validation)
+
+    def fill(self, repo, place_ids: list[str] | None = None) -> None:
+        """Fill pools synchronously, e.g. to warm every place at startup."""
+        with self._cond:
+            self._sync_version(repo)
+            version = self._version
+            keys = [self._key(repo, place_id) for place_id in (place_ids or list(repo.places_by_id))]
+            for key in keys:
+                self._pools.setdefault(key, deque())
+        for key in keys:
+            while self._refill_one(repo, version, key):
+                pass
+
+    def prime(self, repo) -> None:
+        """Queue every place for background filling, so even first visits hit a pool."""
+        with self._cond:
+            self._sync_version(repo)
+            for place_id in repo.places_by_id:
+                key = self._key(repo, place_id)
+                self._pools.setdefault(key, deque())
+                self._schedule(key)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            with self._cond:
+                while not self._wanted and not self._stop.is_set():
+                    self._cond.wait()
+                if self._stop.is_set():
+                    return
+                key = self._wanted.popleft()
+                repo, version = self._repo, self._version
+            try:
+                while self._refill_one(repo, version, key):
+                    # Pause between scenes so request threads keep priority; stop() cuts it short.
+                    if self._stop.wait(self.refill_delay):
+                        return
+            except Exception:  # keep refilling other pools; a bad place must not kill the thread
+                logger.exception("Scene pool refill failed for %s", key)
+                self._stop.wait(self.failure_backoff)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="scene-pool-refill", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+# Unseeded candidate generation takes from these pools when set (see selector.generate_candidates).
+SCENE_POOLS: ScenePools | None = None
+
+
+def set_scene_pools(pools: ScenePools | None) -> None:
+    global SCENE_POOLS
+    SCENE_POOLS = pools
@@ -1,19 +1,22 @@
 from __future__ import annotations
 
+from dataclasses import dataclass, field
 import random
-from typing import Iterable
+from typing import Iterable, Mapping
 
-from app.domain.scene_generator import generate_scene
+from app.domain.interaction_sampler import sampler_for
+from app.domain import scene_cache, scene_pool
 
 
 def generate_candidates(state, repo, seed: int | None, n: int = 3) -> list[dict]:
+    pools = scene_pool.SCENE_POOLS
+    if seed is None and pools is not None:
+        # Unseeded play is served from pre-generated pools when they are running.
+        return pools.take(state, repo, n)
     rng = random.Random(seed)
-    candidates = []
-    for _ in range(n):
-        candidate_seed = rng.randint(0, 1_000_000) if seed is not None else None
-        candidate = generate_scene(state=state, repo=repo, seed=candidate_seed)
-        candidates.append(candidate.to_dict() if hasattr(candidate, "to_dict") else candidate)
-    return candidates
+    seeds = [rng.randint(0, 1_000_000) if seed is not None else None for _ in range(n)]
+    # Seeded candidates are memoized, so replaying a seed does not regenerate its scenes.
+    return scene_cache.SCENE_CACHE.generate_records([(state, candidate_seed) for candidate_seed in seeds], repo)
 
 
 def merge_with_authored(candidates: Iterable[dict], authored: Iterable[dict]) -> list[dict]:
@@ -37,3 +40,77 @@ def choose_scene(scenes: list[dict], seed: int | None = None) -> dict:
         raise ValueError("No eligible scenes")
     rng = random.Random(seed)
     return rng.choice(scenes)
+
+
+@dataclass(frozen=True)
+class EncounterContext:
+    """Who and where an NPC encounter happens, plus the player history conditions need."""
+
+    npc_id: str
+    place_id: str
+    time_of_day: str | None = None
+    weather: str | None = None
+    season: str | None = None
+    affinity: int = 0
+    day: int | None = None
+    seen: frozenset[str] = frozenset()
+    # interaction_id -> day it was last shown, for cooldown_days / once_per_day.
+    last_seen_day: Mapping[str, int] = field(default_factory=dict)
+
+
+def _history_allows(conditions: Mapping, interaction_id: str, context: EncounterContext) -> bool:
+    if (conditions.get("affinity_min") or 0) > context.affinity:
+        return False
+    if not context.seen.issuperset(conditions.get("requires_seen") or ()):
+        return False
+    last_day = context.last_seen_day.get(interaction_id)
+    if context.day is None or last_day is None:
+        return True
+    if conditions.get("once_per_day") and last_day == context.day:
+        return False
+    return context.day - last_day >= (conditions.get("cooldown_days") or 0)
+
+
+def eligible_interaction_mask(repo, context: EncounterContext) -> int:
+    """Bitset (over repo.interactions_selection_index.ids) of eligible interactions.
+
+    NPC, place, zone, time, weather and season come from the selection index
+    buckets; affinity, requires_seen and cooldowns are checked per candidate.
+    """
+    npc = repo.npcs_by_id.get(context.npc_id)
+    if npc is None:
+        raise ValueError(f"Unknown npc_id: {context.npc_id}")
+    place = repo.places_by_id.get(context.place_id)
+    if place is None:
+        raise ValueError(f"Unknown place_id: {context.place_id}")
+
+    index = repo.interactions_selection_index
+    mask = index.eligible(
+        {
+            "npc_kind": npc.get("npc_kind"),
+            "npc_id": context.npc_id,
+            "place_id": context.place_id,
+            "zone_id": place.get("zone_id"),
+            "time_of_day": context.time_of_day,
+            "weather": context.weather,
+            "season": context.season,
+        }
+    )
+    for position in index.positions(mask):
+        interaction_id = index.ids[position]
+        conditions = repo.interactions_by_id[interaction_id].get("conditions") or {}
+        if not _history_allows(conditions, interaction_id, context):
+            mask &= ~(1 << position)
+    return mask
+
+
+def eligible_interactions(repo, context: EncounterContext) -> list[dict]:
+    """Interactions eligible for an encounter, in catalog order."""
+    ids = repo.interactions_selection_index.ids_for(eligible_interaction_mask(repo, context))
+    return [repo.interactions_by_id[interaction_id] for interaction_id in ids]
+
+
+def sample_interaction(repo, context: EncounterContext, rng: random.Random) -> dict | None:
+    """Weighted draw of one eligible interaction (highest priority tier first)."""
+    interaction_id = sampler_for(repo).draw(eligible_interaction_mask(repo, context), rng)
+    return None if interaction_id is None else repo.interactions_by_id[interaction_id]
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from typing import Any
+
+from pymongo.collection import Collection
+
+
+class MongoSceneStore:
+    """Generated scenes shared across workers, one document per cache key.
+
+    Keys embed the content version, so documents never go stale; old versions
+    can be dropped with a TTL index or a periodic cleanup.
+    """
+
+    def __init__(self, collection: Collection) -> None:
+        self.collection = collection
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        document = self.collection.find_one({"_id": key}, {"scene": 1})
+        return None if document is None else document["scene"]
+
+    def put(self, key: str, record: dict[str, Any]) -> None:
+        self.collection.replace_one({"_id": key}, {"_id": key, "scene": record}, upsert=True)
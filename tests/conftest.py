@@ -1,10 +1,16 @@
+import json
 import os
 from pathlib import Path
+import shutil
 import sys
+from typing import Callable
 
 import pytest
 
 
+ROOT = Path(__file__).resolve().parents[1]
+
+
 @pytest.fixture(scope="session")
 def repo_root() -> Path:
     root = Path(__file__).resolve().parents[1]
@@ -16,3 +22,54 @@ def repo_root() -> Path:
 @pytest.fixture(autouse=True, scope="session")
 def disable_otel() -> None:
     os.environ.setdefault("OTEL_DISABLED", "true")
+
+
+def _build_content_root(dest: Path) -> Path:
+    """Copy the authored content into dest with the known gaps patched so a full ContentRepo loads."""
+    shutil.copytree(ROOT / "schemas", dest / "schemas")
+    shutil.copytree(ROOT / "lexicons", dest / "lexicons")
+    shutil.copytree(ROOT / "assets", dest / "assets")
+    for name in ("journal_templates", "ingredient_substitutions"):
+        shutil.copy(ROOT / "drafts" / f"{name}.schema.json", dest / "schemas" / f"{name}.schema.json")
+        shutil.copy(ROOT / "drafts" / f"{name}.json", dest / "assets" / f"{name}.json")
+    shutil.copy(ROOT / "drafts" / "journal_page.schema.json", dest / "schemas" / "journal_page.schema.json")
+
+    actions_path = dest / "assets" / "actions.json"
+    actions = json.loads(actions_path.read_text())
+    for action in actions["actions"]:
+        action["when"] = {key: value for key, value in action["when"].items() if value is not None}
+    actions_path.write_text(json.dumps(actions, indent=2))
+
+    scene_manifest = dest / "assets" / "scenes" / "manifest.json"
+    scene_manifest.write_text(json.dumps({"scenes": ["cottage_wake_v1.json"]}, indent=2))
+
+    places_path = dest / "assets" / "places.json"
+    places = json.loads(places_path.read_text())
+    template = next(place for place in places["places"] if place["zone_id"] == "town")
+    for place_id in ("town_bakery_stoop", "town_clocktree", "town_docks_gate"):
+        places["places"].append(dict(template, place_id=place_id, parent_place_id="town"))
+    places_path.write_text(json.dumps(places, indent=2))
+
+    tea_path = dest / "assets" / "tea.json"
+    tea_path.write_text(tea_path.read_text().replace('"chamomile_flower"', '"chamomile_flowers"'))
+    return dest
+
+
+@pytest.fixture
+def make_content_root(tmp_path: Path) -> Callable[[str], Path]:
+    def _make(name: str = "content") -> Path:
+        return _build_content_root(tmp_path / name)
+
+    return _make
+
+
+@pytest.fixture(scope="session")
+def content_root(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    return _build_content_root(tmp_path_factory.mktemp("content"))
+
+
+@pytest.fixture(scope="session")
+def content_repo(content_root: Path):
+    from app.content.repo import ContentRepo
+
+    return ContentRepo(content_root)
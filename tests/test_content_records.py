@@ -0,0 +1,100 @@
+import json
+import pickle
+from pathlib import Path
+
+import pytest
+
+from app.content.records import Record, freeze, json_default
+
+
+def test_record_behaves_like_a_read_only_dict() -> None:
+    record = freeze({"item_id": "mint", "tags": ["herb", "green"], "meta": {"rarity": 2}})
+
+    assert isinstance(record, Record)
+    assert record["item_id"] == "mint"
+    assert record.get("missing", "fallback") == "fallback"
+    assert "tags" in record and "missing" not in record
+    assert list(record) == ["item_id", "tags", "meta"]
+    assert record["tags"] == ("herb", "green")
+    assert record == {"item_id": "mint", "tags": ("herb", "green"), "meta": {"rarity": 2}}
+    with pytest.raises(KeyError):
+        record["missing"]
+    with pytest.raises(TypeError):
+        record["item_id"] = "sage"
+    with pytest.raises(AttributeError):
+        record.extra = 1
+
+
+def test_records_share_shapes_and_strings() -> None:
+    memo: dict[int, object] = {}
+    shared = {"tag": "herb"}
+    first = freeze({"a": "".join(["gar", "den"]), "b": shared}, memo)
+    second = freeze({"a": "".join(["gar", "den"]), "b": shared}, memo)
+
+    assert type(first) is type(second)
+    assert first["a"] is second["a"]
+    assert first["b"] is second["b"]
+    assert not hasattr(first, "__dict__")
+
+
+def test_record_round_trips_through_pickle_and_json() -> None:
+    source = {"id": "x", "nested": [{"k": 1}, {"k": None}]}
+    record = freeze(source)
+
+    assert pickle.loads(pickle.dumps(record)) == record
+    assert json.loads(json.dumps(record, default=json_default)) == source
+
+
+def test_compact_repo_matches_eager_content(content_root: Path, content_repo) -> None:
+    from app.content.repo import ContentRepo
+
+    compact = ContentRepo(content_root, compact=True)
+
+    assert compact.content_hashes == content_repo.content_hashes
+    place_id, place = next(iter(compact.places_by_id.items()))
+    assert isinstance(place, Record)
+    assert json.loads(json.dumps(place, default=json_default)) == content_repo.places_by_id[place_id]
+    for npc_kind, interactions in compact.interactions_by_npc_kind.items():
+        for interaction in interactions:
+            assert interaction is compact.interactions_by_id[interaction["interaction_id"]]
+
+
+def test_compact_repo_reload_and_snapshot(make_content_root, tmp_path: Path) -> None:
+    from app.content.repo import ContentRepo
+
+    root = make_content_root()
+    snapshot = tmp_path / "content.pickle"
+    compact = ContentRepo(root, snapshot_path=snapshot, compact=True)
+    cached = ContentRepo(root, snapshot_path=snapshot, compact=True)
+    plain = ContentRepo(root, snapshot_path=snapshot)
+
+    assert cached.content_version == compact.content_version == plain.content_version
+    assert all(isinstance(place, Record) for place in cached.places_by_id.values())
+    assert not any(isinstance(place, Record) for place in plain.places_by_id.values())
+
+    reloaded = compact.reloaded({"collectibles"})
+    assert all(isinstance(item, Record) for item in reloaded.collectibles_by_id.values())
+    assert reloaded.content_version == compact.content_version
+
+
+def test_world_api_serializes_compact_records(content_root: Path, content_repo) -> None:
+    from fastapi.testclient import TestClient
+
+    from app.api.app import create_app
+    from app.api.deps import get_content_repo
+    from app.api.routers.world import WORLD_PAYLOADS
+    from app.content.repo import ContentRepo
+
+    compact = ContentRepo(content_root, compact=True)
+    app = create_app()
+    app.dependency_overrides[get_content_repo] = lambda: compact
+    client = TestClient(app)
+    WORLD_PAYLOADS.clear()
+
+    full = client.get("/v1/world/collectibles")
+    filtered = client.get("/v1/world/collectibles", params={"limit": 2, "fields": "item_id,tags"})
+
+    assert full.status_code == 200
+    assert full.json() == json.loads(json.dumps(list(content_repo.collectibles_by_id.values())))
+    assert filtered.status_code == 200
+    assert all(set(item) <= {"item_id", "tags"} for item in filtered.json())
@@ -0,0 +1,118 @@
+import json
+import os
+from pathlib import Path
+
+
+def _rewrite(path: Path, data) -> None:
+    before = path.stat().st_mtime_ns
+    path.write_text(json.dumps(data) if not isinstance(data, str) else data)
+    os.utime(path, ns=(before + 1_000_000, before + 1_000_000))
+
+
+def test_watcher_reloads_only_changed_asset(make_content_root) -> None:
+    from app.content.reload import ContentWatcher
+    from app.content.repo import ContentRepo
+
+    root = make_content_root()
+    repo = ContentRepo(root)
+    swapped = []
+    watcher = ContentWatcher(repo, on_swap=swapped.append)
+    assert watcher.poll() is None
+
+    path = root / "assets" / "interactions.json"
+    data = json.loads(path.read_text())
+    interaction = data["interactions"][0]
+    interaction["text"]["primary"] = "The kettle hums."
+    _rewrite(path, data)
+
+    new_repo = watcher.poll()
+    assert new_repo is not None
+    assert swapped == [new_repo]
+    assert watcher.repo is new_repo
+    assert new_repo.interactions_by_id[interaction["interaction_id"]]["text"]["primary"] == "The kettle hums."
+    assert repo.interactions_by_id[interaction["interaction_id"]]["text"]["primary"] != "The kettle hums."
+    assert new_repo.interactions_by_npc_kind is not repo.interactions_by_npc_kind
+    assert new_repo.places_by_id is repo.places_by_id
+    assert new_repo.collectibles_by_id is repo.collectibles_by_id
+
+
+def test_watcher_keeps_repo_when_reload_fails(make_content_root) -> None:
+    from app.content.reload import ContentWatcher
+    from app.content.repo import ContentRepo
+
+    root = make_content_root()
+    repo = ContentRepo(root)
+    watcher = ContentWatcher(repo)
+
+    _rewrite(root / "assets" / "places.json", "{broken")
+    assert watcher.poll() is None
+    assert watcher.repo is repo
+
+
+def test_watcher_rejects_cross_file_breakage(make_content_root) -> None:
+    from app.content.reload import ContentWatcher
+    from app.content.repo import ContentRepo
+
+    root = make_content_root()
+    repo = ContentRepo(root)
+    watcher = ContentWatcher(repo)
+
+    path = root / "assets" / "npcs.json"
+    data = json.loads(path.read_text())
+    data["npcs"][0]["home_location_id"] = "nowhere_at_all"
+    _rewrite(path, data)
+
+    assert watcher.poll() is None
+    assert watcher.repo is repo
+
+
+def test_shared_schema_change_reloads_every_step(content_repo) -> None:
+    sources = content_repo.source_paths()
+    common = content_repo.root / content_repo.manifest.schemas["common"]
+
+    assert set(sources[common]) == set(content_repo._LOAD_STEPS)
+    assert sources[content_repo.root / content_repo.manifest.assets["tea"]] == ("tea",)
+
+
+def test_failed_steps_are_retried_with_the_next_change(make_content_root) -> None:
+    from app.content.reload import ContentWatcher
+    from app.content.repo import ContentRepo
+
+    root = make_content_root()
+    watcher = ContentWatcher(ContentRepo(root))
+
+    interactions_path = root / "assets" / "interactions.json"
+    interactions = json.loads(interactions_path.read_text())
+    interaction = interactions["interactions"][0]
+    interaction["conditions"]["place_id"] = "tea_garden"
+    _rewrite(interactions_path, interactions)
+    assert watcher.poll() is None
+    # Nothing changed on disk since the failure, so there is nothing to retry yet.
+    assert watcher.poll() is None
+
+    places_path = root / "assets" / "places.json"
+    places = json.loads(places_path.read_text())
+    places["places"].append({**places["places"][0], "place_id": "tea_garden", "display_name": "Tea garden"})
+    _rewrite(places_path, places)
+
+    new_repo = watcher.poll()
+    assert new_repo is not None
+    assert "tea_garden" in new_repo.places_by_id
+    assert new_repo.interactions_by_id[interaction["interaction_id"]]["conditions"]["place_id"] == "tea_garden"
+
+
+def test_reload_sees_a_schema_changed_right_after_loading(make_content_root) -> None:
+    from app.content.reload import ContentWatcher
+    from app.content.repo import ContentRepo
+
+    root = make_content_root()
+    repo = ContentRepo(root)
+    watcher = ContentWatcher(repo)
+
+    path = root / repo.manifest.schemas["places"]
+    schema = json.loads(path.read_text())
+    schema["required"] = [*schema.get("required", []), "not_a_places_field"]
+    _rewrite(path, schema)
+
+    assert watcher.poll() is None
+    assert watcher.repo is repo
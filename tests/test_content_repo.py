@@ -1,5 +1,7 @@
 from typing import Dict
 
+import pytest
+
 
 def test_content_repo_builds_indices() -> None:
     from app.content.repo import ContentRepo
@@ -45,3 +47,83 @@ def test_content_repo_ids_are_strings() -> None:
     for index_name, index in index_map.items():
         for key in index.keys():
             assert isinstance(key, str), f"{index_name} key is not a string: {key}"
+
+
+@pytest.mark.parametrize("loader", ["thread", "process"])
+def test_concurrent_loader_matches_serial(content_root, loader: str) -> None:
+    from app.content.repo import ContentRepo
+
+    serial = ContentRepo(content_root)
+    concurrent = ContentRepo(content_root, loader=loader, max_workers=3)
+
+    for step_attr, value in vars(serial).items():
+        if step_attr in ContentRepo._CONFIG_ATTRS:
+            continue
+        assert getattr(concurrent, step_attr) == value, step_attr
+
+
+@pytest.mark.parametrize("loader", ["thread", "process"])
+def test_concurrent_loader_reports_serial_error(make_content_root, loader: str) -> None:
+    from app.content.repo import ContentRepo
+
+    root = make_content_root()
+    (root / "assets" / "npcs.json").write_text("{not json")
+    (root / "assets" / "spells.json").write_text("{not json")
+
+    with pytest.raises(ValueError) as serial_error:
+        ContentRepo(root)
+    with pytest.raises(ValueError) as concurrent_error:
+        ContentRepo(root, loader=loader)
+
+    assert str(concurrent_error.value) == str(serial_error.value)
+    assert "npcs.json" in str(concurrent_error.value)
+
+
+def test_lazy_repo_loads_steps_on_first_access(content_root, content_repo) -> None:
+    from app.content.repo import ContentRepo
+
+    repo = ContentRepo(content_root, lazy=True)
+    assert "places_by_id" not in vars(repo)
+
+    assert repo.zones_by_id == content_repo.zones_by_id
+    assert "places_by_id" in vars(repo)
+    assert "collectibles_by_id" not in vars(repo)
+    assert repo._loaded_steps == {"places"}
+
+    repo.warm()
+    assert repo._loaded_steps == set(ContentRepo._LOAD_STEPS)
+    assert repo.content_hashes == content_repo.content_hashes
+    assert repo.lexicon_by_key == content_repo.lexicon_by_key
+
+
+def test_lazy_repo_initializes_each_step_once(content_root, monkeypatch) -> None:
+    import threading
+    import time
+
+    from app.content import repo as repo_module
+
+    calls = []
+    original = repo_module._run_load_step
+
+    def slow_step(root, manifest, step):
+        calls.append(step)
+        time.sleep(0.05)
+        return original(root, manifest, step)
+
+    monkeypatch.setattr(repo_module, "_run_load_step", slow_step)
+    repo = repo_module.ContentRepo(content_root, lazy=True)
+
+    threads = [threading.Thread(target=lambda: repo.collectibles_by_id) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == ["collectibles"]
+
+
+def test_lazy_repo_rejects_snapshot(tmp_path) -> None:
+    from app.content.repo import ContentRepo
+
+    with pytest.raises(ValueError):
+        ContentRepo(lazy=True, snapshot_path=tmp_path / "snapshot.pickle")
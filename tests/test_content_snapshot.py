@@ -0,0 +1,55 @@
+import json
+from pathlib import Path
+
+
+def test_snapshot_round_trip_skips_validation(make_content_root, tmp_path: Path, monkeypatch) -> None:
+    from app.content import repo as repo_module
+    from app.content.repo import ContentRepo
+
+    root = make_content_root()
+    snapshot = tmp_path / "cache" / "content.pickle"
+
+    first = ContentRepo(root, snapshot_path=snapshot)
+    assert snapshot.is_file()
+
+    def fail_load(*args, **kwargs):
+        raise AssertionError("snapshot should have been used")
+
+    monkeypatch.setattr(repo_module, "load_json", fail_load)
+    second = ContentRepo(root, snapshot_path=snapshot)
+
+    assert second.places_by_id == first.places_by_id
+    assert second.scenes_by_place_id == first.scenes_by_place_id
+    assert second.lexicon_by_key == first.lexicon_by_key
+
+
+def test_snapshot_rebuilds_when_content_changes(make_content_root, tmp_path: Path) -> None:
+    from app.content.repo import ContentRepo
+
+    root = make_content_root()
+    snapshot = tmp_path / "content.pickle"
+    ContentRepo(root, snapshot_path=snapshot)
+
+    places_path = root / "assets" / "places.json"
+    places = json.loads(places_path.read_text())
+    places["places"][0]["display_name"] = "Renamed Cottage"
+    places_path.write_text(json.dumps(places))
+
+    repo = ContentRepo(root, snapshot_path=snapshot)
+    place_id = places["places"][0]["place_id"]
+    assert repo.places_by_id[place_id]["display_name"] == "Renamed Cottage"
+
+    cached = ContentRepo(root, snapshot_path=snapshot)
+    assert cached.places_by_id[place_id]["display_name"] == "Renamed Cottage"
+
+
+def test_corrupt_snapshot_falls_back_to_full_load(make_content_root, tmp_path: Path) -> None:
+    from app.content.repo import ContentRepo
+
+    root = make_content_root()
+    snapshot = tmp_path / "content.pickle"
+    snapshot.write_bytes(b"not a pickle")
+
+    repo = ContentRepo(root, snapshot_path=snapshot)
+    assert repo.places_by_id
+    assert snapshot.read_bytes() != b"not a pickle"
@@ -0,0 +1,120 @@
+import random
+
+import pytest
+
+from app.domain.ingredient_picker import IngredientResolver, compile_substitution, parse_token, resolver_for
+
+
+def _scan(repo, **required) -> tuple[str, ...]:
+    matches = []
+    for item_id, item in repo.collectibles_by_id.items():
+        values = {
+            "tag": set(item.get("tags") or []),
+            "item_type": {item.get("item_type")},
+            "usable_in": set(item.get("usable_in") or []),
+            "origin_ref": {item.get("origin_ref")},
+        }
+        if all(value in values[field] for field, value in required.items()):
+            matches.append(item_id)
+    return tuple(matches)
+
+
+def test_authored_tokens_resolve_to_matching_collectibles(content_repo) -> None:
+    resolver = IngredientResolver(content_repo)
+
+    calming = resolver.resolve("any:tag=calming&category=Botanical")
+    assert calming.candidates == _scan(content_repo, tag="calming", item_type="Botanical")
+    assert calming.candidates
+    assert calming.fallback == "lemon_balm"
+
+    water = resolver.resolve("any:element=water")
+    assert water.candidates == _scan(content_repo, tag="element_water")
+    assert water.max_results == 12
+
+    tidepools = resolver.resolve("any:place=beach_tidepools&tag=wonder")
+    assert tidepools.candidates == _scan(content_repo, origin_ref="beach_tidepools", tag="wonder")
+    assert tidepools.place_policy == "same_place"
+
+
+def test_authored_tokens_match_their_ad_hoc_parse(content_repo) -> None:
+    resolver = IngredientResolver(content_repo)
+
+    for token in content_repo.substitutions_by_token:
+        ad_hoc = compile_substitution(content_repo.collectibles_bitsets, parse_token(token))
+        assert ad_hoc.candidates == resolver.resolve(token).candidates
+        assert content_repo.collectibles_bitsets.ids_for(ad_hoc.mask) == list(ad_hoc.candidates)
+
+
+def test_ad_hoc_tokens_are_cached_and_bounded(content_repo) -> None:
+    resolver = IngredientResolver(content_repo, ad_hoc_maxsize=2)
+
+    portal = resolver.resolve("any:item_type=Crystal&usable_in=portal")
+    assert portal.candidates == _scan(content_repo, item_type="Crystal", usable_in="portal")
+    assert resolver.resolve("any:item_type=Crystal&usable_in=portal") is portal
+
+    resolver.resolve("any:tag=warm&category=Crystal")
+    resolver.resolve("any:tag=calming")
+    assert len(resolver._ad_hoc) == 2
+    assert "any:item_type=Crystal&usable_in=portal" not in resolver._ad_hoc
+
+
+def test_recipe_ingredients_resolve_plain_refs_and_tokens(content_repo) -> None:
+    resolver = resolver_for(content_repo)
+    assert resolver_for(content_repo) is resolver
+
+    for spell in content_repo.spells_by_id.values():
+        for ingredient, substitution in resolver.recipe_ingredients(spell):
+            ref = ingredient["ingredient_ref"]
+            if ref.startswith("any:"):
+                assert set(substitution.choices) <= set(content_repo.collectibles_by_id)
+            else:
+                assert substitution.candidates == (ref,)
+
+
+@pytest.mark.parametrize("token", ["any:", "any:tag", "any:colour=blue", "tag=calming"])
+def test_parse_token_rejects_malformed_tokens(token: str) -> None:
+    with pytest.raises(ValueError):
+        parse_token(token)
+
+
+def test_pick_prefers_same_place_then_widens_to_zone(content_repo) -> None:
+    resolver = IngredientResolver(content_repo)
+
+    warm = resolver.pick("any:tag=warm", "beach_tidepools", rng=random.Random(1))
+    assert warm.tier == "same_place"
+    assert warm.tiers_tried == ("same_place",)
+    assert set(warm.item_ids) <= {"calendula", "cinnamon"}
+
+    # Three water items at the tidepools are not enough for four, so the pick widens to the zone.
+    water = resolver.pick("any:element=water", "beach_tidepools", count=4, rng=random.Random(1))
+    beach_places = {"beach", "beach_boardwalk", "beach_tidepools", "beach_pier"}
+    assert water.tier == "same_zone"
+    assert water.tiers_tried == ("same_place", "same_zone")
+    assert len(water.item_ids) == 4
+    assert all(content_repo.collectibles_by_id[item_id]["origin_ref"] in beach_places for item_id in water.item_ids)
+
+
+def test_pick_respects_strict_place_policy_and_entry_type(content_repo) -> None:
+    resolver = IngredientResolver(content_repo)
+
+    strict = resolver.pick("any:place=beach_tidepools&tag=wonder", "forest")
+    assert strict.tiers_tried == ("same_place",)
+    assert strict.tier == "fallback"
+    assert strict.item_ids == ("labradorite",)
+
+    spell = resolver.pick("any:element=water", "beach_tidepools", entry_type="spell", rng=random.Random(0))
+    assert spell.item_ids == ("amethyst",)
+    assert spell.explain()["tier"] == "same_place"
+
+
+def test_pick_recipe_is_deterministic_under_seed(content_repo) -> None:
+    resolver = IngredientResolver(content_repo)
+    recipe = {"ingredients": [{"ingredient_ref": "any:element=water"}, {"ingredient_ref": "mirror"}]}
+
+    first = resolver.pick_recipe(recipe, "meadow", seed=7)
+    second = resolver.pick_recipe(recipe, "meadow", seed=7)
+
+    assert first == second
+    assert first[1].tier == "exact"
+    with pytest.raises(ValueError):
+        resolver.pick("any:tag=warm", "nowhere")
@@ -0,0 +1,128 @@
+import random
+
+import pytest
+
+from app.content.intents import IntentMatcher, intents_for
+
+
+ACTIONS = [
+    {
+        "action_id": "brew",
+        "label": "Make tea",
+        "intent_signature": {"phrases": ["put the kettle on"], "keywords": ["tea", "kettle"]},
+    },
+    {
+        "action_id": "leave",
+        "label": "Head to town",
+        "intent_signature": {"phrases": ["make tracks"], "keywords": ["town", "leave"]},
+    },
+    {"action_id": "silent", "label": "", "intent_signature": {"keywords": ["Quiet"]}},
+]
+
+
+def _reference_match(input_text: str, actions: list[dict]) -> str | None:
+    # A plain substring scan: every choice's labels, then phrases, then keywords.
+    text = input_text.lower()
+    for kind in ("label", "phrases", "keywords"):
+        for action in actions:
+            signature = action.get("intent_signature") or {}
+            patterns = [action.get("label", "")] if kind == "label" else signature.get(kind, [])
+            if any(pattern and str(pattern).lower() in text for pattern in patterns):
+                return action["action_id"]
+    return None
+
+
+@pytest.mark.parametrize(
+    ("text", "action_id", "kind"),
+    [
+        ("I want to MAKE TEA now", "brew", "label"),
+        ("please put the kettle on", "brew", "phrase"),
+        ("town sounds nice", "leave", "keyword"),
+        # A stronger kind wins even when an earlier choice matches a weaker one.
+        ("head to town for tea", "leave", "label"),
+        ("make tracks for tea", "leave", "phrase"),
+        # Within one kind the earlier choice wins.
+        ("tea in town", "brew", "keyword"),
+        ("keep it quiet", "silent", "keyword"),
+    ],
+)
+def test_match_ranks_by_kind_then_choice(text: str, action_id: str, kind: str) -> None:
+    match = IntentMatcher(ACTIONS).match(text)
+
+    assert (match.action_id, match.kind) == (action_id, kind)
+
+
+def test_no_match_returns_none() -> None:
+    assert IntentMatcher(ACTIONS).match("sit by the fire") is None
+    assert IntentMatcher([]).match("anything") is None
+
+
+def test_matcher_agrees_with_a_kind_ordered_scan(content_repo) -> None:
+    rng = random.Random(7)
+    intents = intents_for(content_repo)
+    for scene_id, graph in content_repo.scene_graphs_by_id.items():
+        for node_id, node in graph.nodes_by_id.items():
+            actions = [content_repo.actions_by_id[choice] for choice in node["choices"]]
+            words = ["hello", "the", "Cup", "LOOK"]
+            for action in content_repo.actions_by_id.values():
+                signature = action["intent_signature"]
+                words += [action["label"], *signature["phrases"], *signature["keywords"]]
+            for _ in range(200):
+                text = " ".join(rng.sample(words, rng.randint(0, 3)))
+                match = intents.get(scene_id, node_id).match(text)
+                assert (match.action_id if match else None) == _reference_match(text, actions), text
+
+
+@pytest.mark.parametrize(
+    ("text", "action_id", "pattern"),
+    [
+        ("mak tea", "brew", "make tea"),
+        ("could you put the kettel on", "brew", "put the kettle on"),
+        ("hed to twn", "leave", "head to town"),
+        ("headtotown", "leave", "head to town"),
+    ],
+)
+def test_fuzzy_match_recovers_near_misses(text: str, action_id: str, pattern: str) -> None:
+    match = IntentMatcher(ACTIONS).fuzzy_match(text)
+    assert (match.action_id, match.pattern) == (action_id, pattern)
+    assert 0.8 <= match.confidence < 1
+
+
+def test_fuzzy_match_respects_the_threshold() -> None:
+    matcher = IntentMatcher(ACTIONS)
+
+    assert matcher.fuzzy_match("bake a pie") is None
+    assert matcher.fuzzy_match("hed to twn", threshold=0.9) is None
+    assert matcher.fuzzy_match("mak tea", threshold=1.5) is None
+
+
+@pytest.mark.parametrize(
+    ("text", "pattern"),
+    [("i want to slep", "sleep"), ("cup oof taa", "cup of tea")],
+)
+def test_fuzzy_match_accepts_a_score_at_the_threshold(text: str, pattern: str) -> None:
+    actions = [{"action_id": "rest", "label": "", "intent_signature": {"phrases": ["cup of tea"], "keywords": ["sleep"]}}]
+
+    match = IntentMatcher(actions).fuzzy_match(text, threshold=0.8)
+
+    assert match.pattern == pattern
+    assert match.confidence == pytest.approx(0.8)
+
+
+def test_bounded_edit_distance() -> None:
+    from app.content.intents import bounded_edit_distance
+
+    assert bounded_edit_distance("look around", "lok arund", 2) == 2
+    assert bounded_edit_distance("look around", "lok arund", 1) is None
+    assert bounded_edit_distance("tea", "tea", 0) == 0
+
+
+def test_scene_intents_cache_fuzzy_results(content_repo) -> None:
+    from app.content.intents import SceneIntents
+
+    intents = SceneIntents(content_repo)
+
+    match = intents.match("cottage_wake_v1", "cottage_wake", "Lok  arund!")
+    assert match.action_id == "look_around"
+    assert intents.match("cottage_wake_v1", "cottage_wake", "lok arund") is match
+    assert intents.match("cottage_wake_v1", "cottage_wake", "zzz") is None
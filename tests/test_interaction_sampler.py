@@ -0,0 +1,55 @@
+from collections import Counter
+from fractions import Fraction
+import random
+
+import pytest
+
+from app.domain.interaction_sampler import AliasTable, InteractionSampler
+from app.domain.selector import EncounterContext, eligible_interaction_mask, sample_interaction
+
+
+@pytest.mark.parametrize("weights", [[1], [3, 1], [8, 1, 1, 5, 2], [7, 7, 7], [1, 100, 3, 4]])
+def test_alias_table_probabilities_are_exact(weights: list[int]) -> None:
+    items = [f"item_{i}" for i in range(len(weights))]
+    table = AliasTable(items, weights)
+
+    assert table.probabilities() == {item: Fraction(weight, sum(weights)) for item, weight in zip(items, weights)}
+
+
+def test_alias_table_draws_are_seeded() -> None:
+    table = AliasTable(["a", "b", "c"], [5, 3, 2])
+
+    first = table.draw_many(random.Random(3), 2000)
+    assert first == table.draw_many(random.Random(3), 2000)
+    counts = Counter(first)
+    assert 900 < counts["a"] < 1100 and 500 < counts["b"] < 700 and 300 < counts["c"] < 500
+
+    with pytest.raises(ValueError):
+        AliasTable(["a"], [0])
+
+
+def test_sampler_uses_top_priority_tier_with_weighted_members(content_repo) -> None:
+    sampler = InteractionSampler(content_repo)
+    context = EncounterContext(npc_id="npc_baker_elin", place_id="town_bakery", affinity=2)
+    mask = eligible_interaction_mask(content_repo, context)
+    eligible = [content_repo.interactions_by_id[i] for i in content_repo.interactions_selection_index.ids_for(mask)]
+    top = max(item["selection"]["priority"] for item in eligible)
+    tier = [item for item in eligible if item["selection"]["priority"] == top]
+    total = sum(item["selection"]["weight"] for item in tier)
+
+    expected = {item["interaction_id"]: Fraction(item["selection"]["weight"], total) for item in tier}
+    assert sampler.probabilities(mask) == expected
+
+    draws = sampler.draw_many(mask, random.Random(11), 500)
+    assert set(draws) <= set(expected)
+    assert draws == sampler.draw_many(mask, random.Random(11), 500)
+    assert sampler.draw(0, random.Random(0)) is None
+
+
+def test_sample_interaction_returns_an_eligible_record(content_repo) -> None:
+    context = EncounterContext(npc_id="npc_cat_moss", place_id="town_bakery_stoop")
+    interaction = sample_interaction(content_repo, context, random.Random(5))
+
+    assert interaction is not None
+    assert interaction["npc_kind"] == "animal"
+    assert interaction == sample_interaction(content_repo, context, random.Random(5))
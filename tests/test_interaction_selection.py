@@ -0,0 +1,72 @@
+import itertools
+
+from app.domain.selector import EncounterContext, eligible_interactions
+
+
+def _scan(repo, context: EncounterContext) -> list[str]:
+    # Reference implementation: filter every interaction against every condition.
+    npc = repo.npcs_by_id[context.npc_id]
+    zone_id = repo.places_by_id[context.place_id].get("zone_id")
+    matches = []
+    for interaction_id, interaction in repo.interactions_by_id.items():
+        conditions = interaction.get("conditions") or {}
+        if interaction.get("npc_kind") not in (None, npc.get("npc_kind")):
+            continue
+        if conditions.get("npc_id") not in (None, context.npc_id):
+            continue
+        if conditions.get("place_id") not in (None, context.place_id):
+            continue
+        if conditions.get("zone_id") not in (None, zone_id):
+            continue
+        listed = {"time_of_day": context.time_of_day, "weather": context.weather, "season": context.season}
+        if any(conditions.get(key) and value not in conditions[key] for key, value in listed.items()):
+            continue
+        if (conditions.get("affinity_min") or 0) > context.affinity:
+            continue
+        matches.append(interaction_id)
+    return matches
+
+
+def test_selection_index_matches_full_scan(content_repo) -> None:
+    npc_ids = ["npc_cat_moss", "npc_baker_elin", "npc_crow_ink", "npc_deer_sable"]
+    place_ids = ["town_bakery_stoop", "town_bakery", "forest"]
+    times = [None, "morning", "evening"]
+    weathers = [None, "rain"]
+    checked = 0
+    for npc_id, place_id, time_of_day, weather, affinity in itertools.product(
+        npc_ids, place_ids, times, weathers, [0, 2]
+    ):
+        context = EncounterContext(
+            npc_id=npc_id, place_id=place_id, time_of_day=time_of_day, weather=weather, affinity=affinity
+        )
+        expected = _scan(content_repo, context)
+        assert [item["interaction_id"] for item in eligible_interactions(content_repo, context)] == expected
+        checked += bool(expected)
+    assert checked
+
+
+def test_null_conditions_are_wildcards(content_repo) -> None:
+    index = content_repo.interactions_selection_index
+    generic = content_repo.interactions_by_id["human_ambient_weather_01"]
+    position = index.ids.index(generic["interaction_id"])
+
+    for field in ("npc_id", "place_id", "zone_id", "time_of_day", "weather", "season"):
+        assert index.wildcards[field] >> position & 1
+
+
+def test_history_conditions_filter_candidates(content_repo) -> None:
+    base = EncounterContext(npc_id="npc_baker_elin", place_id="town_bakery", day=5)
+    candidates = eligible_interactions(content_repo, base)
+    once_a_day = next(item for item in candidates if item["conditions"]["once_per_day"])
+    interaction_id = once_a_day["interaction_id"]
+    cooldown = once_a_day["conditions"]["cooldown_days"]
+
+    shown_today = EncounterContext(
+        npc_id="npc_baker_elin", place_id="town_bakery", day=5, last_seen_day={interaction_id: 5}
+    )
+    later = EncounterContext(
+        npc_id="npc_baker_elin", place_id="town_bakery", day=5 + max(cooldown, 1), last_seen_day={interaction_id: 5}
+    )
+
+    assert interaction_id not in [item["interaction_id"] for item in eligible_interactions(content_repo, shown_today)]
+    assert interaction_id in [item["interaction_id"] for item in eligible_interactions(content_repo, later)]
@@ -0,0 +1,81 @@
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from app.content.lexicon import LexiconTables, PatternMatcher
+
+
+def _naive_words(repo, place_id: str, zone_id: str | None) -> list[str]:
+    # The scan generate_scene used to do on every call.
+    banned = set()
+    for entry in repo.lexicon_by_key.values():
+        if entry.get("lexicon_type") == "Not_Allowed":
+            banned.update(word.lower() for word in entry.get("words", []))
+    words = []
+    for entry in repo.lexicon_by_key.values():
+        if entry.get("lexicon_type") == "Sensory" and entry.get("scope") in ("Global", place_id, zone_id):
+            words.extend(entry.get("words", []))
+    return [word for word in words if all(bad not in word.lower() for bad in banned)]
+
+
+def test_pattern_matcher_agrees_with_substring_checks() -> None:
+    patterns = ["he", "she", "his", "hers", "a", "ab", "bab", "c"]
+    matcher = PatternMatcher(patterns)
+    rng = random.Random(0)
+    for _ in range(500):
+        text = "".join(rng.choice("abcehirsABS ") for _ in range(rng.randint(0, 12)))
+        expected = [pattern for pattern in patterns if pattern in text.lower()]
+        assert matcher.search(text) == bool(expected)
+        assert set(matcher.find_all(text)) == set(expected)
+
+    assert matcher.find_all("ushers") == ["she", "he", "hers"]
+    assert PatternMatcher([]).search("anything") is False
+    assert PatternMatcher([""]).search("anything") is True
+
+
+def test_sensory_words_match_the_per_call_scan(content_repo) -> None:
+    tables = content_repo.lexicon_tables
+    for place_id, place in content_repo.places_by_id.items():
+        zone_id = place.get("zone_id")
+        words = tables.sensory_words(place_id, zone_id)
+        assert list(words) == _naive_words(content_repo, place_id, zone_id)
+        assert all(tables.is_allowed(word) for word in words)
+        assert tables.sensory_words(place_id, zone_id) is words
+
+
+def test_generated_prompts_are_unchanged(content_repo) -> None:
+    from app.domain.scene_generator import FAMILIES, ValidationPolicy, generate_scene
+
+    for place_id, place in content_repo.places_by_id.items():
+        for seed in (1, 7, 99):
+            state = SimpleNamespace(current_place_id=place_id)
+            off = ValidationPolicy("off")
+            scene = generate_scene(state=state, repo=content_repo, seed=seed, validation=off)
+
+            rng = random.Random(seed)
+            rng.choice(FAMILIES)
+            words = _naive_words(content_repo, place_id, place.get("zone_id"))
+            expected = f"{rng.choice(words)} lingers nearby." if words else "A quiet detail catches the eye."
+            assert scene.prompt == expected
+
+
+def test_repos_without_tables_build_them_on_demand() -> None:
+    from app.content.lexicon import lexicon_tables
+
+    repo = SimpleNamespace(
+        lexicon_by_key={
+            "bad": {"lexicon_type": "Not_Allowed", "scope": "Global", "words": ["Storm"]},
+            "sky": {"lexicon_type": "Sensory", "scope": "Global", "words": ["stormy sky", "soft light"]},
+        }
+    )
+    tables = lexicon_tables(repo)
+
+    assert isinstance(tables, LexiconTables)
+    assert tables.sensory_words("cottage_home", "cottage") == ("soft light",)
+    assert not tables.is_allowed("A STORM rolls in")
+
+
+@pytest.mark.parametrize("text", ["", "calm tea"])
+def test_pattern_matcher_handles_plain_text(text: str) -> None:
+    assert PatternMatcher(["storm"]).search(text) is False
@@ -0,0 +1,63 @@
+from app.content.indexes import build_bitset_index
+from app.domain.offers import offer_pools, pool_candidates
+
+
+def _scan(repo, filters) -> list[str]:
+    # Reference implementation: the plain per-item scan the bitsets replace.
+    matches = []
+    for item_id, item in repo.collectibles_by_id.items():
+        tags = set(item.get("tags") or [])
+        if filters.get("item_type") and item.get("item_type") not in filters["item_type"]:
+            continue
+        require = filters.get("require") or {}
+        if "usable_in" in require and require["usable_in"] not in (item.get("usable_in") or []):
+            continue
+        if "safety_category" in require and item.get("safety_category") != require["safety_category"]:
+            continue
+        if filters.get("tags_any") and not tags & set(filters["tags_any"]):
+            continue
+        if filters.get("tags_all") and not set(filters["tags_all"]) <= tags:
+            continue
+        if filters.get("exclude_tags_any") and tags & set(filters["exclude_tags_any"]):
+            continue
+        matches.append(item_id)
+    return matches
+
+
+def test_bitset_index_combines_attributes() -> None:
+    records = {
+        "a": {"tags": ["warm", "calm"], "kind": "herb"},
+        "b": {"tags": ["warm"], "kind": "stone"},
+        "c": {"tags": ["calm", "toxic"], "kind": "herb"},
+    }
+    index = build_bitset_index(records, {"tag": "tags", "kind": "kind"})
+
+    assert index.ids_for(index.any_of("tag", ["warm"])) == ["a", "b"]
+    assert index.ids_for(index.all_of("tag", ["warm", "calm"])) == ["a"]
+    assert index.ids_for(index.select(any_of={"kind": ["herb"]}, none_of={"tag": ["toxic"]})) == ["a"]
+    assert index.ids_for(index.select()) == ["a", "b", "c"]
+    assert index.any_of("tag", ["unknown"]) == 0
+
+
+def test_offer_pools_match_a_full_scan(content_repo) -> None:
+    pools_checked = 0
+    for npc_id, npc in content_repo.npcs_by_id.items():
+        for pool in (npc.get("offers") or {}).get("pools") or []:
+            expected = _scan(content_repo, pool.get("filters") or {})
+            candidates = pool_candidates(content_repo, pool.get("filters"))
+            assert [item["collectible_id"] for item in candidates] == expected
+            pools_checked += 1
+        if npc.get("offers"):
+            assert set(offer_pools(content_repo, npc_id)) == {
+                pool["pool_id"] for pool in npc["offers"]["pools"]
+            }
+    assert pools_checked
+
+
+def test_pool_candidates_handle_tags_all_and_missing_filters(content_repo) -> None:
+    everything = pool_candidates(content_repo, None)
+    assert len(everything) == len(content_repo.collectibles_by_id)
+
+    filters = {"tags_all": ["calming", "sleep"], "exclude_tags_any": ["toxic"]}
+    ids = [item["collectible_id"] for item in pool_candidates(content_repo, filters)]
+    assert ids == _scan(content_repo, filters)
@@ -0,0 +1,54 @@
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from app.domain.scene_generator import VALIDATION_STATS, ValidationPolicy, generate_scene, generate_scenes
+
+OFF = ValidationPolicy("off")
+
+
+def _requests(repo, count: int) -> list[tuple[SimpleNamespace, int]]:
+    rng = random.Random(42)
+    place_ids = sorted(repo.places_by_id)
+    return [(SimpleNamespace(current_place_id=rng.choice(place_ids)), rng.randint(0, 1_000_000)) for _ in range(count)]
+
+
+def test_batch_matches_per_scene_generation(content_repo) -> None:
+    requests = _requests(content_repo, 60)
+
+    batch = generate_scenes(requests, content_repo, validation=OFF)
+
+    expected = [generate_scene(state, content_repo, seed, validation=OFF).to_dict() for state, seed in requests]
+    assert batch == expected
+
+
+def test_process_pool_batch_matches_serial(content_repo) -> None:
+    requests = _requests(content_repo, 45)
+    VALIDATION_STATS.reset()
+
+    pooled = generate_scenes(requests, content_repo, validation=OFF, workers=2, chunk_size=10)
+
+    assert pooled == generate_scenes(requests, content_repo, validation=OFF)
+    # Worker-side validation counts are merged back into the parent's stats.
+    assert VALIDATION_STATS.snapshot()["skipped"] == 90
+    VALIDATION_STATS.reset()
+
+
+def test_candidates_use_the_batch_path(content_repo, monkeypatch) -> None:
+    from app.domain import scene_generator
+    from app.domain.selector import generate_candidates
+
+    monkeypatch.setattr(scene_generator, "VALIDATION_POLICY", OFF)
+    state = SimpleNamespace(current_place_id="beach_tidepools")
+
+    candidates = generate_candidates(state, content_repo, seed=5, n=4)
+
+    rng = random.Random(5)
+    seeds = [rng.randint(0, 1_000_000) for _ in range(4)]
+    assert candidates == [generate_scene(state, content_repo, seed).to_dict() for seed in seeds]
+
+
+def test_batch_rejects_unknown_places(content_repo) -> None:
+    with pytest.raises(ValueError, match="Unknown place_id"):
+        generate_scenes([(SimpleNamespace(current_place_id="nowhere"), 1)], content_repo, validation=OFF)
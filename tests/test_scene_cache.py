@@ -0,0 +1,137 @@
+import copy
+from types import SimpleNamespace
+
+import pytest
+
+from app.domain import scene_cache, scene_generator
+from app.domain.scene_cache import SceneCache
+from app.domain.scene_generator import ValidationPolicy, generate_scene
+from app.persistence.scene_store import MongoSceneStore
+
+OFF = ValidationPolicy("off")
+
+
+class FakeCollection:
+    def __init__(self) -> None:
+        self.documents: dict[str, dict] = {}
+
+    def find_one(self, query: dict, projection: dict | None = None) -> dict | None:
+        document = self.documents.get(query["_id"])
+        return copy.deepcopy(document)
+
+    def replace_one(self, query: dict, document: dict, upsert: bool = False) -> None:
+        assert upsert
+        self.documents[query["_id"]] = copy.deepcopy(document)
+
+
+class BrokenStore:
+    def get(self, key: str) -> None:
+        raise ConnectionError("store down")
+
+    def put(self, key: str, record: dict) -> None:
+        raise ConnectionError("store down")
+
+
+def _state(place_id: str = "beach_pier") -> SimpleNamespace:
+    return SimpleNamespace(current_place_id=place_id)
+
+
+def test_seeded_scenes_are_served_from_cache(content_repo) -> None:
+    cache = SceneCache()
+
+    first = cache.generate(_state(), content_repo, seed=9, validation=OFF)
+    first.choices.append({"choice_id": "x"})
+    second = cache.generate(_state(), content_repo, seed=9, validation=OFF)
+
+    assert second.to_dict() == generate_scene(_state(), content_repo, 9, validation=OFF).to_dict()
+    assert cache.stats() == {"hits": 1, "store_hits": 0, "misses": 1, "evictions": 0, "size": 1}
+
+
+def test_cache_key_includes_content_version_and_place(content_repo) -> None:
+    cache = SceneCache()
+    newer = copy.copy(content_repo)
+    newer.content_version = "other-version"
+
+    cache.generate(_state(), content_repo, seed=1, validation=OFF)
+    cache.generate(_state(), newer, seed=1, validation=OFF)
+    cache.generate(_state("forest"), content_repo, seed=1, validation=OFF)
+    cache.generate(_state(), content_repo, seed=None, validation=OFF)
+
+    assert cache.stats()["misses"] == 3
+    assert cache.stats()["size"] == 3
+
+
+def test_lru_eviction(content_repo) -> None:
+    cache = SceneCache(maxsize=2)
+    for seed in (1, 2, 1, 3):
+        cache.generate(_state(), content_repo, seed=seed, validation=OFF)
+
+    assert cache.stats()["evictions"] == 1
+    cache.generate(_state(), content_repo, seed=1, validation=OFF)
+    assert cache.stats()["hits"] == 2
+
+
+def test_shared_store_lets_workers_reuse_results(content_repo, monkeypatch) -> None:
+    store = MongoSceneStore(FakeCollection())
+    producer = SceneCache(store=store)
+    produced = producer.generate(_state(), content_repo, seed=4, validation=OFF)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("should have come from the shared store")
+
+    monkeypatch.setattr(scene_cache, "generate_scenes", fail)
+    consumer = SceneCache(store=store)
+
+    assert consumer.generate(_state(), content_repo, seed=4, validation=OFF) == produced
+    assert consumer.stats()["store_hits"] == 1
+
+
+def test_store_errors_fall_back_to_generation(content_repo, caplog: pytest.LogCaptureFixture) -> None:
+    cache = SceneCache(store=BrokenStore())
+
+    scene = cache.generate(_state(), content_repo, seed=2, validation=OFF)
+
+    assert scene.to_dict() == generate_scene(_state(), content_repo, 2, validation=OFF).to_dict()
+    assert "Scene store" in caplog.text
+
+
+def test_cache_key_includes_the_validation_mode(content_repo, monkeypatch) -> None:
+    cache = SceneCache()
+    cache.generate(_state(), content_repo, seed=3, validation=OFF)
+
+    checked = []
+    monkeypatch.setattr(scene_generator, "_validate_scene", lambda record, policy, stats=None: checked.append(policy))
+    cache.generate(_state(), content_repo, seed=3, validation=ValidationPolicy("always"))
+
+    assert checked == [ValidationPolicy("always")]
+    assert cache.stats()["misses"] == 2
+
+
+def test_seeded_candidates_go_through_the_shared_cache(content_repo, monkeypatch) -> None:
+    from app.domain.selector import generate_candidates
+
+    cache = SceneCache()
+    monkeypatch.setattr(scene_cache, "SCENE_CACHE", cache)
+    monkeypatch.setattr(scene_generator, "VALIDATION_POLICY", OFF)
+
+    first = generate_candidates(_state(), content_repo, seed=11, n=3)
+    second = generate_candidates(_state(), content_repo, seed=11, n=3)
+
+    assert first == second
+    assert cache.stats()["misses"] == 3
+    assert cache.stats()["hits"] == 3
+
+
+def test_app_startup_shares_the_cache_through_mongo(monkeypatch) -> None:
+    from app.api import app as app_module
+
+    db = {"scene_cache": FakeCollection()}
+    monkeypatch.setattr(app_module, "get_db", lambda: db)
+    monkeypatch.setattr(scene_cache, "SCENE_CACHE", scene_cache.SCENE_CACHE)
+    monkeypatch.setenv("SCENE_CACHE_COLLECTION", "scene_cache")
+    app = app_module.create_app()
+
+    next(handler for handler in app.router.on_startup if handler.__name__ == "share_scene_cache")()
+
+    assert isinstance(scene_cache.SCENE_CACHE.store, MongoSceneStore)
+    assert scene_cache.SCENE_CACHE.store.collection is db["scene_cache"]
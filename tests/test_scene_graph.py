@@ -0,0 +1,133 @@
+import json
+
+import pytest
+
+from app.content.scene_graph import compile_scene_graph
+
+
+def _scene(nodes: list[dict], entry_node: str = "a") -> dict:
+    return {"scene_id": "s1", "place_id": "cottage_home", "entry_node": entry_node, "nodes": nodes}
+
+
+def test_compiled_graph_indexes_targets_and_reachability() -> None:
+    graph = compile_scene_graph(
+        _scene(
+            [
+                {"node_id": "a", "action_ref": "act_a", "choices": ["b", "act_c"]},
+                {"node_id": "b", "action_ref": "act_b", "choices": ["a"]},
+                {"node_id": "c", "action_ref": "act_c", "choices": []},
+                {"node_id": "orphan", "action_ref": "act_orphan", "choices": ["c"]},
+            ]
+        )
+    )
+
+    assert graph.node("b")["action_ref"] == "act_b"
+    assert graph.node("missing") is None
+    assert graph.targets["act_c"] == "c"
+    assert graph.edges["a"] == frozenset({"b", "c"})
+    assert graph.reachable == frozenset({"a", "b", "c"})
+    assert graph.terminal_nodes == frozenset({"c"})
+    assert graph.unreachable == ("orphan",)
+
+
+def test_target_requires_the_choice_on_the_current_node() -> None:
+    graph = compile_scene_graph(
+        _scene(
+            [
+                {"node_id": "a", "action_ref": "act_a", "choices": ["act_b"]},
+                {"node_id": "b", "action_ref": "act_b", "choices": []},
+            ]
+        )
+    )
+
+    assert graph.target("a", "act_b")["node_id"] == "b"
+    assert graph.target("a", "b") is None
+    assert graph.target("b", "act_a") is None
+    assert graph.target("missing", "act_b") is None
+
+
+def test_first_node_wins_a_shared_action_ref() -> None:
+    graph = compile_scene_graph(
+        _scene(
+            [
+                {"node_id": "a", "action_ref": "x", "choices": ["x"]},
+                {"node_id": "x", "action_ref": "y", "choices": []},
+            ]
+        )
+    )
+
+    # Matches the scan the sessions router used to do: node "a" carries action_ref "x" first.
+    assert graph.target("a", "x")["node_id"] == "a"
+
+
+@pytest.mark.parametrize(
+    ("scene", "message"),
+    [
+        (_scene([{"node_id": "a", "choices": []}], entry_node="b"), "entry_node"),
+        (_scene([{"node_id": "a", "choices": []}, {"node_id": "a", "choices": []}]), "Duplicate node_id"),
+        (_scene([{"node_id": "a", "choices": ["nowhere"]}]), "leading nowhere"),
+        (_scene([{"choices": []}]), "Missing node_id"),
+    ],
+)
+def test_broken_graphs_raise(scene: dict, message: str) -> None:
+    with pytest.raises(ValueError, match=message):
+        compile_scene_graph(scene)
+
+
+def test_repo_compiles_scene_graphs(content_repo) -> None:
+    graph = content_repo.scene_graphs_by_id["cottage_wake_v1"]
+
+    assert graph.entry_node == "cottage_wake"
+    assert graph.terminal_nodes == frozenset({"head_to_town"})
+    assert graph.unreachable == ()
+
+
+def test_broken_scene_fails_at_load(make_content_root) -> None:
+    from app.content.repo import ContentRepo
+
+    root = make_content_root()
+    scene_path = root / "assets" / "scenes" / "cottage_wake_v1.json"
+    scene = json.loads(scene_path.read_text())
+    scene["nodes"][0]["choices"].append("fly_away")
+    scene_path.write_text(json.dumps(scene))
+
+    with pytest.raises(ValueError, match="fly_away"):
+        ContentRepo(root)
+
+
+def test_action_routes_list_the_nodes_offering_each_choice(content_repo) -> None:
+    [route] = content_repo.scene_routes_by_action["head_to_town"]
+
+    assert route.scene_id == "cottage_wake_v1"
+    assert route.source_nodes == ("look_around", "make_tea", "pick_up_journal")
+    assert route.target_node == "head_to_town"
+    assert not route.self_loop
+    assert "cottage_wake" not in content_repo.scene_routes_by_action
+
+
+def test_action_routes_flag_targets_offering_the_action_again() -> None:
+    from app.content.scene_graph import build_action_routes
+
+    graph = compile_scene_graph(
+        _scene(
+            [
+                {"node_id": "a", "action_ref": "act_a", "choices": ["act_b"]},
+                {"node_id": "b", "action_ref": "act_b", "choices": ["act_b", "act_a"]},
+            ]
+        )
+    )
+    routes = build_action_routes([graph])
+
+    assert routes["act_b"][0].self_loop
+    assert not routes["act_a"][0].self_loop
+
+
+def test_compact_repo_graphs_share_the_frozen_scene_records(content_root) -> None:
+    from app.content.repo import ContentRepo
+
+    repo = ContentRepo(content_root, compact=True)
+    graph = repo.scene_graphs_by_id["cottage_wake_v1"]
+    nodes = repo.scenes_by_id["cottage_wake_v1"]["nodes"]
+
+    assert all(graph.node(node["node_id"]) is node for node in nodes)
+    assert graph.target("cottage_wake", "look_around")["node_id"] == "look_around"
@@ -0,0 +1,120 @@
+import copy
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.domain import scene_pool
+from app.domain.scene_generator import ValidationPolicy
+from app.domain.scene_pool import ScenePools
+
+OFF = ValidationPolicy("off")
+
+
+def _wait_for(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met in time")
+        time.sleep(0.01)
+
+
+def test_take_serves_from_filled_pool(content_repo, monkeypatch) -> None:
+    pools = ScenePools(size=4, low_watermark=2, validation=OFF)
+    pools.fill(content_repo, ["forest", "beach_pier"])
+    assert pools.available("forest") == 4
+
+    def fail(*args, **kwargs):
+        raise AssertionError("pooled scenes should not be generated inline")
+
+    monkeypatch.setattr(scene_pool, "generate_scenes", fail)
+    scenes = pools.take(SimpleNamespace(current_place_id="forest"), content_repo, 3)
+
+    assert len(scenes) == 3
+    assert {scene["place_id"] for scene in scenes} == {"forest"}
+    assert pools.available("forest") == 1
+
+
+def test_take_generates_inline_for_the_shortfall(content_repo) -> None:
+    pools = ScenePools(size=2, low_watermark=1, validation=OFF)
+
+    scenes = pools.take(SimpleNamespace(current_place_id="meadow"), content_repo, 3)
+
+    assert len(scenes) == 3
+    assert pools._wanted  # the empty pool was queued for refill
+
+
+def test_background_refill_and_version_invalidation(content_repo) -> None:
+    pools = ScenePools(size=3, low_watermark=2, validation=OFF)
+    pools.start()
+    try:
+        state = SimpleNamespace(current_place_id="beach_tidepools")
+        pools.take(state, content_repo, 1)
+        _wait_for(lambda: pools.available("beach_tidepools") == 3)
+
+        newer = copy.copy(content_repo)
+        newer.content_version = "next-version"
+        pools.take(SimpleNamespace(current_place_id="forest"), newer, 1)
+        assert pools.available("beach_tidepools") == 0
+        _wait_for(lambda: pools.available("forest") == 3)
+    finally:
+        pools.stop()
+
+
+def test_generate_candidates_uses_pools_for_unseeded_play(content_repo, monkeypatch) -> None:
+    from app.domain.selector import generate_candidates
+
+    pools = ScenePools(size=3, low_watermark=0, validation=OFF)
+    pools.fill(content_repo, ["town"])
+    monkeypatch.setattr(scene_pool, "SCENE_POOLS", pools)
+
+    candidates = generate_candidates(SimpleNamespace(current_place_id="town"), content_repo, seed=None, n=3)
+
+    assert len(candidates) == 3
+    assert pools.available("town") == 0
+
+
+def test_pool_settings_are_checked() -> None:
+    with pytest.raises(ValueError):
+        ScenePools(size=2, low_watermark=3)
+
+
+def test_prime_fills_every_place_in_the_background(content_repo) -> None:
+    pools = ScenePools(size=2, low_watermark=1, validation=OFF)
+    pools.start()
+    try:
+        pools.prime(content_repo)
+        _wait_for(lambda: all(pools.available(place_id) == 2 for place_id in content_repo.places_by_id))
+    finally:
+        pools.stop()
+
+
+def test_probe_rejects_a_policy_no_scene_can_pass(content_repo, tmp_path, monkeypatch) -> None:
+    from app.domain import scene_generator
+
+    schema = tmp_path / "scene.schema.json"
+    schema.write_text('{"type": "object", "required": ["nodes"]}')
+    monkeypatch.setattr(scene_generator, "SCENE_SCHEMA_PATH", schema)
+
+    with pytest.raises(ValueError, match="schema validation"):
+        ScenePools(validation=ValidationPolicy("always")).probe(content_repo)
+    ScenePools(validation=OFF).probe(content_repo)
+
+
+def test_failed_refills_back_off(content_repo, monkeypatch) -> None:
+    calls = []
+
+    def fail(*args, **kwargs):
+        calls.append(1)
+        raise ValueError("invalid scene")
+
+    pools = ScenePools(size=2, low_watermark=1, validation=OFF, failure_backoff=60)
+    monkeypatch.setattr(scene_pool, "generate_scenes", fail)
+    pools.start()
+    try:
+        pools.prime(content_repo)
+        _wait_for(lambda: calls)
+        time.sleep(0.1)
+        assert len(calls) == 1
+    finally:
+        pools.stop()
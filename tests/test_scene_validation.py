@@ -0,0 +1,91 @@
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from app.domain import scene_generator
+from app.domain.scene_generator import VALIDATION_STATS, ValidationPolicy, generate_scene
+
+
+def _write_schema(directory: Path, required: list[str]) -> Path:
+    path = directory / "scene.schema.json"
+    path.write_text(json.dumps({"type": "object", "required": required}))
+    return path
+
+
+@pytest.fixture
+def scene_schema(tmp_path: Path, monkeypatch):
+    from app.content.schema_utils import SCHEMA_REGISTRY
+
+    # The schema is rewritten in place between calls; check it on every lookup.
+    monkeypatch.setattr(SCHEMA_REGISTRY, "recheck_interval", 0)
+
+    def _use(required: list[str]) -> Path:
+        path = _write_schema(tmp_path, required)
+        monkeypatch.setattr(scene_generator, "SCENE_SCHEMA_PATH", path)
+        return path
+
+    VALIDATION_STATS.reset()
+    yield _use
+    VALIDATION_STATS.reset()
+
+
+def _generate(repo, policy: ValidationPolicy, seed: int = 3):
+    return generate_scene(state=SimpleNamespace(current_place_id="cottage_home"), repo=repo, seed=seed, validation=policy)
+
+
+def test_always_policy_raises_on_invalid_scene(content_repo, scene_schema) -> None:
+    scene_schema(["scene_id", "place_id"])
+    _generate(content_repo, ValidationPolicy("always"))
+
+    scene_schema(["not_a_scene_field"])
+    with pytest.raises(ValueError, match="failed schema validation"):
+        _generate(content_repo, ValidationPolicy("always"))
+    assert VALIDATION_STATS.snapshot() == {"checked": 2, "failed": 1, "skipped": 0}
+
+
+def test_sampled_policy_counts_failures_without_raising(content_repo, scene_schema) -> None:
+    scene_schema(["not_a_scene_field"])
+
+    for seed in range(5):
+        _generate(content_repo, ValidationPolicy("sampled", rate=1.0), seed)
+    for seed in range(5):
+        _generate(content_repo, ValidationPolicy("sampled", rate=0.0), seed)
+    _generate(content_repo, ValidationPolicy("off"))
+
+    assert VALIDATION_STATS.snapshot() == {"checked": 5, "failed": 5, "skipped": 6}
+
+
+def test_validator_is_compiled_once_per_schema_version(content_repo, scene_schema, monkeypatch) -> None:
+    from app.content import schema_utils
+
+    path = scene_schema(["scene_id"])
+    compiled = []
+    original = schema_utils.jsonschema.Draft202012Validator
+
+    def counting_validator(*args, **kwargs):
+        compiled.append(1)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(schema_utils.jsonschema, "Draft202012Validator", counting_validator)
+    for seed in range(10):
+        _generate(content_repo, ValidationPolicy("always"), seed)
+    assert len(compiled) == 1
+
+    path.write_text(json.dumps({"type": "object", "required": ["scene_id", "place_id"]}))
+    _generate(content_repo, ValidationPolicy("always"))
+    assert len(compiled) == 2
+
+
+@pytest.mark.parametrize("kwargs", [{"mode": "sometimes"}, {"mode": "sampled", "rate": 1.5}])
+def test_policy_rejects_bad_settings(kwargs: dict) -> None:
+    with pytest.raises(ValueError):
+        ValidationPolicy(**kwargs)
+
+
+def test_policy_reads_environment(monkeypatch) -> None:
+    monkeypatch.setenv("SCENE_VALIDATION", "Sampled")
+    monkeypatch.setenv("SCENE_VALIDATION_RATE", "0.25")
+
+    assert ValidationPolicy.from_env() == ValidationPolicy("sampled", 0.25)
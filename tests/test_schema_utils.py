@@ -0,0 +1,70 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+from jsonschema import ValidationError
+
+
+def test_load_validator_is_cached(repo_root: Path) -> None:
+    from app.content.schema_utils import load_validator
+
+    schema_path = repo_root / "schemas" / "places.schema.json"
+
+    assert load_validator(schema_path) is load_validator(schema_path)
+
+
+def test_registry_recompiles_when_schema_changes(tmp_path: Path) -> None:
+    from app.content.schema_utils import SchemaRegistry
+
+    (tmp_path / "common.schema.json").write_text(
+        json.dumps({"$id": "https://example.com/common.schema.json", "$defs": {"id": {"type": "string"}}})
+    )
+    target = tmp_path / "thing.schema.json"
+    target.write_text(
+        json.dumps({"$id": "https://example.com/thing.schema.json", "$ref": "common.schema.json#/$defs/id"})
+    )
+
+    registry = SchemaRegistry(recheck_interval=0)
+    validator = registry.validator(target)
+    validator.validate(instance="ok")
+    assert registry.validator(target) is validator
+
+    common = tmp_path / "common.schema.json"
+    common.write_text(
+        json.dumps({"$id": "https://example.com/common.schema.json", "$defs": {"id": {"type": "integer"}}})
+    )
+    stat = common.stat()
+    os.utime(common, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    updated = registry.validator(target)
+    assert updated is not validator
+    updated.validate(instance=1)
+    with pytest.raises(ValidationError):
+        updated.validate(instance="ok")
+
+
+def test_registry_rechecks_files_at_most_once_per_interval(tmp_path: Path, monkeypatch) -> None:
+    from app.content import schema_utils
+
+    target = tmp_path / "thing.schema.json"
+    target.write_text(json.dumps({"type": "string"}))
+    stats = []
+    stat_key = schema_utils._stat_key
+    monkeypatch.setattr(schema_utils, "_stat_key", lambda path: stats.append(path) or stat_key(path))
+
+    registry = schema_utils.SchemaRegistry(recheck_interval=60)
+    validator = registry.validator(target)
+    stats.clear()
+    assert registry.validator(target) is validator
+    assert stats == []
+
+    target.write_text(json.dumps({"type": "integer"}))
+    stat = target.stat()
+    os.utime(target, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert registry.validator(target) is validator
+
+    registry.expire()
+    updated = registry.validator(target)
+    assert updated is not validator
+    updated.validate(instance=1)
@@ -0,0 +1,360 @@
+import copy
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+def _matches(document: dict, query: dict) -> bool:
+    for key, condition in query.items():
+        if key == "$or":
+            if not any(_matches(document, option) for option in condition):
+                return False
+        elif isinstance(condition, dict):
+            if document.get(key) not in condition["$in"]:
+                return False
+        elif document.get(key) != condition:
+            return False
+    return True
+
+
+class FakeCollection:
+    def __init__(self) -> None:
+        self.documents: dict[str, dict] = {}
+
+    def find_one(self, query: dict) -> dict | None:
+        return copy.deepcopy(self.documents.get(query["_id"]))
+
+    def insert_one(self, document: dict) -> None:
+        self.documents[document["_id"]] = copy.deepcopy(document)
+
+    def find_one_and_update(self, query: dict, update: dict, return_document: bool = False) -> dict | None:
+        from pymongo import ReturnDocument
+
+        assert return_document is ReturnDocument.AFTER
+        document = self.documents.get(query["_id"])
+        if document is None or not _matches(document, query):
+            return None
+        document.update(copy.deepcopy(update.get("$set", {})))
+        for key, amount in update.get("$inc", {}).items():
+            document[key] = document.get(key, 0) + amount
+        return copy.deepcopy(document)
+
+
+class FakeDatabase(dict):
+    def __missing__(self, name: str) -> FakeCollection:
+        collection = self[name] = FakeCollection()
+        return collection
+
+
+@pytest.fixture
+def db() -> FakeDatabase:
+    db = FakeDatabase()
+    db["players"].insert_one({"_id": "p1", "state": {"current_location": "cottage_home"}})
+    return db
+
+
+@pytest.fixture
+def client(content_repo, db):
+    from app.api.app import create_app
+    from app.api.deps import get_content_repo, get_db
+
+    app = create_app()
+    app.dependency_overrides[get_content_repo] = lambda: content_repo
+    app.dependency_overrides[get_db] = lambda: db
+    return TestClient(app)
+
+
+def _create_session(client) -> dict:
+    response = client.post("/v1/sessions", json={"player_id": "p1"})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_session_starts_at_the_entry_node(client, db) -> None:
+    payload = _create_session(client)
+
+    assert payload["view"]["scene_id"] == "cottage_wake_v1"
+    assert [action["action_id"] for action in payload["view"]["eligible_actions"]] == ["rest_longer", "look_around"]
+    assert db["sessions"].documents[payload["session_id"]]["node_id"] == "cottage_wake"
+
+
+def test_action_moves_to_the_target_node(client, db) -> None:
+    session_id = _create_session(client)["session_id"]
+
+    response = client.post(f"/v1/sessions/{session_id}/action", json={"action_id": "look_around"})
+
+    assert response.status_code == 200
+    assert response.json()["applied_actions"] == ["look_around"]
+    assert db["sessions"].documents[session_id]["node_id"] == "look_around"
+
+
+def test_action_not_among_the_node_choices_is_rejected(client, db) -> None:
+    session_id = _create_session(client)["session_id"]
+
+    response = client.post(f"/v1/sessions/{session_id}/action", json={"action_id": "head_to_town"})
+
+    assert response.status_code == 400
+    assert db["sessions"].documents[session_id]["node_id"] == "cottage_wake"
+
+
+def test_intent_matches_a_choice(client) -> None:
+    session_id = _create_session(client)["session_id"]
+
+    response = client.post(f"/v1/sessions/{session_id}/intent", json={"input": "I'd like to rest longer"})
+
+    assert response.status_code == 200
+    assert response.json()["applied_actions"] == ["rest_longer"]
+
+
+def test_node_views_are_built_once_per_content_version(content_repo) -> None:
+    from app.api.views import views_for
+
+    views = views_for(content_repo)
+
+    assert views_for(content_repo) is views
+    view = views.get("cottage_wake_v1", "look_around")
+    assert [action.action_id for action in view.model.eligible_actions] == [
+        "make_tea",
+        "pick_up_journal",
+        "head_to_town",
+    ]
+    assert views.get("cottage_wake_v1", "missing") is None
+
+
+def test_preencoded_bodies_match_the_response_models(content_repo) -> None:
+    from app.api.models import SessionResponse, StepResponse
+    from app.api.payloads import render_json
+    from app.api.views import session_response_body, step_response_body, views_for
+
+    view = views_for(content_repo).get("cottage_wake_v1", "cottage_wake")
+
+    assert view.body == render_json(view.model.model_dump(mode="json"))
+    assert session_response_body("s1", "p1", view) == render_json(
+        SessionResponse(session_id="s1", player_id="p1", view=view.model).model_dump(mode="json")
+    )
+    assert step_response_body(view, ["look_around"]) == render_json(
+        StepResponse(view=view.model, applied_actions=["look_around"]).model_dump(mode="json")
+    )
+
+
+def test_get_and_peek_serve_the_node_view(client) -> None:
+    session_id = _create_session(client)["session_id"]
+    client.post(f"/v1/sessions/{session_id}/action", json={"action_id": "look_around"})
+
+    session = client.get(f"/v1/sessions/{session_id}").json()
+    peek = client.post(f"/v1/sessions/{session_id}/peek").json()
+
+    assert session["player_id"] == "p1"
+    assert session["state_digest"] is None
+    assert session["view"] == peek["view"]
+    assert peek["applied_actions"] == []
+    assert session["view"]["prompt"]
+
+
+def test_intent_with_a_typo_still_steps(client) -> None:
+    session_id = _create_session(client)["session_id"]
+
+    response = client.post(f"/v1/sessions/{session_id}/intent", json={"input": "lok arund"})
+
+    assert response.status_code == 200
+    assert response.json()["applied_actions"] == ["look_around"]
+
+
+class CountingCollection(FakeCollection):
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls: list[str] = []
+
+    def find_one(self, query: dict) -> dict | None:
+        self.calls.append("find_one")
+        return super().find_one(query)
+
+    def find_one_and_update(self, query: dict, update: dict, return_document: bool = False) -> dict | None:
+        self.calls.append("find_one_and_update")
+        return super().find_one_and_update(query, update, return_document)
+
+
+def test_steps_apply_in_order_with_one_read_and_one_write(client, db) -> None:
+    session_id = _create_session(client)["session_id"]
+    sessions = db["sessions"] = CountingCollection()
+    sessions.documents = {session_id: {"_id": session_id, "scene_id": "cottage_wake_v1", "node_id": "cottage_wake"}}
+
+    response = client.post(
+        f"/v1/sessions/{session_id}/steps",
+        json={"steps": [{"action_id": "look_around"}, {"input": "make tea"}]},
+    )
+
+    assert response.status_code == 200
+    assert [step["applied_actions"] for step in response.json()] == [["look_around"], ["make_tea"]]
+    assert [action["action_id"] for action in response.json()[1]["view"]["eligible_actions"]] == [
+        "look_around",
+        "head_to_town",
+    ]
+    assert [step["version"] for step in response.json()] == [1, 2]
+    assert sessions.calls == ["find_one", "find_one_and_update"]
+    assert sessions.documents[session_id]["node_id"] == "make_tea"
+
+
+def test_steps_reach_a_terminal_node(client, db) -> None:
+    session_id = _create_session(client)["session_id"]
+
+    response = client.post(
+        f"/v1/sessions/{session_id}/steps",
+        json={"steps": [{"input": "look around"}, {"input": "head to town"}]},
+    )
+
+    assert [step["applied_actions"] for step in response.json()] == [["look_around"], ["head_to_town"]]
+    assert db["sessions"].documents[session_id]["node_id"] == "head_to_town"
+
+
+def test_steps_past_a_terminal_node_are_rejected(client, db) -> None:
+    session_id = _create_session(client)["session_id"]
+
+    response = client.post(
+        f"/v1/sessions/{session_id}/steps",
+        json={"steps": [{"input": "look around"}, {"input": "head to town"}, {"action_id": "make_tea"}]},
+    )
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Step 3: Scene already ended"
+    assert db["sessions"].documents[session_id]["node_id"] == "cottage_wake"
+
+
+def test_failed_step_leaves_the_session_untouched(client, db) -> None:
+    session_id = _create_session(client)["session_id"]
+
+    response = client.post(
+        f"/v1/sessions/{session_id}/steps",
+        json={"steps": [{"action_id": "look_around"}, {"action_id": "rest_longer"}]},
+    )
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Step 2: Action not eligible"
+    assert db["sessions"].documents[session_id]["node_id"] == "cottage_wake"
+
+
+@pytest.mark.parametrize("steps", [[], [{}], [{"action_id": "look_around", "input": "look"}]])
+def test_malformed_steps_are_rejected(client, steps: list) -> None:
+    session_id = _create_session(client)["session_id"]
+
+    response = client.post(f"/v1/sessions/{session_id}/steps", json={"steps": steps})
+
+    assert response.status_code == 422
+
+
+def _counting_sessions(db, session_id: str, **fields) -> CountingCollection:
+    sessions = db["sessions"] = CountingCollection()
+    sessions.documents = {
+        session_id: {"_id": session_id, "player_id": "p1", "scene_id": "cottage_wake_v1", "node_id": "cottage_wake"}
+    }
+    sessions.documents[session_id].update(fields)
+    return sessions
+
+
+def test_action_is_a_single_conditional_write(client, db) -> None:
+    sessions = _counting_sessions(db, "s1", version=0)
+
+    response = client.post("/v1/sessions/s1/action", json={"action_id": "look_around", "expected_version": 0})
+
+    assert response.status_code == 200
+    assert response.json()["version"] == 1
+    assert sessions.calls == ["find_one_and_update"]
+    assert sessions.documents["s1"]["node_id"] == "look_around"
+
+
+def test_double_tapped_action_applies_once(client, db) -> None:
+    session_id = _create_session(client)["session_id"]
+
+    first = client.post(f"/v1/sessions/{session_id}/action", json={"action_id": "rest_longer"})
+    second = client.post(f"/v1/sessions/{session_id}/action", json={"action_id": "rest_longer"})
+    stale = client.post(
+        f"/v1/sessions/{session_id}/action", json={"action_id": "look_around", "expected_version": 0}
+    )
+
+    assert first.status_code == 200
+    assert second.status_code == 400
+    assert stale.status_code == 409
+    assert db["sessions"].documents[session_id]["version"] == 1
+
+
+def test_intent_conflicts_when_the_session_moves_underneath(client, db) -> None:
+    sessions = _counting_sessions(db, "s1", version=0)
+    read = sessions.find_one
+
+    def read_then_race(query: dict) -> dict | None:
+        session = read(query)
+        sessions.documents["s1"].update(node_id="rest_longer", version=1)
+        return session
+
+    sessions.find_one = read_then_race
+
+    response = client.post("/v1/sessions/s1/intent", json={"input": "look around"})
+
+    assert response.status_code == 409
+    assert sessions.documents["s1"]["node_id"] == "rest_longer"
+
+
+def test_action_without_a_version_is_a_single_conditional_write(client, db) -> None:
+    sessions = _counting_sessions(db, "s1", version=0)
+
+    first = client.post("/v1/sessions/s1/action", json={"action_id": "look_around"})
+    sessions.calls.clear()
+    second = client.post("/v1/sessions/s1/action", json={"action_id": "look_around"})
+
+    assert first.status_code == 200
+    assert first.json()["version"] == 1
+    assert second.status_code == 400
+    assert sessions.calls == ["find_one_and_update", "find_one"]
+    assert sessions.documents["s1"]["version"] == 1
+
+
+def test_concurrent_duplicate_self_loop_action_conflicts(make_content_root, db) -> None:
+    import json
+
+    from app.api.app import create_app
+    from app.api.deps import get_content_repo, get_db
+    from app.content.repo import ContentRepo
+
+    root = make_content_root()
+    scene_path = root / "assets" / "scenes" / "cottage_wake_v1.json"
+    scene = json.loads(scene_path.read_text())
+    # Looking around again from look_around makes the action's target offer it again.
+    next(node for node in scene["nodes"] if node["node_id"] == "look_around")["choices"].append("look_around")
+    scene_path.write_text(json.dumps(scene))
+    repo = ContentRepo(root)
+    app = create_app()
+    app.dependency_overrides[get_content_repo] = lambda: repo
+    app.dependency_overrides[get_db] = lambda: db
+    client = TestClient(app)
+
+    sessions = _counting_sessions(db, "s1", version=0)
+    read = sessions.find_one
+
+    def read_then_race(query: dict) -> dict | None:
+        # The other tap commits between this request's read and its write.
+        session = read(query)
+        sessions.documents["s1"].update(node_id="look_around", version=1)
+        return session
+
+    sessions.find_one = read_then_race
+
+    response = client.post("/v1/sessions/s1/action", json={"action_id": "look_around"})
+
+    assert response.status_code == 409
+    assert sessions.documents["s1"]["version"] == 1
+
+
+def test_sessions_without_a_version_still_step(client, db) -> None:
+    sessions = _counting_sessions(db, "s1")
+
+    response = client.post("/v1/sessions/s1/action", json={"action_id": "look_around", "expected_version": 0})
+
+    assert response.status_code == 200
+    assert sessions.documents["s1"]["version"] == 1
+    assert client.get("/v1/sessions/s1").json()["version"] == 1
+
+
+def test_unknown_session_is_404(client, db) -> None:
+    response = client.post("/v1/sessions/missing/action", json={"action_id": "look_around"})
+
+    assert response.status_code == 404
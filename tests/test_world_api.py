@@ -0,0 +1,172 @@
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def client(content_repo):
+    from app.api.app import create_app
+    from app.api.deps import get_content_repo
+
+    app = create_app()
+    app.dependency_overrides[get_content_repo] = lambda: content_repo
+    return TestClient(app)
+
+
+def test_world_collections_return_strong_etags(client, content_repo) -> None:
+    response = client.get("/v1/world/places", headers={"Accept-Encoding": "identity"})
+
+    assert response.status_code == 200
+    assert response.headers["etag"] == f'"{content_repo.content_hashes["places"]}"'
+    assert len(response.json()) == len(content_repo.places_by_id)
+
+
+@pytest.mark.parametrize("path", ["/v1/world/places", "/v1/world/collectibles", "/v1/world/manifest"])
+def test_world_if_none_match_returns_304(client, path: str) -> None:
+    etag = client.get(path).headers["etag"]
+
+    response = client.get(path, headers={"If-None-Match": f'"other", {etag}'})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+def test_world_stale_etag_returns_body(client) -> None:
+    response = client.get("/v1/world/npcs", headers={"If-None-Match": '"stale"'})
+
+    assert response.status_code == 200
+    assert response.json()
+
+
+def test_world_collection_on_a_lazy_repo_loads_only_its_step(content_root, content_repo) -> None:
+    from app.api.app import create_app
+    from app.api.deps import get_content_repo
+    from app.content.repo import ContentRepo
+
+    repo = ContentRepo(content_root, lazy=True)
+    app = create_app()
+    app.dependency_overrides[get_content_repo] = lambda: repo
+
+    response = TestClient(app).get("/v1/world/places", headers={"Accept-Encoding": "identity"})
+
+    assert response.status_code == 200
+    assert response.headers["etag"] == f'"{content_repo.content_hashes["places"]}"'
+    assert repo._loaded_steps == {"places"}
+
+
+def test_content_hashes_are_stable_and_track_changes(content_root, content_repo) -> None:
+    from app.content.repo import ContentRepo
+
+    again = ContentRepo(content_root)
+    assert again.content_hashes == content_repo.content_hashes
+    assert again.content_version == content_repo.content_version
+
+    changed = again.reloaded(["places"])
+    assert changed.content_hashes == again.content_hashes
+
+    changed.places_by_id = {**changed.places_by_id, "extra": {"place_id": "extra"}}
+    changed._refresh_content_hashes(["places"])
+    assert changed.content_hashes["places"] != again.content_hashes["places"]
+    assert changed.content_hashes["npcs"] == again.content_hashes["npcs"]
+    assert changed.content_version != again.content_version
+
+
+def test_world_payloads_are_pre_rendered_and_gzipped(client, content_repo) -> None:
+    import gzip
+    import json
+
+    from app.api.routers.world import WORLD_PAYLOADS
+
+    WORLD_PAYLOADS.clear()
+    plain = client.get("/v1/world/collectibles", headers={"Accept-Encoding": "identity"})
+    zipped = client.get("/v1/world/collectibles", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in plain.headers
+    assert zipped.headers["content-encoding"] == "gzip"
+    assert zipped.headers["vary"] == "Accept-Encoding"
+    assert zipped.headers["etag"] != plain.headers["etag"]
+    assert zipped.json() == plain.json() == list(content_repo.collectibles_by_id.values())
+
+    payload = WORLD_PAYLOADS.get("collectibles", content_repo.content_hashes["collectibles"], lambda: None)
+    assert int(plain.headers["content-length"]) == len(payload.body)
+    assert gzip.decompress(payload.gzip_body) == payload.body
+    assert json.loads(payload.body) == plain.json()
+
+
+def test_filtered_results_are_only_gzipped_when_accepted(client, monkeypatch) -> None:
+    from app.api.routers import world
+
+    levels = []
+    compress = world.gzip_body
+    monkeypatch.setattr(world, "gzip_body", lambda body, level: levels.append(level) or compress(body, level))
+
+    plain = client.get("/v1/world/places?limit=1", headers={"Accept-Encoding": "identity"})
+    assert levels == []
+    zipped = client.get("/v1/world/places?limit=1", headers={"Accept-Encoding": "gzip"})
+
+    assert levels == [world.QUERY_GZIP_LEVEL]
+    assert zipped.headers["content-encoding"] == "gzip"
+    assert zipped.content == plain.content
+
+
+def test_accepts_gzip_honours_q_values() -> None:
+    from app.api.payloads import accepts_gzip
+
+    assert accepts_gzip("gzip, deflate, br")
+    assert accepts_gzip("br;q=1.0, gzip;q=0.5")
+    assert not accepts_gzip("gzip;q=0")
+    assert accepts_gzip("*;q=0, gzip")
+    assert not accepts_gzip("gzip;q=0, *")
+    assert accepts_gzip("br, *")
+    assert not accepts_gzip("br, *;q=0")
+    assert not accepts_gzip("identity")
+    assert not accepts_gzip(None)
+
+
+def test_collectibles_filter_and_projection(client, content_repo) -> None:
+    response = client.get(
+        "/v1/world/collectibles",
+        params={"item_type": "Botanical", "tag": "calming", "fields": "item_id,display_name"},
+    )
+
+    expected = [
+        {"item_id": item["item_id"], "display_name": item["display_name"]}
+        for item in content_repo.collectibles_by_id.values()
+        if item["item_type"] == "Botanical" and "calming" in item["tags"]
+    ]
+    assert response.status_code == 200
+    assert expected
+    assert response.json() == expected
+
+
+def test_interactions_filter_by_kind_and_place(client, content_repo) -> None:
+    response = client.get("/v1/world/interactions", params={"npc_kind": "human", "place_id": "town_vendor"})
+
+    expected = [
+        interaction["interaction_id"]
+        for interaction in content_repo.interactions_by_id.values()
+        if interaction["npc_kind"] == "human" and interaction["conditions"]["place_id"] == "town_vendor"
+    ]
+    assert [interaction["interaction_id"] for interaction in response.json()] == expected
+
+
+def test_cursor_pagination_walks_every_result(client, content_repo) -> None:
+    seen = []
+    params = {"usable_in": "tea", "limit": 7, "fields": "item_id"}
+    while True:
+        response = client.get("/v1/world/collectibles", params=params)
+        assert response.status_code == 200
+        seen.extend(item["item_id"] for item in response.json())
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            break
+        params["cursor"] = cursor
+
+    expected = [item["item_id"] for item in content_repo.collectibles_by_id.values() if "tea" in item["usable_in"]]
+    assert seen == expected
+
+
+def test_invalid_cursor_is_rejected(client) -> None:
+    response = client.get("/v1/world/places", params={"limit": 2, "cursor": "bm90LWEtY3Vyc29y"})
+
+    assert response.status_code == 400